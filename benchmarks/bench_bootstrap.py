@@ -0,0 +1,51 @@
+"""
+📐 [V10.6] 부트스트랩 앙상블 멤버당 비용 측정
+- 멤버 수 K를 늘려가며 전체 학습 시간, 멤버당 시간/모델 크기, 워커 피크 RSS, 배치 추론 시간을 출력
+- 학습 행렬은 SharedMemory 한 벌만 존재하므로 K가 늘어도 부모 프로세스 메모리는 증가하지 않음
+
+사용법: python benchmarks/bench_bootstrap.py --rows 100000 --members 1 2 4 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from bootstrap_ensemble import train_bootstrap_ensemble
+from model_trainer import peak_rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--members", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=1000, help="배치 추론 행 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, 16)).astype(np.float32)
+    y = rng.choice([0, 1, 2], args.rows, p=[0.28, 0.26, 0.46]).astype(np.float32)
+    X_batch = X[:args.batch]
+
+    for k in args.members:
+        t0 = time.perf_counter()
+        ens = train_bootstrap_ensemble(X, y, members=k, n_workers=args.workers)
+        train_sec = time.perf_counter() - t0
+        t1 = time.perf_counter()
+        ens.predict_with_intervals(X_batch)
+        infer_ms = (time.perf_counter() - t1) * 1000
+        print(json.dumps(dict(ens.cost_report(), rows=args.rows,
+                              train_sec=round(train_sec, 2),
+                              infer_ms_per_batch=round(infer_ms, 1),
+                              infer_ms_per_member=round(infer_ms / k, 2),
+                              parent_peak_rss_mb=round(peak_rss_mb(), 1))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+📏 [V11.3] 엔드투엔드 I/O 벤치마크 — 스탠드인 서버(football-data / API-Football / R2) 대상, 한 머신에서
+    fdata_ingest : fetch_real_match_data(use_cache=False) — 리그 × 시즌 CSV HTTP 수집 + 파싱 + 캐시 기록
+    cold_start   : initialize_v10_engine() — 캐시 로드 + 피처/ELO 구축 + ELO R2 다운로드/업로드
+    auto_update  : auto_update_elo_and_brier() — 최신 시즌 CSV + API-Football 7일 + ELO/Brier 저장(R2)
+    persistence  : ELO/Brier 저장(R2 업로드) + ELO 재로드(R2 다운로드) × --persist-rounds
+- 장애 주입 옵션은 세 서비스에 공통 적용 (지연/지터/오류율/초당 제한)
+- 결과 JSON: 단계별 초 + 서버별 요청/바이트/주입 오류 + perf_spans 스냅샷
+
+사용법:
+    python benchmarks/bench_e2e_io.py --matches 10k
+    python benchmarks/bench_e2e_io.py --latency-ms 80 --jitter-ms 20 --error-rate 0.05 --out e2e.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from standin_servers import StandinCluster, fault_args, faults_from_args  # noqa: E402
+from synthetic_fdata import SCALES, write_tree  # noqa: E402
+
+
+def _phase(results, name, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    results[name] = round(time.perf_counter() - t0, 4)
+    print(json.dumps({'phase': name, 'seconds': results[name]}), flush=True)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", default="10k", help="합성 데이터 경기 수 (합성 시즌 전체를 SG_FDATA_SEASONS 로 수집)")
+    parser.add_argument("--fdata-dir", default=None, help="녹화 CSV 트리 (지정 시 합성 생략)")
+    parser.add_argument("--persist-rounds", type=int, default=5)
+    parser.add_argument("--out", default=None)
+    fault_args(parser)
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="sg_e2e_") as work:
+        fdata_dir = args.fdata_dir or os.path.join(work, "fdata")
+        if not args.fdata_dir:
+            paths = write_tree(fdata_dir, SCALES.get(args.matches.lower()) or int(args.matches))
+            seasons = [os.path.basename(os.path.dirname(p)) for p in paths]
+            os.environ.setdefault("SG_FDATA_SEASONS", ",".join(dict.fromkeys(seasons)))  # 오래된 시즌부터
+        run_dir = os.path.join(work, "run")
+        os.makedirs(run_dir)
+        os.chdir(run_dir)  # 매치 캐시 / ELO / Brier 파일은 임시 디렉터리에
+        try:
+            with StandinCluster(fdata_dir, faults_from_args(args)) as cluster:
+                import perf_spans
+                from soccer_real_data_engine import (fetch_real_match_data, initialize_v10_engine,
+                                                     EloRatingSystem)
+                from soccer_auto_result import auto_update_elo_and_brier
+
+                phases = {}
+                df = _phase(phases, 'fdata_ingest', lambda: fetch_real_match_data(use_cache=False))
+                _, _, elo, brier = _phase(phases, 'cold_start', initialize_v10_engine)
+                new = _phase(phases, 'auto_update', lambda: auto_update_elo_and_brier(elo, brier))
+
+                def persist():
+                    for _ in range(args.persist_rounds):
+                        elo.save()
+                        brier.save()
+                        EloRatingSystem()
+                _phase(phases, 'persistence', persist)
+                report = {
+                    'config': {'matches': len(df), 'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+                               'error_rate': args.error_rate, 'throttle_rps': args.throttle_rps,
+                               'persist_rounds': args.persist_rounds},
+                    'phases': phases, 'auto_update_new_matches': new,
+                    'servers': cluster.stats(), 'r2_objects': sorted(k for (_, k) in cluster.objects if k),
+                    'spans': [s for s in perf_spans.snapshot() if s['span'] in ('http_fetch', 'csv_parse', 'r2_io')],
+                }
+        finally:
+            os.chdir(cwd)
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
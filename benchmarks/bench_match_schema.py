@@ -0,0 +1,94 @@
+"""
+📏 [V11.3] 매치 프레임 스키마 메모리 리포트 — 구 방식(추론 dtype) vs MATCH_SCHEMA(카테고리 / int8 / float32 / date)
+- 입력: --cache 로 실제 매치 캐시 CSV, 없으면 synthetic_fdata 로 N경기 생성 (기본 300k ≈ 전체 디비전 × 전체 시즌 규모)
+- 컬럼별 deep 메모리(바이트), 합계, 절감률 + 캐시 CSV 로드 시간(pd.read_csv vs read_match_cache)
+- 배당 컬럼(ODDS_COLUMNS)은 사이드카(.odds.npy)에 있어 기본 로드에서 빠짐 — odds=True 로 읽을 때의 추가 메모리를 따로 표시
+
+사용법:
+    python benchmarks/bench_match_schema.py                          # 합성 300k
+    python benchmarks/bench_match_schema.py --cache real_match_data_cache.csv --out schema.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import pandas as pd  # noqa: E402
+
+from soccer_real_data_engine import parse_fdata_rows, read_match_cache, write_match_cache  # noqa: E402
+
+
+def _synthetic_cache(path, n_matches):
+    """합성 경기 → 스키마 적용 캐시 CSV + 배당 사이드카 (엔진 ingest_match_cache 와 같은 형식)"""
+    from synthetic_fdata import generate
+    write_match_cache((parse_fdata_rows(df_raw, league, season, with_odds=True)
+                       for league, _, season, df_raw in generate(n_matches)), path)
+
+
+def _timed_load(fn, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        sec = time.perf_counter() - t0
+        best = sec if best is None else min(best, sec)
+    return out, best
+
+
+def report(cache_path, repeat=3):
+    with warnings.catch_warnings():  # 구 방식은 season("0001" / "2021")을 int/str 혼합으로 재파싱 — 경고는 예상된 것
+        warnings.simplefilter("ignore", pd.errors.DtypeWarning)
+        legacy, legacy_sec = _timed_load(lambda: pd.read_csv(cache_path), repeat)
+    compact, compact_sec = _timed_load(lambda: read_match_cache(cache_path), repeat)
+    before = legacy.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    columns = {c: {'before_dtype': str(legacy[c].dtype) if c in legacy else None, 'after_dtype': str(compact[c].dtype),
+                   'before_bytes': int(before.get(c, 0)), 'after_bytes': int(after[c])} for c in compact.columns}
+    total_before, total_after = int(before.sum()), int(after.sum())
+    with_odds = read_match_cache(cache_path, odds=True)
+    odds_bytes = int(with_odds.memory_usage(deep=True, index=False).sum()) - total_after
+    return {
+        'rows': len(compact), 'cache_bytes': os.path.getsize(cache_path),
+        'total_before_bytes': total_before, 'total_after_bytes': total_after,
+        'saving_pct': round(100 * (1 - total_after / total_before), 1) if total_before else 0.0,
+        'odds_columns': len(with_odds.columns) - len(compact.columns), 'odds_bytes': odds_bytes,
+        'load_seconds': {'read_csv': round(legacy_sec, 4), 'read_match_cache': round(compact_sec, 4)},
+        'columns': columns,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache", default=None, help="매치 캐시 CSV (미지정 시 합성)")
+    parser.add_argument("--matches", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="sg_schema_") as work:
+        cache_path = args.cache
+        if cache_path is None:
+            cache_path = os.path.join(work, "real_match_data_cache.csv")
+            _synthetic_cache(cache_path, args.matches)
+        result = report(cache_path, args.repeat)
+
+    for col, c in result['columns'].items():
+        print(f"{col:>8}  {c['before_dtype'] or '-':>14} → {c['after_dtype']:<14} "
+              f"{c['before_bytes'] / 1e6:8.2f} MB → {c['after_bytes'] / 1e6:7.2f} MB")
+    print(f"{'total':>8}  {result['rows']} rows  {result['total_before_bytes'] / 1e6:.1f} MB → "
+          f"{result['total_after_bytes'] / 1e6:.1f} MB  (-{result['saving_pct']}%)  load {result['load_seconds']}")
+    print(f"{'odds':>8}  +{result['odds_columns']} float32 컬럼 (odds=True 로드 시만) {result['odds_bytes'] / 1e6:.1f} MB")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+⏱️ [V11.3] 콜드 스타트 임포트 프로파일 + 시간 예산 회귀 체크
+- 대상 모듈마다 새 인터프리터에서 `python -X importtime -c "import <mod>"` 실행 (매번 콜드 임포트)
+- 기본 모드: 모듈별 누적/자체 임포트 시간 상위 N개 + 최상위 패키지별 합계 출력
+- --check : 예산(ms) 초과 또는 무거운 의존성(xgboost/sklearn/scipy/boto3/selenium...)이 임포트 시점에
+            끌려오면 exit 1 — 무거운 의존성은 해당 코드 경로에서 지연 import 해야 함
+
+사용법:
+    python benchmarks/bench_startup.py                    # app 임포트 시간 분해
+    python benchmarks/bench_startup.py --module inference_engine --top 30
+    python benchmarks/bench_startup.py --check            # 앱 + 엔진 모듈 예산 체크 (CI)
+    python benchmarks/bench_startup.py --check --budget-scale 2   # 느린 머신용 예산 완화
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 콜드 임포트 예산 (ms, 반복 중 최솟값 기준) — 기준 머신 실측의 약 2배
+STARTUP_BUDGET_MS = {
+    'app': 1500,
+    'soccer_real_data_engine': 800,
+    'soccer_auto_result': 100,
+    'data_fusion_v8': 400,
+    'inference_engine': 400,
+    'model_registry': 900,
+    'team_stats': 900,
+    'predict_cli': 900,
+}
+# 임포트 시점에 로드되면 안 되는 패키지 (사용하는 함수 안에서 import)
+HEAVY_MODULES = ('xgboost', 'sklearn', 'scipy', 'boto3', 'botocore', 'bs4', 'selenium', 'webdriver_manager')
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_import(module, python=sys.executable):
+    """
+    새 프로세스에서 module 을 임포트하며 -X importtime 출력을 파싱합니다.
+    Returns: {'total_ms', 'modules': [(name, self_ms, cumulative_ms, depth), ...]}
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{proc.stderr[-2000:]}")
+    modules, total_us = [], 0
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        modules.append((name, self_us / 1000, cum_us / 1000, (len(indent) - 1) // 2))
+        if name == module:
+            total_us = cum_us
+    return {'total_ms': total_us / 1000, 'modules': modules}
+
+
+def by_package(modules):
+    """최상위 패키지별 자체 임포트 시간 합계 (ms)"""
+    totals = defaultdict(float)
+    for name, self_ms, _, _ in modules:
+        totals[name.split('.')[0]] += self_ms
+    return sorted(totals.items(), key=lambda kv: -kv[1])
+
+
+def _best_of(module, repeat):
+    runs = [profile_import(module) for _ in range(max(1, repeat))]
+    return min(runs, key=lambda r: r['total_ms'])
+
+
+def report(module, repeat, top):
+    prof = _best_of(module, repeat)
+    print(f"⏱️ import {module}: {prof['total_ms']:.1f} ms (best of {repeat})\n")
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for name, self_ms, cum_ms, depth in sorted(prof['modules'], key=lambda m: -m[2])[:top]:
+        print(f"{cum_ms:>9.1f}ms {self_ms:>7.1f}ms  {'  ' * depth}{name}")
+    print(f"\n{'self':>9}  top-level package")
+    for pkg, ms in by_package(prof['modules'])[:top]:
+        print(f"{ms:>7.1f}ms  {pkg}")
+
+
+def check(modules, repeat, scale):
+    failed = False
+    for module in modules:
+        prof = _best_of(module, repeat)
+        loaded = {name.split('.')[0] for name, _, _, _ in prof['modules']}
+        heavy = sorted(loaded.intersection(HEAVY_MODULES))
+        budget = STARTUP_BUDGET_MS.get(module, 1000) * scale
+        ok = prof['total_ms'] <= budget and not heavy
+        failed |= not ok
+        print(json.dumps({'module': module, 'import_ms': round(prof['total_ms'], 1), 'budget_ms': budget,
+                          'heavy_imports': heavy, 'ok': ok}, ensure_ascii=False))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help="대상 모듈 (반복 가능, 기본: app / --check 는 예산표 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="콜드 임포트 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="예산 초과/무거운 의존성 임포트 시 exit 1")
+    parser.add_argument("--budget-scale", type=float, default=float(os.getenv("SG_STARTUP_BUDGET_SCALE", "1")))
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check(args.module or list(STARTUP_BUDGET_MS), args.repeat, args.budget_scale) else 0)
+    for module in args.module or ['app']:
+        report(module, args.repeat, args.top)
+
+
+if __name__ == "__main__":
+    main()
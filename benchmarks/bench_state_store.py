@@ -0,0 +1,123 @@
+"""
+📏 [V11.3] 상태 파일 동시 쓰기 벤치마크 — 프로세스 × 스레드가 같은 JSON 을 동시에 갱신 (세션 여러 개 + 워커 프로세스 재현)
+    store  : state_store.state_file(...).save(merge=merge_union) — 작성자 스레드 + 파일 락 + 원자적 교체
+    legacy : 기존 방식 — 읽기 → 합집합 → open('w') + json.dump 제자리 덮어쓰기
+- 각 스레드는 고유 match_id 를 하나씩 추가하며 매번 저장 — 끝난 뒤 파일에 빠진 id(lost)와
+  실행 중 읽기 스레드가 만난 깨진 JSON(parse_errors) 수를 셉니다 (store 는 둘 다 0 이어야 함)
+- submits / disk_writes 로 coalescing 비율 확인
+
+사용법:
+    python benchmarks/bench_state_store.py                         # 4 프로세스 × 4 스레드 × 200회
+    python benchmarks/bench_state_store.py --procs 8 --threads 8 --updates 500 --modes store --out state.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing as mp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+MODES = ('store', 'legacy')
+
+
+def _legacy_update(path, mine):
+    try:
+        with open(path, 'r') as f:
+            disk = json.load(f)
+    except:
+        disk = []           # 기존 로더처럼 깨진 파일은 빈 값으로 리셋
+    with open(path, 'w') as f:
+        json.dump(list(dict.fromkeys(disk + mine)), f)
+
+
+def _worker(mode, path, proc, n_threads, n_updates):
+    from state_store import state_file, merge_union
+    store = state_file(path)
+
+    def run(t):
+        mine = []
+        for k in range(n_updates):
+            mine.append(f"p{proc}-t{t}-{k}")
+            if mode == 'store':
+                store.save(mine, merge=merge_union, owner=mine)
+            else:
+                _legacy_update(path, mine)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(n_threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    store.flush()
+    s = store.stats()
+    return s['submits'], s['writes']
+
+
+def _poll(path, stop, counts):
+    while not stop.is_set():
+        try:
+            with open(path, 'r') as f:
+                json.load(f)
+            counts['reads'] += 1
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            counts['parse_errors'] += 1
+        time.sleep(0.001)
+
+
+def run_mode(mode, work, n_procs, n_threads, n_updates):
+    path = os.path.join(work, f"{mode}_processed.json")
+    counts = {'reads': 0, 'parse_errors': 0}
+    stop = threading.Event()
+    poller = threading.Thread(target=_poll, args=(path, stop, counts), daemon=True)
+    poller.start()
+    t0 = time.perf_counter()
+    with mp.get_context("spawn").Pool(n_procs) as pool:
+        stats = pool.starmap(_worker, [(mode, path, p, n_threads, n_updates) for p in range(n_procs)])
+    seconds = time.perf_counter() - t0
+    stop.set()
+    poller.join()
+
+    try:
+        with open(path, 'r') as f:
+            found = set(json.load(f))
+    except ValueError:
+        found = set()
+        counts['parse_errors'] += 1
+    expected = n_procs * n_threads * n_updates
+    submits = sum(s for s, _ in stats) if mode == 'store' else expected
+    writes = sum(w for _, w in stats) if mode == 'store' else expected
+    return {'seconds': round(seconds, 3), 'expected_ids': expected, 'lost_ids': expected - len(found),
+            'parse_errors': counts['parse_errors'], 'reads': counts['reads'], 'submits': submits,
+            'disk_writes': writes, 'updates_per_sec': round(expected / seconds, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=200, help="스레드당 저장 횟수")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sg_state_") as work:
+        for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+            if mode not in MODES:
+                raise SystemExit(f"unknown mode: {mode} (choose from {MODES})")
+            results[mode] = run_mode(mode, work, args.procs, args.threads, args.updates)
+            print(json.dumps({'mode': mode, **results[mode]}), flush=True)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+📏 [V11.3] 핫 패스 마이크로 벤치마크 스위트 (합성 football-data 데이터, 오프라인)
+- synthetic_fdata 로 N경기(10k / 100k / 1m) CSV 트리 생성 → 엔진 실제 코드 경로로 측정
+    parse_fdata_rows              : pd.read_csv + 행 파싱 + MATCH_SCHEMA 적용 (fetch_real_match_data 원격 경로와 동일)
+    build_features_from_real_data : 16피처 + 시간순 ELO 갱신
+    elo_batch_update_from_df      : EloRatingSystem.batch_update_from_df
+    normalize_team_name           : 사용자 입력 팀명 정규화 (min(N, 50k)회)
+    predict_match_ml              : 경기별 앙상블 예측 (min(N, 2k)회, 합성 피처로 학습한 모델)
+    predict_batch                 : 같은 경기를 한 번의 배치로
+    calculate_fractal_indicators  : 메모 비운 콜드 계산 (min(N, 20k)회)
+    auto_update_matching          : soccer_auto_result.apply_results (결과 × 대기 예측 부분일치)
+    season_simulation             : season_simulator.simulate_season (20팀 380경기 × N시즌, 단일 프로세스)
+    elo_tuning                    : elo_tuner.tune_elo (기본 그리드 294개 설정 × N경기 동시 재생)
+    goal_model_fit                : goal_model.fit_goal_model (Dixon-Coles 콜드 스타트 적합, 시간 감쇠 구간)
+    odds_devig                    : odds_devig.odds_features (전체 배당 → power 마진 제거 합의 확률 / 마감 피처)
+    elo_asof                      : EloRatingSystem.get_elo_asof_batch (재생 후 전 경기 홈/원정 × 날짜 시점 레이팅, 2N건)
+    pair_cache                    : pair_cache.PairPredictionCache 한 팀 ELO 변경 후 부분 refresh + min(N, 2k) 대진 조회 (콜드 구축 제외)
+- 결과 JSON: {'meta': {...}, 'results': {bench: {'seconds', 'rows', 'rows_per_sec'}}}
+- --baseline 이전 JSON 과 같은 N 의 벤치를 비교해 --threshold 이상 느려지면 회귀로 표시 (--fail-on-regression 시 exit 1)
+- 모든 파일 I/O(ELO/Brier 저장 등)는 임시 작업 디렉터리에서, R2 키는 무시
+
+사용법:
+    python benchmarks/bench_suite.py --scale 10k
+    python benchmarks/bench_suite.py --scale 100k --only build_features_from_real_data predict_batch
+    python benchmarks/bench_suite.py --scale 10k --baseline benchmarks/results/base_10k.json --fail-on-regression
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+for _key in ("R2_ACCESS_KEY_ID", "R2_SECRET_ACCESS_KEY", "API_FOOTBALL_KEY"):
+    os.environ.pop(_key, None)  # 벤치마크는 네트워크에 닿지 않음
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from synthetic_fdata import SCALES, write_tree  # noqa: E402
+
+BENCHMARKS = [
+    'parse_fdata_rows', 'build_features_from_real_data', 'elo_batch_update_from_df', 'normalize_team_name',
+    'predict_match_ml', 'predict_batch', 'calculate_fractal_indicators', 'auto_update_matching',
+    'season_simulation', 'elo_tuning', 'goal_model_fit', 'odds_devig', 'elo_asof',
+    'pair_cache',
+]
+DEFAULT_THRESHOLD = 0.25
+
+
+def _timed(fn, repeat=1):
+    best, out = None, None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = fn()
+        sec = time.perf_counter() - t0
+        best = sec if best is None else min(best, sec)
+    return out, best
+
+
+class Suite:
+    """생성 데이터 / 학습 모델 등 벤치 간 공유 상태를 지연 준비"""
+
+    def __init__(self, data_dir, n_matches, repeat):
+        self.data_dir, self.n, self.repeat = data_dir, n_matches, repeat
+        self._frame = self._models = None
+
+    def frame(self):
+        if self._frame is None:
+            self._frame, _ = self._parse()
+        return self._frame
+
+    def _parse(self, with_odds=False):
+        from soccer_real_data_engine import parse_fdata_rows, match_frame, LEAGUE_URLS, STORE_COLUMNS, MATCH_COLUMNS
+        leagues = {code: name for name, code in LEAGUE_URLS.items()}
+        rows = []
+        for path in sorted(glob.glob(os.path.join(self.data_dir, "mmz4281", "*", "*.csv")), key=_chrono_key):
+            season, code = path.split(os.sep)[-2], os.path.basename(path)[:-4]
+            rows.extend(parse_fdata_rows(pd.read_csv(path, on_bad_lines='skip'), leagues[code], season, with_odds))
+        return match_frame(rows, STORE_COLUMNS if with_odds else MATCH_COLUMNS), len(rows)
+
+    def models(self):
+        """합성 피처 앞부분(최대 20k행)으로 앙상블 학습 — predict_* 벤치용"""
+        if self._models is None:
+            from soccer_real_data_engine import EloRatingSystem, build_features_from_real_data
+            from model_trainer import train_ensemble
+            elo = EloRatingSystem()
+            X, y = build_features_from_real_data(self.frame().iloc[:20000], elo)
+            self._models = (train_ensemble(X, y, matrix_path="bench_train.npy")[0], elo)
+        return self._models
+
+    # --- 벤치마크 -----------------------------------------------------------
+    def bench_parse_fdata_rows(self):
+        out, sec = _timed(self._parse, self.repeat)
+        return sec, out[1]
+
+    def bench_build_features_from_real_data(self):
+        from soccer_real_data_engine import EloRatingSystem, build_features_from_real_data
+        df = self.frame()
+        _, sec = _timed(lambda: build_features_from_real_data(df, EloRatingSystem()), self.repeat)
+        return sec, len(df)
+
+    def bench_elo_batch_update_from_df(self):
+        from soccer_real_data_engine import EloRatingSystem
+        df = self.frame()
+        _, sec = _timed(lambda: EloRatingSystem().batch_update_from_df(df), self.repeat)
+        return sec, len(df)
+
+    def bench_normalize_team_name(self):
+        from team_names import TEAM_MAPPING, normalize_team_name
+        base = list(TEAM_MAPPING)
+        variants = [base[i % len(base)] + (" FC" if i % 3 == 0 else "") for i in range(min(self.n, 50000))]
+        _, sec = _timed(lambda: [normalize_team_name(v) for v in variants], self.repeat)
+        return sec, len(variants)
+
+    def _fixtures(self):
+        df = self.frame()
+        k = min(self.n, 2000)
+        return list(df['home'].iloc[-k:]), list(df['away'].iloc[-k:])
+
+    def bench_predict_match_ml(self):
+        from inference_engine import predict_match_ml
+        from team_stats import DEFAULT_HOME_STAT, DEFAULT_AWAY_STAT
+        from data_fusion_v8 import fetch_all_fusion_features
+        models, elo = self.models()
+        homes, aways = self._fixtures()
+        fusion = [fetch_all_fusion_features(h, a) for h, a in zip(homes, aways)]
+
+        def run():
+            return [predict_match_ml(models, h, a, dict(DEFAULT_HOME_STAT), dict(DEFAULT_AWAY_STAT), f, elo_sys=elo)
+                    for h, a, f in zip(homes, aways, fusion)]
+        _, sec = _timed(run, self.repeat)
+        return sec, len(homes)
+
+    def bench_predict_batch(self):
+        from inference_engine import predict_batch
+        from team_stats import DEFAULT_HOME_STAT, DEFAULT_AWAY_STAT
+        from data_fusion_v8 import fetch_all_fusion_features
+        models, elo = self.models()
+        homes, aways = self._fixtures()
+        fusion = [fetch_all_fusion_features(h, a) for h, a in zip(homes, aways)]
+        h_stats = [dict(DEFAULT_HOME_STAT) for _ in homes]
+        a_stats = [dict(DEFAULT_AWAY_STAT) for _ in aways]
+        _, sec = _timed(lambda: predict_batch(models, homes, aways, h_stats, a_stats, fusion, elo), self.repeat)
+        return sec, len(homes)
+
+    def bench_calculate_fractal_indicators(self):
+        import data_fusion_v8
+        teams = sorted(set(self.frame()['home']))
+        calls = min(self.n, 20000)
+
+        def run():
+            done = 0
+            while done < calls:
+                data_fusion_v8._FRACTAL_MEMO.clear()
+                for t in teams[:calls - done]:
+                    data_fusion_v8.calculate_fractal_indicators(t)
+                done += min(len(teams), calls - done)
+        _, sec = _timed(run, self.repeat)
+        return sec, calls
+
+    def bench_auto_update_matching(self):
+        from soccer_real_data_engine import EloRatingSystem, BrierScoreTracker
+        from soccer_auto_result import apply_results
+        df = self.frame()
+        k = min(self.n, 2000)
+        recent = df.iloc[-k:]
+        results = [{'home': h, 'away': a, 'result': int(r), 'date': f"d{i}"}
+                   for i, (h, a, r) in enumerate(zip(recent['home'], recent['away'], recent['result']))]
+
+        def run():
+            tracker = BrierScoreTracker()
+            tracker.predictions = [
+                {'match_id': f"{h}_vs_{a}_{i}", 'home': h, 'away': a, 'h_prob': 0.45, 'd_prob': 0.27,
+                 'a_prob': 0.28, 'prediction': "승", 'actual_result': None, 'brier_score': None, 'date': ""}
+                for i, (h, a) in enumerate(zip(recent['home'].iloc[-300:], recent['away'].iloc[-300:]))]
+            return apply_results(EloRatingSystem(), tracker, results, set())
+        _, sec = _timed(run, self.repeat)
+        return sec, len(results)
+
+    def bench_season_simulation(self):
+        from soccer_real_data_engine import EloRatingSystem
+        from season_simulator import simulate_season
+        df = self.frame()
+        elo = EloRatingSystem()
+        elo.ratings = {}
+        elo.batch_update_from_df(df.iloc[-20000:])
+        teams = sorted(set(df.loc[df['league'] == df['league'].iloc[-1], 'home'].astype(str)))[:20]
+        fixtures = [(h, a) for h in teams for a in teams if h != a]
+        _, sec = _timed(lambda: simulate_season(fixtures, elo, n_sims=self.n, n_workers=1), self.repeat)
+        return sec, self.n
+
+    def bench_elo_tuning(self):
+        from elo_tuner import tune_elo, load_history
+        home_idx, away_idx, results, teams = load_history([self.frame()])
+        _, sec = _timed(lambda: tune_elo(home_idx, away_idx, results, len(teams)), self.repeat)
+        return sec, len(results)
+
+    def bench_goal_model_fit(self):
+        from goal_model import fit_goal_model
+        df = self.frame()
+        _, sec = _timed(lambda: fit_goal_model([df]), self.repeat)
+        return sec, len(df)
+
+    def bench_odds_devig(self):
+        from odds_devig import odds_features
+        df, _ = self._parse(with_odds=True)
+        _, sec = _timed(lambda: odds_features(df, 'power'), self.repeat)
+        return sec, len(df)
+
+    def bench_elo_asof(self):
+        from soccer_real_data_engine import EloRatingSystem
+        df = self.frame()
+        elo = EloRatingSystem()
+        elo.batch_update_from_df(df)
+        teams = pd.concat([df['home'], df['away']], ignore_index=True)
+        dates = pd.concat([df['date'], df['date']], ignore_index=True)
+        _, sec = _timed(lambda: elo.get_elo_asof_batch(teams, dates), self.repeat)
+        return sec, len(teams)
+
+    def bench_pair_cache(self):
+        from pair_cache import PairPredictionCache, league_teams
+        from data_fusion_v8 import build_fusion_table
+        models, elo = self.models()
+        homes, aways = self._fixtures()
+        fusion_table = build_fusion_table()
+        cache = PairPredictionCache(league_teams([self.frame()]))
+        cache.refresh(models, 0, elo, None, {}, fusion_table)
+        team = homes[-1]
+
+        def run():
+            elo.ratings[team] = elo.get_elo(team) + 1.0
+            view = cache.refresh(models, 0, elo, None, {}, fusion_table)
+            return [view.lookup(h, a) for h, a in zip(homes, aways)]
+        _, sec = _timed(run, self.repeat)
+        return sec, len(homes)
+
+
+def _chrono_key(path):
+    """시즌 디렉터리 시간순 정렬 (season_code 의 '_<세기>' 접미사 = 더 오래된 시즌)"""
+    season = path.split(os.sep)[-2]
+    code, _, century = season.partition("_")
+    yy = int(code[:2])
+    year = (2000 + yy if yy <= 24 else 1900 + yy) - 100 * int(century or 0)
+    return (year, os.path.basename(path))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """같은 N 의 공통 벤치 비교 → {bench: {'ratio', 'regressed'}}"""
+    if baseline.get('meta', {}).get('n_matches') != results['meta']['n_matches']:
+        return {}
+    out = {}
+    for name, cur in results['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old or not old.get('seconds'):
+            continue
+        ratio = cur['seconds'] / old['seconds']
+        out[name] = {'baseline_seconds': old['seconds'], 'ratio': round(ratio, 3), 'regressed': ratio > 1 + threshold}
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="10k", help="10k / 100k / 1m 또는 경기 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="일부 벤치만 실행")
+    parser.add_argument("--repeat", type=int, default=1, help="벤치별 반복 (최솟값 기록)")
+    parser.add_argument("--out", default=None, help="결과 JSON (기본: benchmarks/results/<scale>_<시각>.json)")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판정 비율 (0.25 = 25%% 느려짐)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    n = SCALES.get(args.scale.lower()) or int(args.scale)
+    results = {'meta': {
+        'scale': args.scale, 'n_matches': n, 'seed': args.seed, 'repeat': args.repeat,
+        'timestamp': datetime.now().isoformat(timespec='seconds'), 'git_commit': _git_commit(),
+        'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+        'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+    }, 'results': {}}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="sg_bench_") as work:
+        os.chdir(work)  # ELO/Brier/학습 행렬 저장이 저장소 파일을 건드리지 않도록
+        try:
+            _, gen_sec = _timed(lambda: write_tree(os.path.join(work, "fdata"), n, args.seed))
+            results['meta']['generate_seconds'] = round(gen_sec, 3)
+            suite = Suite(os.path.join(work, "fdata"), n, args.repeat)
+            for name in args.only or BENCHMARKS:
+                sec, rows = getattr(suite, f"bench_{name}")()
+                results['results'][name] = {'seconds': round(sec, 4), 'rows': rows,
+                                            'rows_per_sec': round(rows / sec, 1) if sec > 0 else None}
+                print(json.dumps({'bench': name, **results['results'][name]}), flush=True)
+        finally:
+            os.chdir(cwd)
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            diff = compare(results, json.load(f), args.threshold)
+        results['comparison'] = {'baseline': args.baseline, 'threshold': args.threshold, 'benches': diff}
+        regressed = [k for k, v in diff.items() if v['regressed']]
+        for k, v in diff.items():
+            print(f"{'🔴' if v['regressed'] else '🟢'} {k}: ×{v['ratio']} (baseline {v['baseline_seconds']}s)")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{args.scale.lower()}_{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+    print(f"results → {out}")
+    sys.exit(1 if regressed and args.fail_on_regression else 0)
+
+
+if __name__ == "__main__":
+    main()
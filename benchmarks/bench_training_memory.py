@@ -0,0 +1,101 @@
+"""
+📏 [V10.4] 학습 파이프라인 최대 메모리(peak RSS) 비교
+- legacy : V10.3 방식 (float64 vstack + XGBClassifier + X_train[y_train == 2] 슬라이스)
+- memmap : model_trainer.train_ensemble (float32 memmap + QuantileDMatrix 스트리밍)
+각 모드는 별도 프로세스에서 실행되어 서로의 peak RSS에 영향을 주지 않습니다.
+
+사용법: python benchmarks/bench_training_memory.py --rows 300000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _synthetic(rows, refl_rows):
+    import numpy as np
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, 16))
+    X[rng.random(rows) < 0.01, 7] = np.nan  # 배당 누락 경기 흉내
+    y = rng.choice([0, 1, 2], rows, p=[0.28, 0.26, 0.46])
+    X_refl = rng.normal(size=(refl_rows, 16)).astype(np.float32)
+    y_refl = rng.choice([0, 1, 2], refl_rows).astype(np.int8)
+    return X, y, X_refl, y_refl
+
+
+def _run_legacy(X_real, y_real, X_refl, y_refl):
+    import numpy as np
+    import xgboost as xgb
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.ensemble import IsolationForest
+
+    nan_mask = ~np.isnan(X_real).any(axis=1)
+    X_real, y_real = X_real[nan_mask], y_real[nan_mask]
+    split_idx = int(len(X_real) * 0.8)
+    X_train, y_train = X_real[:split_idx], y_real[:split_idx]
+    sample_weights = np.ones(len(X_train))
+    X_train = np.vstack([X_train, X_refl])
+    y_train = np.concatenate([y_train, y_refl])
+    sample_weights = np.concatenate([sample_weights, np.full(len(X_refl), 3.0)])
+    clf = xgb.XGBClassifier(objective='multi:softprob', num_class=3, max_depth=5, learning_rate=0.08,
+                            n_estimators=150, tree_method='hist', subsample=0.8, colsample_bytree=0.8,
+                            reg_alpha=0.1, reg_lambda=1.0, random_state=42)
+    clf.fit(X_train, y_train, sample_weight=sample_weights)
+    IsolationForest(contamination=0.05, random_state=42).fit(X_train[y_train == 2])
+    LogisticRegression(max_iter=1000).fit(X_train, y_train)
+
+
+class _ArrayStore:
+    """ReflectionStore와 같은 인터페이스(features, labels, len)의 벤치마크용 대체물"""
+
+    def __init__(self, X, y):
+        self.features, self.labels = X, y
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def _child(mode, rows, refl_rows):
+    from model_trainer import train_ensemble, peak_rss_mb
+    X, y, X_refl, y_refl = _synthetic(rows, refl_rows)
+    base = peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode == "legacy":
+        _run_legacy(X, y, X_refl, y_refl)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            train_ensemble(X, y, _ArrayStore(X_refl, y_refl), matrix_path=os.path.join(tmp, "m.npy"))
+    print(json.dumps({
+        "mode": mode, "rows": rows,
+        "seconds": round(time.perf_counter() - t0, 2),
+        "input_rss_mb": round(base, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--reflection-rows", type=int, default=2000)
+    parser.add_argument("--child", choices=["legacy", "memmap"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.rows, args.reflection_rows)
+        return
+
+    for mode in ("legacy", "memmap"):
+        out = subprocess.run([sys.executable, __file__, "--child", mode, "--rows", str(args.rows),
+                              "--reflection-rows", str(args.reflection_rows)],
+                             capture_output=True, text=True, check=True)
+        print(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+📏 [V11.0] Understat 리그 페이지 파싱 — 정확성 + 속도 (오프라인)
+- fixtures/understat/*.html : 리그 페이지 녹화본 (datesData / teamsData / playersData 스크립트 구조 동일)
+- fixtures/understat/*.expected.json : 팀별 기대 요약 스탯
+- legacy : V8 방식 (BeautifulSoup 전체 파싱 → script 순회 → 정규식)
+- scan   : understat_ingest.parse_league_page (teamsData 구간 문자열 탐색)
+
+사용법:
+    python benchmarks/bench_understat_parse.py --repeat 50
+    python benchmarks/bench_understat_parse.py --record      # 녹화본 재생성 (고정 시드)
+"""
+import os
+import re
+import sys
+import json
+import glob
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+FIXTURE_DIR = os.path.join(ROOT, "fixtures", "understat")
+
+from understat_ingest import parse_league_page, summarize_teams  # noqa: E402
+
+_FIXTURE_TEAMS = {
+    'EPL': ["Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Burnley", "Chelsea",
+            "Crystal Palace", "Everton", "Fulham", "Leeds", "Liverpool", "Manchester City", "Manchester United",
+            "Newcastle United", "Nottingham Forest", "Sunderland", "Tottenham", "West Ham",
+            "Wolverhampton Wanderers"],
+    'La_Liga': ["Alaves", "Athletic Club", "Atletico Madrid", "Barcelona", "Celta Vigo", "Elche", "Espanyol",
+                "Getafe", "Girona", "Levante", "Mallorca", "Osasuna", "Rayo Vallecano", "Real Betis",
+                "Real Madrid", "Real Oviedo", "Real Sociedad", "Sevilla", "Valencia", "Villarreal"],
+}
+
+
+def _js_escape(text):
+    """understat 페이지처럼 JSON 문자열의 구두점/비ASCII 바이트를 \\xNN 으로 이스케이프"""
+    out = []
+    for ch in text:
+        if ch.isascii() and (ch.isalnum() or ch in " .,-_"):
+            out.append(ch)
+        else:
+            out.extend(f"\\x{b:02X}" for b in ch.encode('utf-8'))
+    return "".join(out)
+
+
+def _record(league, teams, seed):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    teams_data, players = {}, {}
+    for k, title in enumerate(teams):
+        tid = str(70 + k)
+        history = []
+        for r in range(int(rng.integers(6, 12))):
+            xg, xga = float(np.round(rng.gamma(3, 0.5), 6)), float(np.round(rng.gamma(3, 0.45), 6))
+            scored, missed = int(rng.poisson(xg)), int(rng.poisson(xga))
+            history.append({
+                "h_a": "h" if r % 2 == 0 else "a", "xG": xg, "xGA": xga,
+                "npxG": round(xg * 0.9, 6), "npxGA": round(xga * 0.9, 6),
+                "ppda": {"att": int(rng.integers(150, 400)), "def": int(rng.integers(15, 40))},
+                "ppda_allowed": {"att": int(rng.integers(150, 400)), "def": int(rng.integers(15, 40))},
+                "deep": int(rng.integers(1, 15)), "deep_allowed": int(rng.integers(1, 15)),
+                "scored": scored, "missed": missed, "xpts": round(float(rng.uniform(0, 3)), 4),
+                "result": "w" if scored > missed else ("d" if scored == missed else "l"),
+                "date": f"2025-{8 + r // 4:02d}-{1 + (r * 7) % 28:02d} 15:00:00",
+                "wins": int(scored > missed), "draws": int(scored == missed), "loses": int(scored < missed),
+                "pts": 3 if scored > missed else int(scored == missed), "npxGD": round(xg - xga, 6),
+            })
+        teams_data[tid] = {"id": tid, "title": title, "history": history}
+        for p in range(25):  # playersData 가 페이지 용량의 대부분
+            pid = str(1000 + k * 25 + p)
+            players[pid] = {"id": pid, "player_name": f"Jogador Ñúñez {k}-{p}", "games": str(rng.integers(1, 12)),
+                            "time": str(rng.integers(10, 1000)), "goals": str(rng.integers(0, 8)),
+                            "xG": str(rng.uniform(0, 6)), "team_title": title}
+
+    def script(var, obj):
+        return (f"<script>\n\tvar {var} = JSON.parse('{_js_escape(json.dumps(obj, ensure_ascii=False, separators=(',', ':')))}');\n"
+                f"</script>\n")
+
+    filler = "".join(f"<div class=\"row\"><span>{i}</span><a href=\"/team/{i}\">link</a></div>\n" for i in range(400))
+    html = (f"<!DOCTYPE html><html><head><title>{league} xG stats</title></head><body>\n{filler}"
+            + script("datesData", [{"id": str(i), "isResult": True} for i in range(200)])
+            + script("teamsData", teams_data) + script("playersData", list(players.values()))
+            + "</body></html>\n")
+    return html, summarize_teams(teams_data)
+
+
+def _legacy_parse(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup.find_all('script'):
+        if script.string and "var teamsData" in script.string:
+            json_text = re.search(r"JSON\.parse\('(.*?)'\)", script.string).group(1)
+            return summarize_teams(json.loads(json_text.encode('utf-8').decode('unicode_escape')))
+    return {}
+
+
+def _time(fn, html, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(html)
+    return out, (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    if args.record:
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        for seed, (league, teams) in enumerate(_FIXTURE_TEAMS.items()):
+            html, expected = _record(league, teams, seed)
+            with open(os.path.join(FIXTURE_DIR, f"{league}_2025.html"), 'w', encoding='utf-8') as f:
+                f.write(html)
+            with open(os.path.join(FIXTURE_DIR, f"{league}_2025.expected.json"), 'w', encoding='utf-8') as f:
+                json.dump(expected, f, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"recorded {len(_FIXTURE_TEAMS)} pages → {FIXTURE_DIR}")
+        return
+
+    failed = False
+    for page in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+        with open(page[:-len(".html")] + ".expected.json", 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        scan, scan_ms = _time(parse_league_page, html, args.repeat)
+        legacy, legacy_ms = _time(_legacy_parse, html, max(1, args.repeat // 5))
+        ok = scan == expected
+        failed |= not ok
+        print(json.dumps({"page": os.path.basename(page), "kb": round(len(html) / 1024, 1), "teams": len(scan),
+                          "correct": ok, "legacy_matches": legacy == expected,
+                          "scan_ms": round(scan_ms, 3), "legacy_ms": round(legacy_ms, 3),
+                          "speedup": round(legacy_ms / max(scan_ms, 1e-9), 1)}))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+🧪 [V11.3] 오프라인 스탠드인 서버 — football-data / API-Football / R2(S3 호환) 로컬 대역
+- football-data : GET /mmz4281/<season>/<code>.csv  (녹화 또는 synthetic_fdata 로 생성한 CSV 트리 그대로 서빙)
+- API-Football  : GET /fixtures?date=YYYY-MM-DD     (x-apisports-key 필수, <api-dir>/fixtures_<date>.json 녹화본 우선,
+                                                     없으면 CSV 트리의 경기를 날짜 해시로 골라 v3 응답 형식으로 재생)
+- R2 (S3)       : path-style PUT/GET/HEAD/DELETE 객체 + ListObjectsV2 + CreateBucket (서명 검증 없음, 메모리 저장)
+                  boto3 의 aws-chunked(체크섬 트레일러) 업로드와 Range GET 지원
+- 장애 주입 (서비스별): 고정/지터 지연, 오류율(503), 초당 요청 제한(429 + Retry-After)
+- 기존 코드는 베이스 URL/엔드포인트 환경변수로 연결 (호출 시점에 읽음): SG_FDATA_URL, SG_API_FOOTBALL_URL, R2_ENDPOINT_URL
+
+사용법:
+    python benchmarks/standin_servers.py --matches 10k --latency-ms 40 --error-rate 0.02   # export 줄 출력 후 대기
+    with StandinCluster(fdata_dir) as cluster: ...                                        # 코드에서 (env 자동 설정/복원)
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STANDIN_KEY = "standin"  # API-Football / R2 더미 자격 증명
+
+
+class FaultConfig:
+    """서비스별 장애 주입 설정 — 지연(ms) + 지터, 오류율(0~1, 503), 초당 요청 제한(0 = 무제한, 초과 시 429)"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rps=0.0, seed=0):
+        self.latency_ms, self.jitter_ms = latency_ms, jitter_ms
+        self.error_rate, self.throttle_rps = error_rate, throttle_rps
+        self.seed = seed
+
+
+class _Faults:
+    def __init__(self, config):
+        self.config = config or FaultConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens = self.config.throttle_rps
+        self._last = time.monotonic()
+
+    def admit(self):
+        """지연 적용 후 (status, headers) 반환 — None 이면 정상 처리"""
+        c = self.config
+        with self._lock:
+            delay = c.latency_ms + (self._rng.uniform(-c.jitter_ms, c.jitter_ms) if c.jitter_ms else 0.0)
+            fail = c.error_rate > 0 and self._rng.random() < c.error_rate
+            throttled = False
+            if c.throttle_rps > 0:  # 토큰 버킷 (버스트 = 1초 분량)
+                now = time.monotonic()
+                self._tokens = min(c.throttle_rps, self._tokens + (now - self._last) * c.throttle_rps)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                else:
+                    throttled = True
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if throttled:
+            return 429, {'Retry-After': "1"}
+        if fail:
+            return 503, {}
+        return None
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler_cls, faults=None, host="127.0.0.1", port=0, **state):
+        super().__init__((host, port), handler_cls)
+        self.faults = _Faults(faults)
+        self.state = state
+        self.stats = {'requests': 0, 'bytes_in': 0, 'bytes_out': 0, 'injected_errors': 0, 'throttled': 0, 'not_found': 0}
+        self.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, **inc):
+        with self.stats_lock:
+            for k, v in inc.items():
+                self.stats[k] += v
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name=f"standin-{self.server_address[1]}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/octet-stream", headers=None, head_only=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body and not head_only:
+            self.wfile.write(body)
+        self.server.count(requests=1, bytes_out=0 if head_only else len(body), not_found=int(status == 404))
+
+    def _admit(self):
+        rejected = self.server.faults.admit()
+        if rejected is None:
+            return True
+        status, headers = rejected
+        self._drain()
+        self.server.count(injected_errors=int(status == 503), throttled=int(status == 429))
+        self._send(status, b"stand-in fault", "text/plain", headers)
+        return False
+
+    def _drain(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+
+class FootballDataHandler(_Handler):
+    """football-data.co.uk 대역 — data_dir 아래 mmz4281/<season>/<code>.csv 를 그대로 반환"""
+    _PATH = re.compile(r"^/mmz4281/([\w-]+)/(\w+)\.csv$")
+
+    def do_GET(self):
+        if not self._admit():
+            return
+        m = self._PATH.match(urlsplit(self.path).path)
+        path = m and os.path.join(self.server.state['data_dir'], "mmz4281", m.group(1), f"{m.group(2)}.csv")
+        if not path or not os.path.exists(path):
+            return self._send(404, b"Not Found", "text/html")
+        with open(path, 'rb') as f:
+            self._send(200, f.read(), "text/csv")
+
+
+class ApiFootballHandler(_Handler):
+    """API-Football v3 /fixtures 대역"""
+
+    def do_GET(self):
+        if not self._admit():
+            return
+        url = urlsplit(self.path)
+        if url.path != "/fixtures":
+            return self._send(404, b"{}", "application/json")
+        date = parse_qs(url.query).get('date', [""])[0]
+        if not self.headers.get("x-apisports-key"):
+            body = {'errors': {'token': "Missing application key."}, 'results': 0, 'response': []}
+        else:
+            body = self.server.state['fixtures'](date)
+        self._send(200, json.dumps(body, ensure_ascii=False).encode('utf-8'), "application/json")
+
+
+def _replay_fixtures(rows, api_dir=None, per_day=10):
+    """날짜 → API-Football 응답 (녹화본 우선, 없으면 CSV 경기를 날짜 해시 오프셋으로 결정적 선택)"""
+    def fixtures(date):
+        recorded = api_dir and os.path.join(api_dir, f"fixtures_{date}.json")
+        if recorded and os.path.exists(recorded):
+            with open(recorded, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        if not rows:
+            return {'errors': [], 'results': 0, 'response': []}
+        start = int(hashlib.sha1(date.encode()).hexdigest()[:8], 16) % len(rows)
+        picked = [rows[(start + i) % len(rows)] for i in range(min(per_day, len(rows)))]
+        response = [{
+            'fixture': {'id': start + i, 'date': f"{date}T15:00:00+00:00", 'status': {'short': "FT", 'long': "Match Finished"}},
+            'league': {'name': league},
+            'teams': {'home': {'name': home}, 'away': {'name': away}},
+            'goals': {'home': hg, 'away': ag},
+        } for i, (league, home, away, hg, ag) in enumerate(picked)]
+        return {'errors': [], 'results': len(response), 'response': response}
+    return fixtures
+
+
+def _load_replay_rows(data_dir, limit=5000):
+    """CSV 트리에서 API-Football 재생용 (리그, 홈, 원정, 득점, 실점) 최대 limit 행"""
+    import csv
+    rows = []
+    base = os.path.join(data_dir, "mmz4281")
+    for season in sorted(os.listdir(base), reverse=True) if os.path.isdir(base) else []:
+        for name in sorted(os.listdir(os.path.join(base, season))):
+            with open(os.path.join(base, season, name), 'r', encoding='utf-8', errors='replace') as f:
+                for r in csv.DictReader(f):
+                    try:
+                        rows.append((r['Div'], r['HomeTeam'], r['AwayTeam'], int(r['FTHG']), int(r['FTAG'])))
+                    except (KeyError, ValueError):
+                        continue
+                    if len(rows) >= limit:
+                        return rows
+    return rows
+
+
+def _decode_aws_chunked(raw):
+    """aws-chunked 본문(청크 크기;서명\\r\\n데이터\\r\\n ... 0\\r\\n트레일러\\r\\n\\r\\n) → 원본 바이트"""
+    out, pos = bytearray(), 0
+    while True:
+        eol = raw.index(b"\r\n", pos)
+        size = int(raw[pos:eol].split(b";", 1)[0], 16)
+        pos = eol + 2
+        if size == 0:
+            return bytes(out)
+        out += raw[pos:pos + size]
+        pos += size + 2
+
+
+class S3Handler(_Handler):
+    """R2/S3 대역 (path-style: /<bucket>/<key>) — 객체는 server.state['objects'] 메모리 dict"""
+
+    def _split(self):
+        parts = unquote(urlsplit(self.path).path).lstrip("/").split("/", 1)
+        return parts[0], (parts[1] if len(parts) > 1 else "")
+
+    def _xml_error(self, status, code, head_only=False):
+        body = f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><Error><Code>{code}</Code></Error>".encode()
+        self._send(status, b"" if head_only else body, "application/xml", head_only=head_only)
+
+    def do_PUT(self):
+        if not self._admit():
+            return
+        bucket, key = self._split()
+        raw = self._drain()
+        self.server.count(bytes_in=len(raw))
+        objects = self.server.state['objects']
+        if not key:
+            objects.setdefault((bucket, None), None)
+            return self._send(200, headers={'Location': f"/{bucket}"})
+        if "aws-chunked" in (self.headers.get("Content-Encoding") or "") or self.headers.get("x-amz-decoded-content-length"):
+            raw = _decode_aws_chunked(raw)
+        etag = f"\"{hashlib.md5(raw).hexdigest()}\""
+        objects[(bucket, key)] = (raw, etag, time.time())
+        self._send(200, headers={'ETag': etag})
+
+    def _object(self, head_only):
+        if not self._admit():
+            return
+        bucket, key = self._split()
+        url = urlsplit(self.path)
+        if not key and 'list-type' in parse_qs(url.query):
+            return self._list(bucket, parse_qs(url.query).get('prefix', [""])[0])
+        obj = self.server.state['objects'].get((bucket, key))
+        if obj is None:
+            return self._xml_error(404, "NoSuchKey", head_only)
+        data, etag, mtime = obj
+        headers = {'ETag': etag, 'Last-Modified': formatdate(mtime, usegmt=True), 'Accept-Ranges': "bytes"}
+        m = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range") or "")
+        if m:
+            start = int(m.group(1))
+            end = min(int(m.group(2)) if m.group(2) else len(data) - 1, len(data) - 1)
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(data)}"
+            return self._send(206, data[start:end + 1], headers=headers, head_only=head_only)
+        self._send(200, data, headers=headers, head_only=head_only)
+
+    def _list(self, bucket, prefix):
+        items = sorted((k, v) for (b, k), v in self.server.state['objects'].items()
+                       if b == bucket and k and k.startswith(prefix))
+        contents = "".join(f"<Contents><Key>{escape(k)}</Key><Size>{len(v[0])}</Size><ETag>{escape(v[1])}</ETag></Contents>"
+                           for k, v in items)
+        body = (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><ListBucketResult><Name>{escape(bucket)}</Name>"
+                f"<Prefix>{escape(prefix)}</Prefix><KeyCount>{len(items)}</KeyCount><IsTruncated>false</IsTruncated>"
+                f"{contents}</ListBucketResult>").encode()
+        self._send(200, body, "application/xml")
+
+    def do_GET(self):
+        self._object(head_only=False)
+
+    def do_HEAD(self):
+        self._object(head_only=True)
+
+    def do_DELETE(self):
+        if not self._admit():
+            return
+        self.server.state['objects'].pop(self._split(), None)
+        self._send(204)
+
+
+class StandinCluster:
+    """
+    세 스탠드인 서버를 임의 포트로 띄우고 환경변수를 연결 (종료 시 복원).
+    faults: FaultConfig 하나(전체 공통) 또는 {'fdata'|'api'|'s3': FaultConfig}
+    """
+
+    def __init__(self, fdata_dir, faults=None, api_dir=None, host="127.0.0.1", ports=None):
+        per = faults if isinstance(faults, dict) else {k: faults for k in ('fdata', 'api', 's3')}
+        ports = ports or {}
+        self.objects = {}
+        self.servers = {
+            'fdata': StandinServer(FootballDataHandler, per.get('fdata'), host, ports.get('fdata', 0), data_dir=fdata_dir),
+            'api': StandinServer(ApiFootballHandler, per.get('api'), host, ports.get('api', 0),
+                                 fixtures=_replay_fixtures(_load_replay_rows(fdata_dir), api_dir)),
+            's3': StandinServer(S3Handler, per.get('s3'), host, ports.get('s3', 0), objects=self.objects),
+        }
+        self.env = {
+            'SG_FDATA_URL': self.servers['fdata'].url,
+            'SG_API_FOOTBALL_URL': self.servers['api'].url,
+            'API_FOOTBALL_KEY': STANDIN_KEY,
+            'R2_ENDPOINT_URL': self.servers['s3'].url,
+            'R2_ACCESS_KEY_ID': STANDIN_KEY,
+            'R2_SECRET_ACCESS_KEY': STANDIN_KEY,
+        }
+        self._saved_env = {}
+
+    def __enter__(self):
+        for server in self.servers.values():
+            server.start()
+        for k, v in self.env.items():
+            self._saved_env[k] = os.environ.get(k)
+            os.environ[k] = v
+        return self
+
+    def __exit__(self, *exc):
+        for server in self.servers.values():
+            server.stop()
+        for k, v in self._saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        return False
+
+    def stats(self):
+        return {name: dict(server.stats) for name, server in self.servers.items()}
+
+
+def fault_args(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--throttle-rps", type=float, default=0.0, help="서비스별 초당 요청 제한 (0 = 무제한)")
+    parser.add_argument("--fault-seed", type=int, default=0)
+
+
+def faults_from_args(args):
+    return FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rps, args.fault_seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fdata-dir", default=None, help="녹화 CSV 트리 (<dir>/mmz4281/<season>/<code>.csv)")
+    parser.add_argument("--matches", default="10k", help="--fdata-dir 가 없을 때 합성 데이터 경기 수")
+    parser.add_argument("--api-dir", default=None, help="API-Football 녹화본 (fixtures_<date>.json)")
+    parser.add_argument("--fdata-port", type=int, default=0)
+    parser.add_argument("--api-port", type=int, default=0)
+    parser.add_argument("--s3-port", type=int, default=0)
+    fault_args(parser)
+    args = parser.parse_args()
+
+    fdata_dir = args.fdata_dir
+    if fdata_dir is None:
+        from synthetic_fdata import SCALES, write_tree
+        fdata_dir = tempfile.mkdtemp(prefix="sg_fdata_")
+        write_tree(fdata_dir, SCALES.get(args.matches.lower()) or int(args.matches))
+    ports = {'fdata': args.fdata_port, 'api': args.api_port, 's3': args.s3_port}
+    with StandinCluster(fdata_dir, faults_from_args(args), args.api_dir, ports=ports) as cluster:
+        for k, v in cluster.env.items():
+            print(f"export {k}={v}")
+        print(f"# serving {fdata_dir} — Ctrl-C 로 종료", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print(json.dumps(cluster.stats()))
+
+
+if __name__ == "__main__":
+    main()
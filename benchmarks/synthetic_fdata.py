@@ -0,0 +1,168 @@
+"""
+🧪 [V11.3] 결정적 합성 football-data.co.uk CSV 생성기 (벤치마크 / 오프라인 스탠드인용)
+- 리그당 20팀 더블 라운드로빈(380경기) × 5대 리그 × 필요한 시즌 수 → 정확히 N경기
+- 팀 전력(고정 시드) → 포아송 득점 / 슈팅 / 유효슈팅 / 마진 포함 B365 배당
+- 추가 북메이커(Pinnacle / 시장 평균 / 최고) 1X2 + 마감 배당 + 2.5골 오버/언더 — 별도 난수열이라 기존 컬럼 값은 그대로
+- 컬럼/팀명 표기는 football-data 원본과 동일 (Div, Date, HomeTeam, ..., B365H/D/A, "Man City" 등)
+- 같은 (N, seed) 면 바이트 단위로 같은 파일
+
+사용법:
+    python benchmarks/synthetic_fdata.py --matches 100000 --out /tmp/fdata    # <out>/mmz4281/<season>/<code>.csv
+"""
+import os
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from soccer_real_data_engine import LEAGUE_URLS  # noqa: E402
+
+TEAMS_PER_LEAGUE = 20
+MATCHES_PER_SEASON = TEAMS_PER_LEAGUE * (TEAMS_PER_LEAGUE - 1)
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+FDATA_COLUMNS = ['Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR',
+                 'HS', 'AS', 'HST', 'AST', 'B365H', 'B365D', 'B365A']
+# (원본 접두사, 마진) — 1X2 는 <접두사>H/D/A + 마감 <접두사>CH/CD/CA, O/U 는 <O/U 접두사>>2.5 / <2.5
+EXTRA_BOOKS = [('PS', 'P', 1.025), ('Avg', 'Avg', 1.055), ('Max', 'Max', 0.995)]
+EXTRA_COLUMNS = [f"{p}{c}{s}" for p, _, _ in EXTRA_BOOKS for c in ('', 'C') for s in 'HDA'] + \
+                [f"{p}{c}{s}2.5" for _, p, _ in EXTRA_BOOKS for c in ('', 'C') for s in '><']
+
+# football-data 표기 그대로 (FDATA_TEAM_MAP 정규화 경로도 함께 측정되도록 약칭 포함)
+_LEAGUE_TEAMS = {
+    'E0': ["Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Burnley", "Chelsea",
+           "Crystal Palace", "Everton", "Fulham", "Leeds", "Liverpool", "Man City", "Man United",
+           "Newcastle", "Nott'm Forest", "Sunderland", "Tottenham", "West Ham", "Wolves"],
+    'SP1': ["Alaves", "Ath Bilbao", "Ath Madrid", "Barcelona", "Betis", "Celta", "Elche", "Espanol",
+            "Getafe", "Girona", "Levante", "Mallorca", "Osasuna", "Oviedo", "Real Madrid", "Sevilla",
+            "Sociedad", "Valencia", "Vallecano", "Villarreal"],
+    'D1': ["Augsburg", "Bayern Munich", "Bochum", "Dortmund", "Ein Frankfurt", "FC Koln", "Freiburg",
+           "Hamburg", "Heidenheim", "Hoffenheim", "Leverkusen", "M'gladbach", "Mainz", "RB Leipzig",
+           "St Pauli", "Stuttgart", "Union Berlin", "Werder Bremen", "Wolfsburg", "Hertha"],
+    'I1': ["Atalanta", "Bologna", "Cagliari", "Como", "Cremonese", "Fiorentina", "Genoa", "Inter",
+           "Juventus", "Lazio", "Lecce", "Milan", "Napoli", "Parma", "Pisa", "Roma", "Sassuolo",
+           "Torino", "Udinese", "Verona"],
+    'F1': ["Angers", "Auxerre", "Brest", "Le Havre", "Lens", "Lille", "Lorient", "Lyon", "Marseille",
+           "Metz", "Monaco", "Nantes", "Nice", "Paris FC", "Paris SG", "Rennes", "Strasbourg",
+           "Toulouse", "St Etienne", "Clermont"],
+}
+
+
+def season_code(k):
+    """k번째 과거 시즌 코드 — 0 → '2425', 1 → '2324' ... (100시즌 초과분은 '_<세기>' 접미사로 충돌 방지)"""
+    yy = (24 - k) % 100
+    code = f"{yy:02d}{(yy + 1) % 100:02d}"
+    return code if k < 100 else f"{code}_{k // 100}"
+
+
+def _season_frame(rng, code, season_idx, strength):
+    """한 리그 한 시즌 (380경기, 라운드 순) — football-data 컬럼 DataFrame"""
+    teams = _LEAGUE_TEAMS[code]
+    n = TEAMS_PER_LEAGUE
+    h_idx, a_idx = np.nonzero(~np.eye(n, dtype=bool))
+    order = rng.permutation(len(h_idx))
+    h_idx, a_idx = h_idx[order], a_idx[order]
+
+    # 시즌마다 전력이 조금씩 흔들리도록 (승격/강등 흉내)
+    s = strength + rng.normal(0, 0.08, n)
+    lam_h = np.exp(0.25 + s[h_idx] - s[a_idx]) * 1.15
+    lam_a = np.exp(0.05 + s[a_idx] - s[h_idx]) * 0.95
+    fthg, ftag = rng.poisson(lam_h), rng.poisson(lam_a)
+    hs = rng.poisson(lam_h * 6 + 5)
+    as_ = rng.poisson(lam_a * 6 + 4)
+    hst = np.minimum(hs, rng.poisson(lam_h * 2.2 + 1))
+    ast = np.minimum(as_, rng.poisson(lam_a * 2.2 + 1))
+
+    # 전력차 → 3-way 확률 → 5% 마진 배당
+    diff = s[h_idx] - s[a_idx] + 0.15
+    p_h = 1 / (1 + np.exp(-2.2 * diff)) * 0.74
+    p_a = (1 - 1 / (1 + np.exp(-2.2 * diff))) * 0.74
+    p_d = 1 - p_h - p_a
+    margin = 1.05
+    odds = np.round(1 / (np.stack([p_h, p_d, p_a], axis=1) * margin), 2)
+
+    extra = _extra_odds(np.random.default_rng([season_idx] + [ord(c) for c in code]),
+                        np.stack([p_h, p_d, p_a], axis=1), lam_h + lam_a)
+
+    day = np.arange(len(h_idx)) // 10 * 7 // 3   # 라운드(10경기)마다 약 2~3일
+    dates = pd.Timestamp(2024 - season_idx % 100, 8, 10) + pd.to_timedelta(day, unit="D")
+    return pd.DataFrame({
+        'Div': code,
+        'Date': dates.strftime("%d/%m/%Y"),
+        'Time': "15:00",
+        'HomeTeam': np.array(teams)[h_idx], 'AwayTeam': np.array(teams)[a_idx],
+        'FTHG': fthg, 'FTAG': ftag,
+        'FTR': np.where(fthg > ftag, 'H', np.where(fthg == ftag, 'D', 'A')),
+        'HS': hs, 'AS': as_, 'HST': hst, 'AST': ast,
+        'B365H': odds[:, 0], 'B365D': odds[:, 1], 'B365A': odds[:, 2],
+        **extra,
+    }, columns=FDATA_COLUMNS + EXTRA_COLUMNS)
+
+
+def _extra_odds(rng, probs, total_goals):
+    """북메이커별 1X2 / O/U 2.5 배당 (개시 → 마감으로 갈수록 실제 확률 쪽으로 이동하는 노이즈)"""
+    over = 1 - np.exp(-total_goals) * (1 + total_goals + total_goals ** 2 / 2)
+    ou = np.stack([over, 1 - over], axis=1)
+    out = {}
+    opening = [np.clip(probs * np.exp(rng.normal(0, 0.06, probs.shape)), 0.02, None),
+               np.clip(ou * np.exp(rng.normal(0, 0.05, ou.shape)), 0.05, None)]
+    closing = [np.clip(probs * np.exp(rng.normal(0, 0.03, probs.shape)), 0.02, None),
+               np.clip(ou * np.exp(rng.normal(0, 0.025, ou.shape)), 0.05, None)]
+    for prefix, ou_prefix, margin in EXTRA_BOOKS:
+        for tag, (p1x2, pou) in (('', opening), ('C', closing)):
+            o1x2 = np.round(1 / np.minimum(p1x2 / p1x2.sum(axis=1, keepdims=True) * margin, 0.97), 2)
+            oou = np.round(1 / np.minimum(pou / pou.sum(axis=1, keepdims=True) * margin, 0.97), 2)  # 배당 ≥ 1.03
+            out.update({f"{prefix}{tag}{s}": o1x2[:, k] for k, s in enumerate('HDA')})
+            out.update({f"{ou_prefix}{tag}{s}2.5": oou[:, k] for k, s in enumerate('><')})
+    return out
+
+
+def generate(n_matches, seed=0):
+    """
+    정확히 n_matches 경기를 오래된 시즌부터 생성.
+    Returns: [(league_name, code, season, DataFrame), ...] (시간순 — 엔진 학습 입력 순서와 동일)
+    """
+    rng = np.random.default_rng(seed)
+    strengths = {code: rng.normal(0, 0.35, TEAMS_PER_LEAGUE) for code in LEAGUE_URLS.values()}
+    per_season = MATCHES_PER_SEASON * len(LEAGUE_URLS)
+    n_seasons = max(1, -(-n_matches // per_season))
+    out, remaining = [], n_matches
+    for k in reversed(range(n_seasons)):
+        for league, code in LEAGUE_URLS.items():
+            if remaining <= 0:
+                break
+            df = _season_frame(rng, code, k, strengths[code])
+            if len(df) > remaining:
+                df = df.iloc[:remaining]
+            remaining -= len(df)
+            out.append((league, code, season_code(k), df))
+    return out
+
+
+def write_tree(out_dir, n_matches, seed=0):
+    """football-data URL 구조(<out>/mmz4281/<season>/<code>.csv)로 기록 — Returns: 파일 경로 리스트"""
+    paths = []
+    for _, code, season, df in generate(n_matches, seed):
+        path = os.path.join(out_dir, "mmz4281", season, f"{code}.csv")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", default="10k", help="경기 수 (숫자 또는 10k/100k/1m)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    n = SCALES.get(args.matches.lower()) or int(args.matches)
+    paths = write_tree(args.out, n, args.seed)
+    print(f"wrote {n} matches in {len(paths)} files → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+📐 [V10.6] Bootstrap XGBoost Ensemble — 모델 불확실성(예측 구간)
+- K개의 XGBoost를 부트스트랩 재표본으로 학습 (프로세스 풀 병렬)
+- 학습 행렬은 SharedMemory에 한 번만 올리고, 워커는 복사 없이 같은 버퍼를 참조
+- 재표본은 행을 모으지 않고 '등장 횟수'를 sample_weight에 곱하는 방식 (추가 행렬 복사 없음)
+- 배치 추론: 멤버별 확률을 한 번에 계산 → 평균 + 백분위 구간 반환
+"""
+import os
+import time
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from model_trainer import XGB_PARAMS, XGB_ROUNDS
+from perf_spans import timed  # ⏱️ [V11.3] 단계별 계측
+
+DEFAULT_MEMBERS = int(os.getenv("SG_BOOTSTRAP_MEMBERS", "0"))  # 0 = 비활성 (옵션 기능)
+DEFAULT_PERCENTILES = (5.0, 95.0)
+
+
+def _attach(name, shape, dtype):
+    """SharedMemory 블록에 붙어서 복사 없는 ndarray 뷰 반환"""
+    # 풀 워커는 부모의 resource_tracker를 공유하므로, unlink는 부모(생성자)만 수행
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _train_member(spec):
+    """워커: 공유 행렬 위에서 부트스트랩 멤버 1개 학습 → (raw booster bytes, 소요 시간, 피크 RSS MB)"""
+    import resource
+    import xgboost as xgb
+
+    t0 = time.perf_counter()
+    shms, arrays = [], []
+    for name, shape, dtype in (spec['X'], spec['y'], spec['w']):
+        shm, arr = _attach(name, shape, dtype)
+        shms.append(shm)
+        arrays.append(arr)
+    X, y, w = arrays
+
+    # 부트스트랩: n개 복원추출의 등장 횟수 → 가중치 (행 복사 없이 동일 분포)
+    rng = np.random.default_rng(spec['seed'])
+    counts = np.bincount(rng.integers(0, len(X), len(X)), minlength=len(X)).astype(np.float32)
+    weights = w * counts
+
+    params = dict(XGB_PARAMS, seed=spec['seed'], nthread=spec['nthread'])
+    dtrain = xgb.QuantileDMatrix(X, label=y, weight=weights)
+    booster = xgb.train(params, dtrain, num_boost_round=spec['rounds'])
+    raw = bytes(booster.save_raw())
+
+    del X, y, w, arrays, dtrain
+    for shm in shms:
+        shm.close()
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return raw, time.perf_counter() - t0, peak_mb
+
+
+class BootstrapEnsemble:
+    """K개 부트스트랩 XGBoost 멤버 + 학습 비용 통계"""
+
+    def __init__(self, boosters, member_stats):
+        self.boosters = boosters
+        self.member_stats = member_stats  # [{'seconds', 'model_kb', 'peak_rss_mb'}, ...]
+
+    def __len__(self):
+        return len(self.boosters)
+
+    def predict_members(self, X):
+        """(K, n, 3) 멤버별 확률 [원정승, 무, 홈승]"""
+        X = np.asarray(X, dtype=np.float32)
+        return np.stack([np.asarray(b.inplace_predict(X)).reshape(len(X), 3) for b in self.boosters])
+
+    def predict_with_intervals(self, X, percentiles=DEFAULT_PERCENTILES):
+        """
+        배치 추론. Returns dict (모두 % 단위, shape (n, 3)):
+            mean, low, high
+        """
+        probs = self.predict_members(X) * 100
+        low, high = np.percentile(probs, percentiles, axis=0)
+        return {'mean': probs.mean(axis=0), 'low': low, 'high': high}
+
+    def cost_report(self):
+        """멤버 1개당 평균 학습 시간 / 모델 크기 / 워커 피크 RSS"""
+        if not self.member_stats:
+            return {}
+        return {
+            'members': len(self),
+            'sec_per_member': round(float(np.mean([s['seconds'] for s in self.member_stats])), 2),
+            'model_kb_per_member': round(float(np.mean([s['model_kb'] for s in self.member_stats])), 1),
+            'worker_peak_rss_mb': round(float(max(s['peak_rss_mb'] for s in self.member_stats)), 1),
+        }
+
+
+@timed("training", model="bootstrap")
+def train_bootstrap_ensemble(X, y, weights=None, members=DEFAULT_MEMBERS, n_workers=None,
+                             seed=42, rounds=XGB_ROUNDS):
+    """
+    X(학습 행렬, memmap 가능)를 SharedMemory로 한 번 올린 뒤 프로세스 풀에서 K개 멤버를 학습합니다.
+    Returns: BootstrapEnsemble (members <= 0 이면 None)
+    """
+    import xgboost as xgb
+
+    if members <= 0 or len(X) == 0:
+        return None
+    n_workers = max(1, min(members, n_workers or os.cpu_count() or 1))
+    nthread = max(1, (os.cpu_count() or 1) // n_workers)
+    if weights is None:
+        weights = np.ones(len(X), dtype=np.float32)
+
+    t0 = time.perf_counter()
+    blocks, specs_arrays = [], []
+    try:
+        for arr in (np.asarray(X, dtype=np.float32), np.asarray(y, dtype=np.float32),
+                    np.asarray(weights, dtype=np.float32)):
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            blocks.append(shm)
+            specs_arrays.append((shm.name, arr.shape, arr.dtype.str))
+
+        seeds = np.random.SeedSequence(seed).generate_state(members)
+        specs = [{'X': specs_arrays[0], 'y': specs_arrays[1], 'w': specs_arrays[2],
+                  'seed': int(s), 'nthread': nthread, 'rounds': rounds} for s in seeds]
+
+        # spawn: Streamlit 등 스레드가 있는 부모 프로세스에서도 안전
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn")) as pool:
+            results = list(pool.map(_train_member, specs))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    boosters, stats = [], []
+    for raw, seconds, peak_mb in results:
+        booster = xgb.Booster(model_file=bytearray(raw))
+        boosters.append(booster)
+        stats.append({'seconds': round(seconds, 3), 'model_kb': round(len(raw) / 1024, 1),
+                      'peak_rss_mb': round(peak_mb, 1)})
+
+    ensemble = BootstrapEnsemble(boosters, stats)
+    logging.info(f"📐 [V10.6] 부트스트랩 앙상블 {members}개 학습 완료 "
+                 f"({time.perf_counter() - t0:.1f}s, 워커 {n_workers}개) — {ensemble.cost_report()}")
+    return ensemble
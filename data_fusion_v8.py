@@ -1,5 +1,6 @@
 import logging
 import random
+import threading
 import numpy as np
 
 # [V8.5 Hyper-Fusion] 데이터 통합 엔진
@@ -49,28 +50,52 @@ def get_luck_factor_data():
         "Chelsea": -0.20 # 실력만큼 승점이 안 나오는 상태 (반등 가능성)
     }
 
+# [V10.7] 허스트 지수 성향 그룹: (기준값, uniform 하한, uniform 상한)
+_HURST_PROFILES = {
+    "Manchester City": (0.65, -0.05, 0.1), "Arsenal": (0.65, -0.05, 0.1), "Liverpool": (0.65, -0.05, 0.1),  # 강팀은 추세 유지 성향
+    "Chelsea": (0.35, -0.1, 0.05), "Manchester Utd": (0.35, -0.1, 0.05),  # 기복이 큰 팀은 평균 회귀 성향
+}
+_HURST_DEFAULT = (0.50, -0.1, 0.1)
+_FRACTAL_MEMO = {}  # {team_name: (hurst, efficiency, skew)} — 값이 팀명만으로 결정되므로 영구 메모
+
+
+def _team_seed(team_name):
+    """팀명 기반 시드 고정 (일관성 있는 지표 생성)"""
+    return sum(ord(c) for c in team_name)
+
+
+def _simulated_history(seed):
+    """
+    최근 10경기 xG 흐름 시뮬레이션.
+    [V10.7] 전역 np.random 대신 호출별 RandomState 인스턴스 사용 (스레드 안전, 전역 난수 상태 불변).
+    기존 np.random.seed(seed) + np.random.normal 과 동일한 MT19937 스트림이므로 값이 완전히 같음.
+    """
+    return np.random.RandomState(seed).normal(1.5, 0.5, 10)
+
+
+def _hurst_draw(seed):
+    """random.seed(seed) 직후 첫 random() 값과 동일 — 전역 random 상태를 건드리지 않음"""
+    return random.Random(seed).random()
+
+
 def calculate_fractal_indicators(team_name):
     """
     [V8.7 Fractal Engine]
     팀의 과거 xG 히스토리를 분석하여 허스트 지수와 효율성을 계산합니다.
     (실제 시계열 데이터가 없는 경우를 위해 시드 기반 시뮬레이션 활용)
+    [V10.7] 부작용 없음(전역 random / np.random 재시드 제거) + 팀별 결과 메모이제이션
     """
-    # 팀명 기반 시드 고정 (일관성 있는 지표 생성)
-    seed = sum(ord(c) for c in team_name)
-    random.seed(seed)
-    np.random.seed(seed)
+    cached = _FRACTAL_MEMO.get(team_name)
+    if cached is not None:
+        return cached
     
-    # 최근 10경기 xG 흐름 시뮬레이션
-    history = np.random.normal(1.5, 0.5, 10)
+    seed = _team_seed(team_name)
+    history = _simulated_history(seed)
     
     # 1. 허스트 지수 (Hurst Exponent) 근사치
     # 0.5: Random Walk, >0.5: Persistence(상승세 유지), <0.5: Mean Reversion(조정/반등 임박)
-    if team_name in ["Manchester City", "Arsenal", "Liverpool"]:
-        hurst = 0.65 + random.uniform(-0.05, 0.1) # 강팀은 추세 유지 성향
-    elif team_name in ["Chelsea", "Manchester Utd"]:
-        hurst = 0.35 + random.uniform(-0.1, 0.05) # 기복이 큰 팀은 평균 회귀 성향
-    else:
-        hurst = 0.50 + random.uniform(-0.1, 0.1)
+    base, lo, hi = _HURST_PROFILES.get(team_name, _HURST_DEFAULT)
+    hurst = base + (lo + (hi - lo) * _hurst_draw(seed))  # == base + random.uniform(lo, hi)
         
     # 2. 효율성 (Efficiency Index)
     # 실효 변동성 대비 추세의 강도
@@ -80,58 +105,191 @@ def calculate_fractal_indicators(team_name):
     # 하방 리스크 (이변 가능성) - Skew가 높을수록 '터질' 확률이 높음
     skew = np.mean(((history - np.mean(history)) / np.std(history))**3)
     
-    return round(hurst, 3), round(efficiency, 3), round(skew, 3)
-
-def fetch_all_fusion_features(home_eng, away_eng):
-    """모든 외부 소스를 퓨전하여 단일 딕셔너리로 반환"""
-    sq_values = get_squad_value_data()
-    injuries = get_injury_impact_data()
-    odds = get_odds_flow_data()
-    luck = get_luck_factor_data()
-    
-    h_val = sq_values.get(home_eng, 200)
-    a_val = sq_values.get(away_eng, 200)
-    sq_ratio = h_val / a_val
-    
-    h_inj = injuries.get(home_eng, 0.0)
-    a_inj = injuries.get(away_eng, 0.0)
-    inj_diff = h_inj - a_inj
-    
-    # 배당 흐름 (홈팀 기준 점수화)
-    # 홈 배당이 떨어지면(-), 원정이 올라가면(+) -> 홈에 유리한 흐름
-    h_odd = odds.get(home_eng, 0.0)
-    a_odd = odds.get(away_eng, 0.0)
-    odd_flow = a_odd - h_odd # 양수일수록 홈팀에 돈이 쏠림
-    
-    # 운 지수
-    h_luck = luck.get(home_eng, 0.0)
-    a_luck = luck.get(away_eng, 0.0)
-    luck_fact = h_luck - a_luck
-    
-    # [V8.7 Fractal Indicators & V8.8 Extreme TTTr]
-    h_hurst, h_eff, h_skew = calculate_fractal_indicators(home_eng)
-    a_hurst, a_eff, a_skew = calculate_fractal_indicators(away_eng)
+    result = (round(hurst, 3), round(efficiency, 3), round(skew, 3))
+    _FRACTAL_MEMO[team_name] = result
+    return result
+
+def calculate_fractal_indicators_batch(team_names):
+    """
+    [V10.7] 여러 팀의 (hurst, efficiency, skew)를 한 번의 벡터 연산으로 계산합니다.
+    calculate_fractal_indicators 와 값이 동일하며, 결과는 메모 캐시에도 채워집니다.
+    Returns: dict {team_name: (hurst, efficiency, skew)}
+    """
+    teams = list(dict.fromkeys(team_names))
+    if not teams:
+        return {}
+    seeds = [_team_seed(t) for t in teams]
     
-    # 🛡️ 신의 방패 (Shield) 트리거: 정배당 강팀의 엔트로피 붕괴 상태 (Extreme Negative Skew + Low Hurst)
-    h_shield_trigger = True if h_hurst < 0.40 and h_skew < -0.8 else False
+    # 난수 스트림은 팀별로 독립이므로 생성만 팀 단위, 통계 계산은 (팀 × 10경기) 행렬 한 번에
+    histories = np.stack([_simulated_history(s) for s in seeds])
+    profiles = np.array([_HURST_PROFILES.get(t, _HURST_DEFAULT) for t in teams])
+    draws = np.array([_hurst_draw(s) for s in seeds])
+    base, lo, hi = profiles[:, 0], profiles[:, 1], profiles[:, 2]
+    hurst = base + (lo + (hi - lo) * draws)
     
-    # 🔱 신의 창 (Spear) 트리거: 역배당 언더독의 역습 효율성 폭발 상태 (High Efficiency + Positive Skew)
-    a_spear_trigger = True if a_eff > 0.65 and a_skew > 0.5 else False
+    std = np.std(histories, axis=1)
+    efficiency = np.abs(np.diff(histories, axis=1).mean(axis=1)) / (std + 1e-6)
+    skew = np.mean(((histories - np.mean(histories, axis=1, keepdims=True)) / std[:, None])**3, axis=1)
     
-    return {
-        "sq_ratio": round(sq_ratio, 3),
-        "inj_diff": round(inj_diff, 3),
-        "odd_flow": round(odd_flow, 3),
-        "luck_factor": round(luck_fact, 3),
-        "hurst_diff": round(h_hurst - a_hurst, 3),
-        "eff_diff": round(h_eff - a_eff, 3),
-        "skew_total": round(h_skew + a_skew, 3),
-        "h_hurst": h_hurst,
-        "h_eff": h_eff,
-        "h_skew": h_skew,
-        "a_hurst": a_hurst,
-        "a_eff": a_eff,
-        "a_skew": a_skew,
-        "h_shield_trigger": h_shield_trigger,
-        "a_spear_trigger": a_spear_trigger
-    }
+    # 반올림은 파이썬 round (np.round와 경계값 처리가 달라 단건 결과와 어긋날 수 있음)
+    results = {}
+    for t, h, e, k in zip(teams, hurst.tolist(), efficiency.tolist(), skew.tolist()):
+        results[t] = _FRACTAL_MEMO.setdefault(t, (round(h, 3), round(e, 3), round(k, 3)))
+    return results
+
+def get_team_fractal(team_name, fractal_table=None):
+    """
+    [V10.8] 실측 프랙탈 테이블(fractal_engine.FractalTable)에 팀이 있으면 최신 실측값(O(1)),
+    없으면 V8.7 시드 기반 시뮬레이션 값으로 폴백
+    """
+    if fractal_table is not None:
+        real = fractal_table.latest(team_name)
+        if real is not None:
+            return real
+    return calculate_fractal_indicators(team_name)
+
+# ------------------------------------------------------------------------------
+# 🧮 [V10.9] Fusion Table — 팀별 입력을 배열로 한 번만 구축, 페어 피처는 배치 계산
+# ------------------------------------------------------------------------------
+_FUSION_DEFAULTS = {"sq_value": 200.0, "injury": 0.0, "odds_flow": 0.0, "luck": 0.0}
+PAIR_FEATURE_COLUMNS = [
+    "sq_ratio", "inj_diff", "odd_flow", "luck_factor", "hurst_diff", "eff_diff", "skew_total",
+    "h_hurst", "h_eff", "h_skew", "a_hurst", "a_eff", "a_skew", "h_shield_trigger", "a_spear_trigger",
+]
+
+
+class FusionTable:
+    """
+    팀 1행 = (스쿼드 가치, 부상, 배당 흐름, 운 지수, hurst, efficiency, skew).
+    team_id로 인덱싱되는 열 배열로 보관하며, 처음 보는 팀은 기본값 행을 추가합니다.
+    [V11.3] 모듈 단일 테이블을 세션 스레드가 공유 — 행 추가 / 배열 재구축 / 조회는 락 안에서 (열 길이 불일치 방지)
+    """
+
+    def __init__(self, fractal_table=None):
+        self.fractal_table = fractal_table
+        self.teams = []
+        self.team_index = {}
+        self._cols = {name: [] for name in ("sq_value", "injury", "odds_flow", "luck", "hurst", "eff", "skew")}
+        self._arrays = None
+        self._lock = threading.RLock()
+
+    def add_teams(self, team_names):
+        """팀 행 추가 (이미 있으면 무시) — 외부 소스 dict는 여기서 한 번만 조회"""
+        with self._lock:
+            self._add_teams(team_names)
+
+    def _add_teams(self, team_names):
+        sources = {
+            "sq_value": get_squad_value_data(), "injury": get_injury_impact_data(),
+            "odds_flow": get_odds_flow_data(), "luck": get_luck_factor_data(),
+        }
+        new_teams = [t for t in dict.fromkeys(team_names) if t not in self.team_index]
+        if not new_teams:
+            return
+        # 실측 테이블에 없는 팀의 시뮬레이션 지표는 한 번의 배치로 계산
+        missing = [t for t in new_teams if self.fractal_table is None or t not in self.fractal_table]
+        simulated = calculate_fractal_indicators_batch(missing)
+        for team in new_teams:
+            self.team_index[team] = len(self.teams)
+            self.teams.append(team)
+            for name, src in sources.items():
+                self._cols[name].append(float(src.get(team, _FUSION_DEFAULTS[name])))
+            hurst, eff, skew = simulated.get(team) or get_team_fractal(team, self.fractal_table)
+            self._cols["hurst"].append(float(hurst))
+            self._cols["eff"].append(float(eff))
+            self._cols["skew"].append(float(skew))
+        self._arrays = None
+
+    @property
+    def arrays(self):
+        """{컬럼명: (T,) float64 배열}"""
+        with self._lock:
+            if self._arrays is None:
+                self._arrays = {name: np.array(vals, dtype=np.float64) for name, vals in self._cols.items()}
+            return self._arrays
+
+    def ids(self, team_names):
+        """팀명 목록 → team_id 배열 (없는 팀은 기본값 행 추가)"""
+        with self._lock:
+            self._add_teams(team_names)
+            return np.fromiter((self.team_index[t] for t in team_names), dtype=np.int64, count=len(team_names))
+
+    def pair_features(self, home_ids, away_ids):
+        """
+        배치 페어 피처: home_ids / away_ids (같은 길이 배열) → {컬럼명: (N,) 배열}
+        fetch_all_fusion_features 와 같은 컬럼 (반올림은 np.round)
+        """
+        a = self.arrays
+        h, w = np.asarray(home_ids), np.asarray(away_ids)
+        h_hurst, h_eff, h_skew = a["hurst"][h], a["eff"][h], a["skew"][h]
+        a_hurst, a_eff, a_skew = a["hurst"][w], a["eff"][w], a["skew"][w]
+        return {
+            "sq_ratio": np.round(a["sq_value"][h] / a["sq_value"][w], 3),
+            "inj_diff": np.round(a["injury"][h] - a["injury"][w], 3),
+            "odd_flow": np.round(a["odds_flow"][w] - a["odds_flow"][h], 3),
+            "luck_factor": np.round(a["luck"][h] - a["luck"][w], 3),
+            "hurst_diff": np.round(h_hurst - a_hurst, 3),
+            "eff_diff": np.round(h_eff - a_eff, 3),
+            "skew_total": np.round(h_skew + a_skew, 3),
+            "h_hurst": h_hurst, "h_eff": h_eff, "h_skew": h_skew,
+            "a_hurst": a_hurst, "a_eff": a_eff, "a_skew": a_skew,
+            "h_shield_trigger": (h_hurst < 0.40) & (h_skew < -0.8),
+            "a_spear_trigger": (a_eff > 0.65) & (a_skew > 0.5),
+        }
+
+    def pair_dict(self, home_eng, away_eng):
+        """단일 경기 페어 피처 dict (기존 fetch_all_fusion_features 결과와 동일)"""
+        with self._lock:
+            self._add_teams([home_eng, away_eng])
+            c, i, j = self._cols, self.team_index[home_eng], self.team_index[away_eng]
+        h_hurst, h_eff, h_skew = c["hurst"][i], c["eff"][i], c["skew"][i]
+        a_hurst, a_eff, a_skew = c["hurst"][j], c["eff"][j], c["skew"][j]
+        return {
+            "sq_ratio": round(c["sq_value"][i] / c["sq_value"][j], 3),
+            "inj_diff": round(c["injury"][i] - c["injury"][j], 3),
+            # 배당 흐름 (홈팀 기준 점수화): 양수일수록 홈팀에 돈이 쏠림
+            "odd_flow": round(c["odds_flow"][j] - c["odds_flow"][i], 3),
+            "luck_factor": round(c["luck"][i] - c["luck"][j], 3),
+            "hurst_diff": round(h_hurst - a_hurst, 3),
+            "eff_diff": round(h_eff - a_eff, 3),
+            "skew_total": round(h_skew + a_skew, 3),
+            "h_hurst": h_hurst,
+            "h_eff": h_eff,
+            "h_skew": h_skew,
+            "a_hurst": a_hurst,
+            "a_eff": a_eff,
+            "a_skew": a_skew,
+            # 🛡️ 신의 방패 (Shield) 트리거: 정배당 강팀의 엔트로피 붕괴 상태 (Extreme Negative Skew + Low Hurst)
+            "h_shield_trigger": True if h_hurst < 0.40 and h_skew < -0.8 else False,
+            # 🔱 신의 창 (Spear) 트리거: 역배당 언더독의 역습 효율성 폭발 상태 (High Efficiency + Positive Skew)
+            "a_spear_trigger": True if a_eff > 0.65 and a_skew > 0.5 else False,
+        }
+
+
+_fusion_table = None
+
+
+def build_fusion_table(fractal_table=None, teams=()):
+    """데이터 갱신 시 1회 호출 — 알려진 모든 팀(외부 소스 + 실측 테이블)의 행을 미리 구축"""
+    global _fusion_table
+    table = FusionTable(fractal_table)
+    known = list(get_squad_value_data()) + list(get_injury_impact_data()) + \
+        list(get_odds_flow_data()) + list(get_luck_factor_data())
+    if fractal_table is not None:
+        known += list(fractal_table.teams)
+    table.add_teams(known + list(teams))
+    _fusion_table = table
+    logging.info(f"🧮 [V10.9] 퓨전 테이블 구축: {len(table.teams)}팀")
+    return table
+
+
+def get_fusion_table(fractal_table=None):
+    """현재 퓨전 테이블 — 실측 프랙탈 테이블이 교체(데이터 갱신)되면 재구축"""
+    if _fusion_table is None or _fusion_table.fractal_table is not fractal_table:
+        return build_fusion_table(fractal_table)
+    return _fusion_table
+
+
+def fetch_all_fusion_features(home_eng, away_eng, fractal_table=None):
+    """모든 외부 소스를 퓨전하여 단일 딕셔너리로 반환 — [V10.9] 사전 구축된 퓨전 테이블 조회"""
+    return get_fusion_table(fractal_table).pair_dict(home_eng, away_eng)
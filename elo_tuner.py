@@ -0,0 +1,212 @@
+"""
+🎛️ [V11.3] ELO Tuner — (K, 홈 어드밴티지, 무승부 기준값) 수백 개 설정을 전체 히스토리 한 번의 재생으로 동시 평가
+- 레이팅은 (팀 × 설정) 행렬 — 경기마다 두 팀 행을 설정 벡터 전체에 대해 한 번에 갱신
+- 무승부 기준값은 레이팅 갱신에 영향이 없으므로 재생은 (K × 홈 어드밴티지) 열만, 무승부 기준값은 채점 때 브로드캐스트
+- 채점: 경기 전 확률(EloRatingSystem.expected_score 와 같은 식)의 3-way Brier(/3) + log-loss, 초반 warmup 경기는 제외
+- 출력: 최적 설정 + 전체 순위표 + 파라미터별 민감도 (값마다 다른 파라미터 최적화 시 최고 Brier)
+
+사용법:
+    python elo_tuner.py                                              # 기본 그리드 (7 × 7 × 6 = 294개 설정)
+    python elo_tuner.py --k 16,24,32,40 --home-adv 40,65,90 --draw-base 0.24,0.28 --json elo_tuning.json
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+DEFAULT_K_GRID = (10, 15, 20, 25, 32, 40, 50)
+DEFAULT_HOME_ADV_GRID = (0, 25, 50, 65, 80, 100, 120)
+DEFAULT_DRAW_BASE_GRID = (0.20, 0.24, 0.26, 0.28, 0.30, 0.32)
+DEFAULT_ELO = 1500
+WARMUP_FRAC = 0.1            # 채점 제외 초반 경기 비율 (전원 1500 출발 구간)
+SCORE_BLOCK = 4096           # 경기 전 기대값을 모았다가 한 번에 채점하는 블록 크기
+EPS = 1e-15
+
+
+def _outcome_probs(exp_h, draw_base):
+    """expected_score 와 같은 무승부 분배 — exp_h (..., C), draw_base (D,) → (홈승, 무, 원정승) 각 (..., C, D)"""
+    draw = draw_base * (1.0 - np.abs(exp_h[..., None] - 0.5) * 2)
+    h_win = exp_h[..., None] * (1.0 - draw)
+    a_win = (1.0 - exp_h[..., None]) * (1.0 - draw)
+    total = h_win + draw + a_win + 1e-9
+    return h_win / total, draw / total, a_win / total
+
+
+class EloTuningResult:
+    """설정별 점수 + 순위/민감도 리포트"""
+
+    def __init__(self, configs, brier, logloss, n_scored, n_matches, seconds, default=None):
+        self.configs = configs            # [(k, home_adv, draw_base), ...]
+        self.brier = brier                # (len(configs),)
+        self.logloss = logloss
+        self.n_scored = n_scored
+        self.n_matches = n_matches
+        self.seconds = seconds
+        self.default = default
+
+    def ranking(self):
+        """Brier 오름차순 (동률은 log-loss) 전체 순위표"""
+        order = np.lexsort((self.logloss, self.brier))
+        return [{'rank': r + 1, 'k': self.configs[i][0], 'home_adv': self.configs[i][1],
+                 'draw_base': self.configs[i][2], 'brier': round(float(self.brier[i]), 6),
+                 'logloss': round(float(self.logloss[i]), 6)} for r, i in enumerate(order)]
+
+    @property
+    def best(self):
+        return self.ranking()[0]
+
+    def sensitivity(self):
+        """
+        파라미터별 민감도 — 값마다 나머지 파라미터를 최적화했을 때의 최고 Brier 와 전역 최적 대비 차이
+        Returns: {'k': [{'value', 'best_brier', 'delta'}, ...], 'home_adv': [...], 'draw_base': [...]} (차이 작은 순)
+        """
+        best = float(self.brier.min())
+        out = {}
+        for pos, name in enumerate(('k', 'home_adv', 'draw_base')):
+            values = sorted({c[pos] for c in self.configs})
+            rows = []
+            for v in values:
+                mask = np.array([c[pos] == v for c in self.configs])
+                b = float(self.brier[mask].min())
+                rows.append({'value': v, 'best_brier': round(b, 6), 'delta': round(b - best, 6)})
+            out[name] = sorted(rows, key=lambda r: r['delta'])
+        return out
+
+    def report(self, top=10):
+        ranking = self.ranking()
+        default_row = next((r for r in ranking if self.default and
+                            (r['k'], r['home_adv'], r['draw_base']) == tuple(self.default)), None)
+        return {
+            'matches': self.n_matches, 'scored': self.n_scored, 'configs': len(self.configs),
+            'seconds': round(self.seconds, 3), 'best': ranking[0], 'default': default_row,
+            'top': ranking[:top], 'sensitivity': self.sensitivity(),
+        }
+
+
+def tune_elo(home_idx, away_idx, results, n_teams, k_grid=DEFAULT_K_GRID, home_adv_grid=DEFAULT_HOME_ADV_GRID,
+             draw_base_grid=DEFAULT_DRAW_BASE_GRID, warmup=None, default=None):
+    """
+    시간순 경기 배열(팀 인덱스, 결과 2/1/0)을 모든 설정으로 동시에 재생합니다.
+    Returns: EloTuningResult
+    """
+    home_idx = np.asarray(home_idx, dtype=np.int64)
+    away_idx = np.asarray(away_idx, dtype=np.int64)
+    actual_h = np.asarray(results, dtype=np.float64) / 2.0      # 2 → 1.0, 1 → 0.5, 0 → 0.0
+    results = np.asarray(results, dtype=np.int64)
+    n = len(home_idx)
+    warmup = int(n * WARMUP_FRAC) if warmup is None else min(int(warmup), n)
+
+    kk, hh = np.meshgrid(np.asarray(k_grid, dtype=np.float64), np.asarray(home_adv_grid, dtype=np.float64),
+                         indexing='ij')
+    k_vec, ha_vec = kk.ravel(), hh.ravel()                        # 재생 열 = (K, 홈 어드밴티지) 조합
+    db_vec = np.asarray(draw_base_grid, dtype=np.float64)
+    n_cols, n_db = len(k_vec), len(db_vec)
+
+    ratings = np.full((n_teams, n_cols), float(DEFAULT_ELO))      # 팀 행이 연속 — 경기당 두 행만 갱신
+    block = np.empty((SCORE_BLOCK, n_cols))
+    brier_sum = np.zeros((n_cols, n_db))
+    logloss_sum = np.zeros((n_cols, n_db))
+
+    def score(exp_h, res):
+        p_h, p_d, p_a = _outcome_probs(exp_h, db_vec)             # (B, C, D)
+        onehot = [(res == r)[:, None, None] for r in (2, 1, 0)]
+        brier = sum((p - o) ** 2 for p, o in zip((p_h, p_d, p_a), onehot)) / 3.0
+        p_act = np.where(onehot[0], p_h, np.where(onehot[1], p_d, p_a))
+        brier_sum[...] += brier.sum(axis=0)
+        logloss_sum[...] += -np.log(np.clip(p_act, EPS, 1.0)).sum(axis=0)
+
+    t0 = time.perf_counter()
+    with span("elo_tune", configs=n_cols * n_db) as s:
+        filled, block_start = 0, warmup
+        for i in range(n):
+            r_h, r_a = ratings[home_idx[i]], ratings[away_idx[i]]      # 행 뷰 (제자리 갱신)
+            exp_h = 1.0 / (1.0 + 10.0 ** ((r_a - (r_h + ha_vec)) / 400.0))
+            if i >= warmup:
+                block[filled] = exp_h
+                filled += 1
+                if filled == SCORE_BLOCK:
+                    score(block, results[block_start:block_start + filled])
+                    block_start += filled
+                    filled = 0
+            delta = k_vec * (actual_h[i] - exp_h)
+            r_h += delta
+            r_a -= delta
+        if filled:
+            score(block[:filled], results[block_start:block_start + filled])
+        s.add(rows=n)
+    seconds = time.perf_counter() - t0
+
+    n_scored = max(n - warmup, 1)
+    configs = [(k_grid[ki], home_adv_grid[hi], draw_base_grid[di])
+               for ki in range(len(k_grid)) for hi in range(len(home_adv_grid)) for di in range(n_db)]
+    result = EloTuningResult(configs, (brier_sum / n_scored).ravel(), (logloss_sum / n_scored).ravel(),
+                             n - warmup, n, seconds, default)
+    logging.info(f"🎛️ [V11.3] ELO 튜닝: {len(configs)}개 설정 × {n:,}경기 재생 {seconds:.2f}s "
+                 f"— 최적 {result.best}")
+    return result
+
+
+def load_history(chunks):
+    """매치 청크 반복자(iter_match_chunks) → (home_idx, away_idx, results, teams) — 팀명은 등장 순 인덱스"""
+    index = {}
+    homes, aways, results = [], [], []
+    for df in chunks:
+        for col, out in (('home', homes), ('away', aways)):
+            names = df[col].astype(str).tolist()
+            out.append(np.fromiter((index.setdefault(t, len(index)) for t in names), dtype=np.int32,
+                                   count=len(names)))
+        results.append(df['result'].to_numpy(dtype=np.int8))
+    if not results:
+        return np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.int8), []
+    return np.concatenate(homes), np.concatenate(aways), np.concatenate(results), list(index)
+
+
+def _grid(text, cast):
+    return tuple(cast(v) for v in text.split(",") if v.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", default=",".join(map(str, DEFAULT_K_GRID)))
+    parser.add_argument("--home-adv", default=",".join(map(str, DEFAULT_HOME_ADV_GRID)))
+    parser.add_argument("--draw-base", default=",".join(map(str, DEFAULT_DRAW_BASE_GRID)))
+    parser.add_argument("--warmup", type=int, default=None, help=f"채점 제외 초반 경기 수 (기본: 전체의 {WARMUP_FRAC:.0%})")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", default=None, help="리포트 JSON 경로")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from soccer_real_data_engine import iter_match_chunks, EloRatingSystem
+
+    default = (32, EloRatingSystem.HOME_ADVANTAGE, EloRatingSystem.DRAW_BASE)
+    k_grid = tuple(sorted(set(_grid(args.k, int)) | {default[0]}))
+    ha_grid = tuple(sorted(set(_grid(args.home_adv, float)) | {float(default[1])}))
+    db_grid = tuple(sorted(set(_grid(args.draw_base, float)) | {default[2]}))
+    home_idx, away_idx, results, teams = load_history(iter_match_chunks())
+    if not len(results):
+        raise SystemExit("❌ 매치 데이터가 없습니다")
+
+    res = tune_elo(home_idx, away_idx, results, len(teams), k_grid, ha_grid, db_grid, args.warmup,
+                   default=(default[0], float(default[1]), default[2]))
+    report = res.report(args.top)
+    for name, grid in (('k', k_grid), ('home_adv', ha_grid), ('draw_base', db_grid)):
+        if len(grid) > 1 and report['best'][name] in (grid[0], grid[-1]):
+            logging.warning(f"⚠️ 최적 {name}={report['best'][name]:g} 이 그리드 경계 — 범위를 넓혀 재탐색 권장")
+    print(f"{'rank':>4} {'K':>4} {'home':>6} {'draw':>6} {'brier':>10} {'logloss':>10}")
+    for r in report['top'] + ([report['default']] if report['default'] not in report['top'] else []):
+        print(f"{r['rank']:>4} {r['k']:>4} {r['home_adv']:>6g} {r['draw_base']:>6g} {r['brier']:>10.6f} {r['logloss']:>10.6f}")
+    for name, rows in report['sensitivity'].items():
+        print(f"[{name}] " + "  ".join(f"{r['value']:g}:+{r['delta']:.5f}" for r in rows))
+    print(json.dumps({k: report[k] for k in ('matches', 'scored', 'configs', 'seconds')}), file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
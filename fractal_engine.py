@@ -0,0 +1,201 @@
+"""
+🌀 [V10.8] Real Fractal Engine — 실제 경기 히스토리 기반 Hurst / 효율성 / 스큐
+- 매치 캐시(real_match_data_cache.csv)의 팀별 득점 시퀀스로 롤링 지표 계산
+- Hurst: 재조정 범위(R/S) 분석 — 창 안을 여러 크기 구간으로 나눠 log(R/S) ~ log(n) 기울기 (iid 기준선 보정)
+- 효율성 / 스큐: V8.7 정의 그대로 (|평균 변화| / 표준편차, 표준화 3차 모멘트)
+- (팀 × 창) 전체를 한 번의 배열 연산으로 계산 (팀 단위 청크로 메모리 상한)
+- 결과는 시간 인덱스(매치 행 번호) 테이블 — 최신값 O(1), as-of 조회는 창 끝 경기 날짜(epoch 일 수) 기준
+- [V11.3] build_fractal_table_from_cache: 매치 캐시에서 팀 / 득점 / 날짜 컬럼만 청크로 읽어 구축
+"""
+import logging
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+from soccer_real_data_engine import NAT_DAY, _to_day, _to_days, iter_match_chunks
+
+FRACTAL_WINDOW = 20               # 롤링 창 길이 (경기 수)
+RS_SIZES = (4, 5, 10, 20)         # R/S 구간 크기 (모두 FRACTAL_WINDOW의 약수)
+TEAM_CHUNK = 256                  # 한 번에 처리하는 팀 수 (메모리 상한)
+FRACTAL_TABLE_PATH = "fractal_table.npz"
+
+
+def _team_sequences(df, value_col):
+    """
+    경기 DataFrame → 팀별 시퀀스 패딩 행렬.
+    Returns: (teams, values[T, L], match_idx[T, L], lengths[T])  (빈 칸은 NaN / -1)
+    """
+    n = len(df)
+    rows = np.arange(n)
+    long = pd.DataFrame({
+        'team': np.concatenate([df['home'].astype(str).to_numpy(), df['away'].astype(str).to_numpy()]),
+        'match_idx': np.concatenate([rows, rows]),
+        'side': np.concatenate([np.zeros(n, dtype=np.int8), np.ones(n, dtype=np.int8)]),
+    })
+    h_val, a_val = value_col
+    long['value'] = np.concatenate([df[h_val].to_numpy(dtype=np.float64), df[a_val].to_numpy(dtype=np.float64)])
+    long = long.sort_values(['team', 'match_idx', 'side'], kind='stable')
+
+    codes, teams = pd.factorize(long['team'], sort=True)
+    pos = long.groupby(codes, sort=False).cumcount().to_numpy()
+    lengths = np.bincount(codes, minlength=len(teams))
+    L = int(lengths.max()) if len(lengths) else 0
+
+    values = np.full((len(teams), L), np.nan)
+    match_idx = np.full((len(teams), L), -1, dtype=np.int64)
+    values[codes, pos] = long['value'].to_numpy()
+    match_idx[codes, pos] = long['match_idx'].to_numpy()
+    return list(teams), values, match_idx, lengths
+
+
+def _rescaled_range(windows, size):
+    """(..., W) 창을 size 크기 구간으로 나눠 평균 R/S 계산"""
+    chunks = windows.reshape(*windows.shape[:-1], windows.shape[-1] // size, size)
+    dev = chunks - chunks.mean(axis=-1, keepdims=True)
+    z = np.cumsum(dev, axis=-1)
+    r = z.max(axis=-1) - z.min(axis=-1)
+    s = chunks.std(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(s > 0, r / np.where(s > 0, s, 1.0), np.nan)
+    # 분산 0 구간(같은 득점 반복)은 제외하고 평균
+    valid = ~np.isnan(rs)
+    count = valid.sum(axis=-1)
+    total = np.where(valid, rs, 0.0).sum(axis=-1)
+    with np.errstate(invalid='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+@lru_cache(maxsize=None)
+def _null_log_rs(window=FRACTAL_WINDOW):
+    """
+    독립 잡음(iid) 창의 구간 크기별 평균 log(R/S) — 고정 시드 시뮬레이션으로 1회 계산.
+    소표본 R/S의 편향(Anis-Lloyd 근사는 n=4~5에서 부정확)을 같은 계산 경로로 보정하기 위함.
+    """
+    noise = np.random.default_rng(0).normal(size=(8192, window))
+    with np.errstate(divide='ignore'):
+        return np.array([np.nanmean(np.log(_rescaled_range(noise, n))) for n in RS_SIZES])
+
+
+def _window_indicators(windows):
+    """(T, N, W) 창 배열 → (hurst, efficiency, skew) 각 (T, N)"""
+    log_n = np.log(np.array(RS_SIZES, dtype=np.float64))
+    log_ers = _null_log_rs(windows.shape[-1])
+    with np.errstate(divide='ignore'):
+        log_rs = np.stack([np.log(_rescaled_range(windows, n)) for n in RS_SIZES], axis=-1)
+    # 보정 R/S: H = 0.5 + d(log R/S - E[log R/S | iid]) / d(log n) — 무작위 시퀀스는 0.5 근처
+    x = log_n - log_n.mean()
+    y = (log_rs - log_ers) - (log_rs - log_ers).mean(axis=-1, keepdims=True)
+    hurst = 0.5 + (y * x).sum(axis=-1) / (x ** 2).sum()
+    hurst = np.clip(np.where(np.isfinite(hurst), hurst, 0.5), 0.0, 1.0)
+
+    std = windows.std(axis=-1)
+    efficiency = np.abs(np.diff(windows, axis=-1).mean(axis=-1)) / (std + 1e-6)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (windows - windows.mean(axis=-1, keepdims=True)) / std[..., None]
+        skew = np.where(std > 0, np.mean(z ** 3, axis=-1), 0.0)
+    return hurst, efficiency, skew
+
+
+class FractalTable:
+    """
+    팀별 롤링 프랙탈 지표 테이블.
+    평탄 배열(team_id, match_idx 순 정렬) + 팀별 오프셋으로 보관합니다.
+    [V11.3] days: 창 끝 경기 날짜(epoch 일 수, 날짜 없음 = NAT_DAY) — as-of 조회 키 (구버전 저장본은 None)
+    """
+
+    def __init__(self, teams, offsets, match_idx, hurst, efficiency, skew, window=FRACTAL_WINDOW, days=None):
+        self.teams = list(teams)
+        self.team_index = {t: i for i, t in enumerate(self.teams)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)  # 길이 T+1
+        self.match_idx = np.asarray(match_idx, dtype=np.int64)
+        self.days = np.asarray(days, dtype=np.int64) if days is not None else None
+        self.hurst = np.asarray(hurst, dtype=np.float32)
+        self.efficiency = np.asarray(efficiency, dtype=np.float32)
+        self.skew = np.asarray(skew, dtype=np.float32)
+        self.window = window
+        # 최신값은 미리 dict로 만들어 O(1) 조회
+        self._latest = {}
+        for t, i in self.team_index.items():
+            end = self.offsets[i + 1]
+            if end > self.offsets[i]:
+                self._latest[t] = self._row(end - 1)
+
+    def __len__(self):
+        return len(self.match_idx)
+
+    def _row(self, k):
+        return (round(float(self.hurst[k]), 3), round(float(self.efficiency[k]), 3), round(float(self.skew[k]), 3))
+
+    def __contains__(self, team):
+        return team in self._latest
+
+    def latest(self, team):
+        """팀의 가장 최근 (hurst, efficiency, skew) — 없으면 None"""
+        return self._latest.get(team)
+
+    def asof(self, team, date, inclusive=False):
+        """
+        date(날짜 또는 epoch 일 수) 시점까지의 경기만으로 계산된 지표 — 누수 없는 과거 조회 (EloHistory.asof 와 같은 규칙)
+        inclusive=False 면 그 날짜 경기 전, True 면 그 날짜 경기 후 / 날짜 없는 테이블·NaT 는 None
+        """
+        i = self.team_index.get(team)
+        day = _to_day(date)
+        if i is None or self.days is None or day == NAT_DAY:
+            return None
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        k = lo + int(self.days[lo:hi].searchsorted(day, 'right' if inclusive else 'left')) - 1
+        return self._row(k) if k >= lo and self.days[k] != NAT_DAY else None
+
+    def save(self, path=FRACTAL_TABLE_PATH):
+        np.savez_compressed(path, teams=np.array(self.teams, dtype=object), offsets=self.offsets,
+                            match_idx=self.match_idx, hurst=self.hurst, efficiency=self.efficiency,
+                            skew=self.skew, window=self.window,
+                            **({'days': self.days} if self.days is not None else {}))
+
+    @classmethod
+    def load(cls, path=FRACTAL_TABLE_PATH):
+        z = np.load(path, allow_pickle=True)
+        return cls(z['teams'].tolist(), z['offsets'], z['match_idx'], z['hurst'], z['efficiency'],
+                   z['skew'], int(z['window']), z['days'] if 'days' in z.files else None)
+
+
+def build_fractal_table(df, window=FRACTAL_WINDOW, value_col=('h_goals', 'a_goals')):
+    """
+    매치 DataFrame(시간순)에서 모든 팀 × 모든 롤링 창의 프랙탈 지표를 계산합니다.
+    value_col: (홈 컬럼, 원정 컬럼) — 기본은 팀 득점 시퀀스
+    """
+    if df is None or len(df) == 0:
+        return FractalTable([], [0], [], [], [], [], days=[])
+    teams, values, match_idx, lengths = _team_sequences(df, value_col)
+
+    parts = []
+    for start in range(0, len(teams), TEAM_CHUNK):
+        vals = values[start:start + TEAM_CHUNK]
+        if vals.shape[1] < window:
+            break
+        windows = np.lib.stride_tricks.sliding_window_view(vals, window, axis=1)  # (T, N, W) 뷰
+        hurst, eff, skew = _window_indicators(windows)
+        ends = match_idx[start:start + TEAM_CHUNK, window - 1:]
+        valid = ~np.isnan(windows).any(axis=-1)
+        team_ids = np.broadcast_to(np.arange(start, start + len(vals))[:, None], valid.shape)
+        parts.append((team_ids[valid], ends[valid], hurst[valid], eff[valid], skew[valid]))
+
+    if parts:
+        team_id, m_idx, hurst, eff, skew = (np.concatenate(p) for p in zip(*parts))
+    else:
+        team_id = m_idx = np.empty(0, dtype=np.int64)
+        hurst = eff = skew = np.empty(0)
+    # 행은 이미 (team, 창 끝) 순서 — 팀별 오프셋만 계산
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(team_id, minlength=len(teams)))])
+    match_days = _to_days(df['date']) if 'date' in df else np.full(len(df), NAT_DAY, dtype=np.int64)
+    table = FractalTable(teams, offsets, m_idx, hurst, eff, skew, window, days=match_days[m_idx])
+    logging.info(f"🌀 [V10.8] 실측 프랙탈 테이블: {len(teams)}팀, {len(table)}개 롤링 창 (window={window})")
+    return table
+
+
+def build_fractal_table_from_cache(window=FRACTAL_WINDOW, value_col=('h_goals', 'a_goals')):
+    """[V11.3] 매치 캐시에서 팀 / 값 / 날짜 컬럼만 청크로 읽어 구축 (전체 매치 프레임 로드 없음)"""
+    chunks = list(iter_match_chunks(columns=('home', 'away', *value_col)))
+    if not chunks:
+        return build_fractal_table(None, window, value_col)
+    return build_fractal_table(pd.concat(chunks, ignore_index=True), window, value_col)
@@ -0,0 +1,305 @@
+"""
+🥅 [V11.3] Dixon-Coles Goal Model — 팀별 공격/수비 강도 + 홈 어드밴티지 + 저득점 보정(rho) 적합
+- 홈 기대득점 λ = exp(att[홈] − def[원정] + home), 원정 μ = exp(att[원정] − def[홈])
+- 저득점 4칸(0-0, 0-1, 1-0, 1-1)은 Dixon-Coles τ(λ, μ, rho) 로 보정, 경기 가중치는 exp(−ξ × 경과일) 시간 감쇠
+- 로그우도 / 그래디언트는 전 경기 배열 연산 (팀 합산은 bincount) → L-BFGS-B, 파이썬 루프 없음
+- 재적합은 직전 파라미터 테이블(dixon_coles_params.json)에서 웜 스타트 — 매 라운드 갱신 시 수 초
+- 출력 테이블(팀 → 공격/수비)은 inference_engine.predict_batch 의 푸아송 레그가 그대로 사용
+
+사용법:
+    python goal_model.py                     # 매치 캐시로 적합 (기존 테이블이 있으면 웜 스타트)
+    python goal_model.py --cold --xi 0.0019 --top 20
+"""
+import os
+import json
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+GOAL_MODEL_PATH = "dixon_coles_params.json"
+DC_XI = float(os.getenv("SG_DC_XI", "0.0019"))   # 일 단위 시간 감쇠 (반감기 ≈ 1년, Dixon-Coles 0.0065/반주)
+DC_MIN_WEIGHT = 1e-3         # 이보다 가벼운(오래된) 경기는 적합에서 제외
+DC_PRIOR_SD = 1.0            # 공격/수비 로그 강도의 정규 사전분포 표준편차 (식별성 + 경기 수 적은 팀 수축)
+DC_MAX_GOALS = 10            # 스코어 격자 0~9골 (남는 확률은 정규화)
+DC_MAX_ITER = 500
+RHO_BOUNDS = (-0.2, 0.2)
+
+
+def _tau_terms(hg, ag, lam, mu, rho):
+    """τ 보정의 log 값과 ∂/∂log λ, ∂/∂log μ, ∂/∂rho (저득점 4칸 외에는 0)"""
+    n = len(hg)
+    log_tau, d_lam, d_mu, d_rho = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+    c00 = (hg == 0) & (ag == 0)
+    c01 = (hg == 0) & (ag == 1)
+    c10 = (hg == 1) & (ag == 0)
+    c11 = (hg == 1) & (ag == 1)
+
+    lm = lam[c00] * mu[c00]
+    tau = np.maximum(1.0 - lm * rho, 1e-10)
+    log_tau[c00] = np.log(tau)
+    d_lam[c00] = d_mu[c00] = -lm * rho / tau
+    d_rho[c00] = -lm / tau
+
+    tau = np.maximum(1.0 + lam[c01] * rho, 1e-10)
+    log_tau[c01] = np.log(tau)
+    d_lam[c01] = lam[c01] * rho / tau
+    d_rho[c01] = lam[c01] / tau
+
+    tau = np.maximum(1.0 + mu[c10] * rho, 1e-10)
+    log_tau[c10] = np.log(tau)
+    d_mu[c10] = mu[c10] * rho / tau
+    d_rho[c10] = mu[c10] / tau
+
+    log_tau[c11] = np.log(1.0 - rho)
+    d_rho[c11] = -1.0 / (1.0 - rho)
+    return log_tau, d_lam, d_mu, d_rho
+
+
+def dixon_coles_objective(theta, home_idx, away_idx, hg, ag, weights, n_teams, prior_sd=DC_PRIOR_SD):
+    """
+    음의 가중 로그우도(+ 사전분포) / 총 가중치 와 그래디언트.
+    theta = [att (T), def (T), home, rho] — 계승 항(log x!)은 상수라 제외
+    """
+    att, dfn, home, rho = theta[:n_teams], theta[n_teams:2 * n_teams], theta[-2], theta[-1]
+    eta_h = att[home_idx] - dfn[away_idx] + home
+    eta_a = att[away_idx] - dfn[home_idx]
+    lam, mu = np.exp(eta_h), np.exp(eta_a)
+    log_tau, t_lam, t_mu, t_rho = _tau_terms(hg, ag, lam, mu, rho)
+
+    ll = weights * (log_tau + hg * eta_h - lam + ag * eta_a - mu)
+    g_h = weights * (hg - lam + t_lam)          # ∂ll/∂η_h
+    g_a = weights * (ag - mu + t_mu)            # ∂ll/∂η_a
+
+    grad = np.empty_like(theta)
+    grad[:n_teams] = np.bincount(home_idx, g_h, n_teams) + np.bincount(away_idx, g_a, n_teams)
+    grad[n_teams:2 * n_teams] = -np.bincount(away_idx, g_h, n_teams) - np.bincount(home_idx, g_a, n_teams)
+    grad[-2] = g_h.sum()
+    grad[-1] = (weights * t_rho).sum()
+
+    prec = 1.0 / (prior_sd * prior_sd)
+    strengths = theta[:2 * n_teams]
+    total_w = weights.sum()
+    value = -(ll.sum() - 0.5 * prec * (strengths @ strengths)) / total_w
+    grad = -grad / total_w
+    grad[:2 * n_teams] += prec * strengths / total_w
+    return value, grad
+
+
+def fit_dixon_coles(home_idx, away_idx, home_goals, away_goals, n_teams, weights=None, init=None,
+                    prior_sd=DC_PRIOR_SD, max_iter=DC_MAX_ITER):
+    """
+    Dixon-Coles 파라미터 적합 (L-BFGS-B, 해석적 그래디언트).
+    init: 직전 theta (웜 스타트) — 없으면 0 / home 0.25 / rho 0 에서 출발
+    Returns: (theta, info dict: nll, iterations, evaluations, converged)
+    """
+    from scipy.optimize import minimize  # 적합 시에만 import (예측 경로는 scipy.optimize 불필요)
+    home_idx = np.asarray(home_idx, dtype=np.int64)
+    away_idx = np.asarray(away_idx, dtype=np.int64)
+    hg = np.asarray(home_goals, dtype=np.float64)
+    ag = np.asarray(away_goals, dtype=np.float64)
+    weights = np.ones(len(hg)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if init is None:
+        init = np.zeros(2 * n_teams + 2)
+        init[-2] = 0.25
+    bounds = [(None, None)] * (2 * n_teams + 1) + [RHO_BOUNDS]
+    res = minimize(dixon_coles_objective, np.asarray(init, dtype=np.float64), jac=True, method='L-BFGS-B',
+                   bounds=bounds, args=(home_idx, away_idx, hg, ag, weights, n_teams, prior_sd),
+                   options={'maxiter': max_iter, 'gtol': 1e-9, 'ftol': 1e-12})
+    return res.x, {'nll': float(res.fun), 'iterations': int(res.nit), 'evaluations': int(res.nfev),
+                   'converged': bool(res.success)}
+
+
+def score_grid_probs(lam, mu, rho, max_goals=DC_MAX_GOALS):
+    """(λ, μ) 배열 → τ 보정 스코어 격자의 (홈승, 무, 원정승) 확률 (N, 3)"""
+    lam = np.asarray(lam, dtype=np.float64)[:, None]
+    mu = np.asarray(mu, dtype=np.float64)[:, None]
+    k = np.arange(max_goals)
+    log_fact = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_goals)))])
+    pmf_h = np.exp(k * np.log(lam) - lam - log_fact)
+    pmf_a = np.exp(k * np.log(mu) - mu - log_fact)
+    grid = pmf_h[:, :, None] * pmf_a[:, None, :]          # (N, 홈골, 원정골)
+    lam, mu = lam[:, 0], mu[:, 0]
+    grid[:, 0, 0] *= np.maximum(1.0 - lam * mu * rho, 0.0)
+    grid[:, 0, 1] *= 1.0 + lam * rho
+    grid[:, 1, 0] *= 1.0 + mu * rho
+    grid[:, 1, 1] *= 1.0 - rho
+    probs = np.stack([np.tril(np.ones((max_goals, max_goals)), -1),
+                      np.eye(max_goals),
+                      np.triu(np.ones((max_goals, max_goals)), 1)])
+    out = np.einsum('nij,kij->nk', grid, probs)
+    return out / (out.sum(axis=1, keepdims=True) + 1e-12)
+
+
+class DixonColesModel:
+    """팀별 파라미터 테이블 — 배치 추론(predict_batch)과 웜 스타트가 읽는 형식"""
+
+    def __init__(self, teams, attack, defence, home, rho, xi=DC_XI, asof=None, info=None):
+        self.teams = list(teams)
+        self.index = {t: i for i, t in enumerate(self.teams)}
+        self.attack = np.asarray(attack, dtype=np.float64)
+        self.defence = np.asarray(defence, dtype=np.float64)
+        self.home = float(home)
+        self.rho = float(rho)
+        self.xi = xi
+        self.asof = asof
+        self.info = info or {}
+
+    def lookup(self, names):
+        """팀명 → 인덱스 배열 (테이블에 없는 팀은 -1)"""
+        return np.fromiter((self.index.get(n, -1) for n in names), dtype=np.int64, count=len(names))
+
+    def expected_goals(self, homes, aways):
+        """(λ, μ, known) — 두 팀 모두 테이블에 있는 행만 known=True (나머지 λ/μ 는 리그 평균 팀 기준)"""
+        hi, ai = self.lookup(homes), self.lookup(aways)
+        known = (hi >= 0) & (ai >= 0)
+        att = np.append(self.attack, 0.0)          # 인덱스 -1 → 0 (평균 팀)
+        dfn = np.append(self.defence, 0.0)
+        lam = np.exp(att[hi] - dfn[ai] + self.home)
+        mu = np.exp(att[ai] - dfn[hi])
+        return lam, mu, known
+
+    def outcome_probs(self, homes, aways):
+        """(N, 3) [홈승, 무, 원정승] 확률 + known 마스크"""
+        lam, mu, known = self.expected_goals(homes, aways)
+        return score_grid_probs(lam, mu, self.rho), known
+
+    def theta_for(self, teams):
+        """주어진 팀 순서의 웜 스타트 theta (새 팀은 0)"""
+        idx = self.lookup(teams)
+        att = np.where(idx >= 0, np.append(self.attack, 0.0)[idx], 0.0)
+        dfn = np.where(idx >= 0, np.append(self.defence, 0.0)[idx], 0.0)
+        return np.concatenate([att, dfn, [self.home, float(np.clip(self.rho, *RHO_BOUNDS))]])
+
+    def table(self):
+        """공격 − 수비 순 팀 테이블 [{'team', 'attack', 'defence'}, ...]"""
+        order = np.argsort(-(self.attack + self.defence))
+        return [{'team': self.teams[i], 'attack': round(float(self.attack[i]), 4),
+                 'defence': round(float(self.defence[i]), 4)} for i in order]
+
+    def save(self, path=GOAL_MODEL_PATH):
+        """JSON 기록 (임시 파일 → rename)"""
+        payload = {
+            'home': self.home, 'rho': self.rho, 'xi': self.xi, 'asof': self.asof, 'info': self.info,
+            'teams': {t: [float(a), float(d)] for t, a, d in zip(self.teams, self.attack, self.defence)},
+        }
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def from_dict(cls, payload):
+        teams = list(payload['teams'])
+        values = np.array([payload['teams'][t] for t in teams], dtype=np.float64).reshape(len(teams), 2)
+        return cls(teams, values[:, 0], values[:, 1], payload['home'], payload['rho'],
+                   payload.get('xi', DC_XI), payload.get('asof'), payload.get('info'))
+
+
+def load_goal_model(path=GOAL_MODEL_PATH):
+    """저장된 파라미터 테이블 (없거나 깨졌으면 None)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return DixonColesModel.from_dict(json.load(f))
+    except Exception as e:
+        logging.warning(f"⚠️ Dixon-Coles 테이블 로드 실패: {e}")
+        return None
+
+
+def load_goal_history(chunks):
+    """매치 청크 반복자 → (home_idx, away_idx, home_goals, away_goals, dates datetime64[D], teams)"""
+    index = {}
+    homes, aways, hgs, ags, dates = [], [], [], [], []
+    for df in chunks:
+        for col, out in (('home', homes), ('away', aways)):
+            names = df[col].astype(str).tolist()
+            out.append(np.fromiter((index.setdefault(t, len(index)) for t in names), dtype=np.int32,
+                                   count=len(names)))
+        hgs.append(df['h_goals'].to_numpy(dtype=np.int16))
+        ags.append(df['a_goals'].to_numpy(dtype=np.int16))
+        dates.append(df['date'].to_numpy(dtype='datetime64[D]'))
+    if not hgs:
+        empty = np.empty(0, np.int32)
+        return empty, empty, empty, empty, np.empty(0, 'datetime64[D]'), []
+    return (np.concatenate(homes), np.concatenate(aways), np.concatenate(hgs), np.concatenate(ags),
+            np.concatenate(dates), list(index))
+
+
+def decay_weights(dates, xi=DC_XI, asof=None):
+    """exp(−ξ × (기준일 − 경기일)) — 날짜 없는 경기(구버전 캐시)는 감쇠 없이 1.0, 기준일 기본값은 마지막 경기일"""
+    known = ~np.isnat(dates)
+    if asof is None:
+        asof = dates[known].max() if known.any() else None
+    if asof is None:
+        return np.ones(len(dates)), None
+    asof = np.datetime64(asof, 'D')
+    age = (asof - dates).astype('timedelta64[D]').astype(np.float64)
+    weights = np.where(known, np.exp(-xi * np.clip(age, 0.0, None)), 1.0)
+    weights[known & (age < 0)] = 0.0            # 기준일 이후 경기는 제외 (백테스트용 asof)
+    return weights, str(asof)
+
+
+def fit_goal_model(chunks, previous=None, xi=DC_XI, asof=None, prior_sd=DC_PRIOR_SD):
+    """
+    매치 청크 → DixonColesModel. previous(DixonColesModel) 가 있으면 팀명 기준 웜 스타트.
+    """
+    home_idx, away_idx, hg, ag, dates, teams = load_goal_history(chunks)
+    if not teams:
+        return None
+    weights, asof = decay_weights(dates, xi, asof)
+    keep = weights >= DC_MIN_WEIGHT
+    home_idx, away_idx, hg, ag, weights = home_idx[keep], away_idx[keep], hg[keep], ag[keep], weights[keep]
+    active = np.unique(np.concatenate([home_idx, away_idx]))     # 감쇠 구간 밖으로 사라진 팀은 테이블에서 제외
+    remap = np.full(len(teams), -1, dtype=np.int64)
+    remap[active] = np.arange(len(active))
+    teams = [teams[i] for i in active]
+    home_idx, away_idx = remap[home_idx], remap[away_idx]
+
+    init = previous.theta_for(teams) if previous is not None else None
+    t0 = time.perf_counter()
+    with span("goal_model_fit", warm=init is not None) as s:
+        theta, info = fit_dixon_coles(home_idx, away_idx, hg, ag, len(teams), weights, init, prior_sd)
+        s.add(rows=len(hg))
+    n_teams = len(teams)
+    info.update({'matches': int(len(hg)), 'teams': n_teams, 'seconds': round(time.perf_counter() - t0, 3),
+                 'warm_start': init is not None})
+    model = DixonColesModel(teams, theta[:n_teams], theta[n_teams:2 * n_teams], theta[-2], theta[-1], xi, asof, info)
+    logging.info(f"🥅 [V11.3] Dixon-Coles 적합: {n_teams}팀 × {len(hg):,}경기 "
+                 f"{'웜' if init is not None else '콜드'} 스타트 {info['iterations']}회 반복 {info['seconds']}s "
+                 f"(home {model.home:.3f}, rho {model.rho:.3f})")
+    return model
+
+
+def refit_goal_model(path=GOAL_MODEL_PATH, warm=True, xi=DC_XI):
+    """매치 캐시로 재적합 → 저장. warm=True 면 기존 테이블에서 출발"""
+    from soccer_real_data_engine import iter_match_chunks
+    previous = load_goal_model(path) if warm else None
+    model = fit_goal_model(iter_match_chunks(), previous, xi)
+    if model is not None:
+        model.save(path)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=GOAL_MODEL_PATH)
+    parser.add_argument("--xi", type=float, default=DC_XI, help="일 단위 시간 감쇠")
+    parser.add_argument("--cold", action="store_true", help="기존 테이블 무시 (콜드 스타트)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    model = refit_goal_model(args.path, warm=not args.cold, xi=args.xi)
+    if model is None:
+        raise SystemExit("❌ 매치 데이터가 없습니다")
+    for row in model.table()[:args.top]:
+        print(f"{row['team']:<28} att {row['attack']:+.3f}  def {row['defence']:+.3f}")
+    print(json.dumps(model.info))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+🎯 [V11.2] Inference Engine — 앙상블 예측 로직 (Streamlit 비의존)
+- app.py(UI)와 predict_cli.py(배치/크론)가 같은 예측 경로를 공유
+- predict_batch: N경기를 한 번에 — XGBoost/LR/IsolationForest 호출 1회, 푸아송 격자는 배열 연산
+- 🥅 [V11.3] 푸아송 레그: Dixon-Coles 파라미터 테이블(goal_model)이 있으면 적합된 공격/수비 강도 사용
+- classify_pick: 확률 → 최종 픽(승/무/패) + 메타 해설 (V8.6~V10.2 규칙 그대로)
+"""
+import numpy as np
+
+from perf_spans import timed  # ⏱️ [V11.3] 단계별 계측
+from team_names import PUBLIC_FAVORITES, HIGH_MOTIVATION_TEAMS, HEAVY_SCHEDULE_TEAMS, TEAM_TIERS
+
+POISSON_MAX_GOALS = 6
+ENSEMBLE_WEIGHTS = (0.50, 0.35, 0.15)  # XGBoost, Poisson, LR
+FEATURE_COLUMNS = [
+    'h_xG', 'h_xGA', 'h_PPDA', 'a_xG', 'a_xGA', 'a_PPDA', 'h_adv', 'fatigue_diff',
+    'sq_ratio', 'inj_diff', 'odd_flow', 'luck_factor', 'hurst_diff', 'eff_diff', 'skew_total', 'tier_diff',
+]
+
+
+def get_tier_diff(elo_sys, home, away):
+    """[V10] ELO 기반 체급차 (ELO 없으면 TEAM_TIERS 폴백)"""
+    if elo_sys:
+        return elo_sys.get_tier_diff(home, away)
+    return TEAM_TIERS.get(home, 0.65) - TEAM_TIERS.get(away, 0.65)
+
+
+def build_feature_row(home, away, h_stat, a_stat, fusion_data, tier_diff):
+    """인퍼런스/오답노트 공용 16개 피처 (V9.5 호환 순서)"""
+    h_adv = 1 if home in PUBLIC_FAVORITES else 0
+    fatigue_diff = 0
+    if home in HEAVY_SCHEDULE_TEAMS: fatigue_diff -= 1.0
+    if away in HEAVY_SCHEDULE_TEAMS: fatigue_diff += 1.0
+    return [
+        h_stat['xG'], h_stat['xGA'], h_stat['PPDA'],
+        a_stat['xG'], a_stat['xGA'], a_stat['PPDA'],
+        h_adv, fatigue_diff,
+        fusion_data['sq_ratio'], fusion_data['inj_diff'],
+        fusion_data['odd_flow'], fusion_data['luck_factor'],
+        fusion_data['hurst_diff'], fusion_data['eff_diff'], fusion_data['skew_total'],
+        tier_diff
+    ]
+
+
+@timed("inference", count=lambda out: len(out['h_prob']))
+def predict_batch(models, homes, aways, h_stats, a_stats, fusion_rows, elo_sys=None, goal_model=None):
+    """
+    [V9.7] XGBoost, LR, Poisson + Isolation Forest(Trap Detector) — N경기 배치 버전.
+    goal_model: goal_model.DixonColesModel (없거나 테이블에 없는 팀이면 휴리스틱 푸아송)
+    Returns dict of (N,) 배열: h_prob, d_prob, a_prob, deep_trap, tier_diff, X (N, 16)
+    """
+    xgb_clf, lr_clf, iso_forest = models
+    n = len(homes)
+    tier_diff = np.array([get_tier_diff(elo_sys, h, a) for h, a in zip(homes, aways)], dtype=np.float64)
+    X = np.array([build_feature_row(h, a, hs, as_, f, t)
+                  for h, a, hs, as_, f, t in zip(homes, aways, h_stats, a_stats, fusion_rows, tier_diff)],
+                 dtype=np.float64).reshape(n, len(FEATURE_COLUMNS))
+    h_hurst = np.array([f['h_hurst'] for f in fusion_rows], dtype=np.float64)
+    a_hurst = np.array([f['a_hurst'] for f in fusion_rows], dtype=np.float64)
+
+    # 1. XGBoost / 2. Logistic Regression — 모델 호출은 배치당 1회
+    xgb_probs = xgb_clf.predict_proba(X) * 100
+    lr_probs = lr_clf.predict_proba(X) * 100
+
+    # 3. [V9.0] Calibrated Poisson — 체급차/MSI 보정 xG로 0~5골 격자 (행 단위 누적 순서는 기존과 동일)
+    msi_factor = np.clip(h_hurst + 0.5, 0.8, 1.2)
+    tier_factor = 1.0 + (tier_diff * 0.5)
+    adj_h_xg = X[:, 0] * msi_factor * tier_factor
+    adj_a_xg = X[:, 3] * (2.0 - msi_factor) / tier_factor
+    from scipy.stats import poisson  # [V11.3] scipy.stats 는 첫 예측 시 import (콜드 스타트 ~1s 절감)
+    goals = np.arange(POISSON_MAX_GOALS)
+    pmf_h = poisson.pmf(goals[None, :], adj_h_xg[:, None])
+    pmf_a = poisson.pmf(goals[None, :], adj_a_xg[:, None])
+    p_home_win, p_draw, p_away_win = np.zeros(n), np.zeros(n), np.zeros(n)
+    for h in range(POISSON_MAX_GOALS):
+        for a in range(POISSON_MAX_GOALS):
+            prob = pmf_h[:, h] * pmf_a[:, a]
+            if h > a: p_home_win += prob
+            elif h == a: p_draw += prob
+            else: p_away_win += prob
+    p_total = p_home_win + p_draw + p_away_win + 1e-9
+    poisson_probs = np.stack([p_away_win / p_total, p_draw / p_total, p_home_win / p_total], axis=1) * 100
+    # 🥅 [V11.3] Dixon-Coles — 두 팀 모두 테이블에 있는 경기는 적합된 λ/μ + τ 보정 격자로 교체
+    if goal_model is not None:
+        dc_probs, known = goal_model.outcome_probs(homes, aways)
+        poisson_probs[known] = dc_probs[known][:, ::-1] * 100
+
+    # 🧬 [V10.2] 앙상블 — 항상 3모델 결합
+    w_xgb, w_poi, w_lr = ENSEMBLE_WEIGHTS
+    a_prob = (xgb_probs[:, 0] * w_xgb) + (poisson_probs[:, 0] * w_poi) + (lr_probs[:, 0] * w_lr)
+    d_prob = (xgb_probs[:, 1] * w_xgb) + (poisson_probs[:, 1] * w_poi) + (lr_probs[:, 1] * w_lr)
+    h_prob = (xgb_probs[:, 2] * w_xgb) + (poisson_probs[:, 2] * w_poi) + (lr_probs[:, 2] * w_lr)
+
+    # [V10.2] CHAOS Adjuster — 온건 버전
+    chaos = (h_hurst < 0.45) | (a_hurst < 0.45)
+    d_c, a_c = d_prob * 1.08, a_prob * 1.05
+    total = h_prob + d_c + a_c
+    h_prob = np.where(chaos, (h_prob / total) * 100, h_prob)
+    d_prob = np.where(chaos, (d_c / total) * 100, d_prob)
+    a_prob = np.where(chaos, (a_c / total) * 100, a_prob)
+
+    # [V10.2] ELO 차이 기반 미세 보정 (원정 100+ 우세: 최대 8%, 홈 200+ 우세: 최대 5%)
+    if elo_sys:
+        elo_gap = np.array([elo_sys.get_elo(h) - elo_sys.get_elo(a) for h, a in zip(homes, aways)], dtype=np.float64)
+        adj = np.where(elo_gap < -100, -np.minimum(8.0, np.abs(elo_gap) / 50),
+                       np.where(elo_gap > 200, np.minimum(5.0, elo_gap / 100), 0.0))
+        h_prob = h_prob + adj
+        a_prob = a_prob - adj
+
+    # [V10.2] Isolation Forest — Deep Trap (PUBLIC_FAVORITES 홈팀만, 1회 호출)
+    deep_trap = np.zeros(n, dtype=bool)
+    fav = np.array([h in PUBLIC_FAVORITES for h in homes], dtype=bool)
+    if iso_forest is not None and fav.any():
+        deep_trap[fav] = iso_forest.predict(X[fav]) == -1
+        trap_adj = np.where(deep_trap, h_prob * 0.08, 0.0)
+        h_prob = h_prob - trap_adj
+        d_prob = d_prob + trap_adj * 0.6
+        a_prob = a_prob + trap_adj * 0.4
+
+    # [V10.2 Final Normalization] 100% 합산 보증
+    total = h_prob + d_prob + a_prob + 1e-9
+    return {
+        'h_prob': (h_prob / total) * 100, 'd_prob': (d_prob / total) * 100, 'a_prob': (a_prob / total) * 100,
+        'deep_trap': deep_trap, 'tier_diff': tier_diff, 'X': X,
+    }
+
+
+def predict_match_ml(models, home, away, h_stat, a_stat, fusion_data, elo_sys=None, goal_model=None):
+    """단일 경기 예측 (predict_batch 1행) — 기존 반환 형식 유지"""
+    out = predict_batch(models, [home], [away], [h_stat], [a_stat], [fusion_data], elo_sys, goal_model)
+    return (float(out['h_prob'][0]), float(out['d_prob'][0]), float(out['a_prob'][0]),
+            False, False, False, bool(out['deep_trap'][0]), float(out['tier_diff'][0]))
+
+
+def determine_match_state(h_hurst, a_hurst, h_eff):
+    """나스닥 가디언 이식: 허스트와 효율성 기반 국면 진단"""
+    avg_hurst = (h_hurst + a_hurst) / 2
+    if avg_hurst < 0.42: return "🔴 CHAOS", "시스템 질서 붕괴 (예측 불허)"
+    elif avg_hurst < 0.48: return "🟡 JITTER", "평균 회귀 및 박빙 (진흙탕)"
+    elif h_eff > 0.6: return "🟢 TREND", "강력한 추세 유지 (정배 유력)"
+    else: return "⚪ ORDER", "안정적 흐름"
+
+
+def calculate_msi(h_prob, d_prob, a_prob, h_hurst):
+    """Match Stability Index (MSI) 계산 (1.0 ~ 10.0 스코어)"""
+    probs = np.array([h_prob, d_prob, a_prob]) / 100.0
+    entropy = -np.sum(probs * np.log2(probs + 1e-9))
+    norm_entropy = 1 - (entropy / 1.58)
+    msi = (norm_entropy * 0.7 + (h_hurst/0.7) * 0.3) * 10.0
+    return round(min(10.0, max(1.0, msi)), 1)
+
+
+def calculate_smart_draw_sensitivity(h_prob, d_prob, a_prob):
+    """
+    [V8.6 Smart Adaptive Sensitivity]
+    예측 확률의 엔트로피(불확실성)를 기반으로 무승부 감도를 동적으로 결정합니다.
+    - 확률이 분산되어 있을수록(박빙) 감도 상향
+    - 한쪽에 쏠려있을수록 감도 하향
+    """
+    probs = np.array([h_prob, d_prob, a_prob]) / 100.0
+    entropy = -np.sum(probs * np.log2(probs + 1e-9))
+
+    # 엔트로피는 이론상 0 ~ 1.58 (log2(3)) 사이
+    # 박빙(엔트로피 높음)일수록 15~20%까지 확장, 확실할수록 5%까지 축소
+    base_buffer = (entropy / 1.58) * 20.0
+    return round(max(5.0, base_buffer), 1), entropy
+
+
+def classify_pick(h_prob, d_prob, a_prob, fusion_data, away_label, deep_trap_triggered=False,
+                  super_spear_triggered=False, public_fade_triggered=False, data_driven_upset=False):
+    """
+    확률 → (h_prob, d_prob, a_prob, 픽, 메타 해설).
+    유령 정체 판정 시 무승부 확률이 강등되므로 보정된 확률을 함께 반환합니다.
+    """
+    # 가장 높은 확률을 예측값으로 (Argmax)
+    gap = abs(h_prob - a_prob)
+
+    # [V8.6 Smart Draw Buffer] 무승부 감도 최적화 (22% -> 25% 상향하여 너무 잦은 무승부 방지)
+    draw_buffer, match_entropy = calculate_smart_draw_sensitivity(h_prob, d_prob, a_prob)
+
+    # 🌫️ 유령 정체 (Phantom Stagnation) 검사
+    in_phantom_stagnation = False
+
+    if gap <= draw_buffer and match_entropy <= 1.45:
+        in_phantom_stagnation = True
+        d_prob = min(h_prob, a_prob) - 1.0 # 무승부 기각용 강제 순위 강등
+        # 다시 100%로 맞춤
+        total = h_prob + d_prob + a_prob + 1e-9
+        h_prob, d_prob, a_prob = (h_prob/total)*100, (d_prob/total)*100, (a_prob/total)*100
+        gap = abs(h_prob - a_prob)
+
+    if gap <= draw_buffer and d_prob >= 25.0: # 🎯 무승부 확률 커트라인을 25%로 상향
+        pred = "무"
+        # [V8.8 & V8.9 Hybrid Output]
+        if deep_trap_triggered:
+            grade = f"⚡ [⚠️ DEEP TRAP] 정배 함정 감지 ➔ 무승부 기각 (분산 권장)"
+        elif public_fade_triggered:
+            grade = f"☠️ [대중의 독사과 회피] 불안한 정배당 붕괴 ➔ 무승부 기각"
+        elif fusion_data.get('h_shield_trigger', False):
+            grade = f"🛡️ [신의 방패] 정배 함정 완벽 방어 ({draw_buffer}% 감도)"
+        elif match_entropy > 1.45:
+            grade = f"🔒 [절대 무승부] 폭발적 엔트로피(E:{match_entropy:.2f}) 완전성 포획"
+        else:
+            grade = f"⚠️ [스마트 박빙] 엔트로피 감도({draw_buffer}%) 자동 적용"
+    elif h_prob > a_prob and h_prob > d_prob:
+        pred = "승"
+        if deep_trap_triggered: grade = "⚡ [⚠️ DEEP TRAP] 데이터상 강한 함정 신호 (정배 위험)"
+        elif h_prob >= 60.0: grade = "🔥 [강력추천] ML 피처 압도"
+        elif data_driven_upset: grade = "⚡ [이변주의] 데이터상 불안한 정배 (역배 타격 실패)"
+        elif in_phantom_stagnation: grade = f"🌫️ [유령정체 돌파] 교착 튕겨냄 (홈승 스나이핑)"
+        elif gap <= 10.0: grade = "🤔 [박빙 늪 탈출] 트리 구조상 홈팀 꾸역승 판정"
+        else: grade = "🟢 [일반 정배 방어]"
+    elif a_prob > h_prob and a_prob > d_prob:
+        pred = "패"
+        # [V9.2] 🔪 데이터 vs 군중심리 역행 (Data-Driven Upset)
+        if data_driven_upset:
+            grade = "🔪 [거품 정배 박살] 80% 대중픽 붕괴 ➔ 데이터 기반 초고배당 학살"
+        # [V9.0] 💥 슈퍼 스피어 (진짜 신의 창 - 3중 모델 만장일치 돌파)
+        elif super_spear_triggered:
+            grade = "💥 [Limit Break] 앙상블 만장일치 슈퍼 역배 강제 관통"
+        elif deep_trap_triggered:
+            grade = "🔍 [⚠️ DEEP TRAP] 정배 함정 포착 ➔ 초고배당 역배 스나이핑 성공"
+        elif public_fade_triggered:
+            grade = f"☠️ [대중의 독사과 회피] 정배당 함정 붕괴 ➔ 초고배당 원정 스나이핑"
+        # [V8.8] 만약 원정팀에 방패가 발동되어서 원정승이 떴다면
+        elif fusion_data.get('a_spear_trigger', False):
+            grade = "🔱 [신의 창] 카오스 역배 관통 스나이핑"
+        elif in_phantom_stagnation: grade = f"🌫️ [유령정체 돌파] 교착 튕겨냄 (원정 스나이핑)"
+        elif a_prob >= 48.0: grade = "💎 [역배당 스나이퍼] ML 발견 고가치 타점"
+        elif away_label in HIGH_MOTIVATION_TEAMS: grade = "🧨 [자이언트 킬러] 원정팀 동기부여 폭발"
+        elif gap <= 10.0: grade = "🤔 [박빙 늪 탈출] 원정팀 카운터펀치 압도율 높음"
+        else: grade = "🟢 [원정 방어 무난]"
+    else:
+        pred = "무"
+        grade = "⚠️ [AI 판단 늪지대] 피처상 양 팀 모두 득점동력 파괴됨"
+    return h_prob, d_prob, a_prob, pred, grade
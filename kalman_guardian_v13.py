@@ -1,5 +1,8 @@
-import os
 import json
+import hashlib
+
+from perf_spans import timed  # ⏱️ [V11.3] 단계별 계측
+from state_store import state_file, merge_dict  # 🔒 [V11.3] 상태 파일 단일 작성자
 
 KALMAN_STORE = "v13_kalman_states.json"
 
@@ -9,26 +12,26 @@ class KalmanGuardianEngine:
         self.q = q
         self.r = r
         self.states = {}
+        self._dirty = set()   # 🔒 [V11.3] 이 인스턴스가 갱신한 팀 — 저장은 이 팀들만 (다른 세션의 같은 파일 갱신 보존)
         # 로컬 파일 로드 시도
-        try:
-            if os.path.exists(KALMAN_STORE):
-                with open(KALMAN_STORE, 'r') as f:
-                    self.states = json.load(f)
-        except:
-            self.states = {}
+        states = state_file(KALMAN_STORE, indent=4).load()
+        if isinstance(states, dict):
+            self.states = states
 
     def _save_states(self):
-        """저장 시도 — 실패해도 무시 (Streamlit Cloud 읽기전용)"""
-        try:
-            with open(KALMAN_STORE, 'w') as f:
-                json.dump(self.states, f, indent=4)
-        except:
-            pass
+        """
+        저장 시도 — 실패해도 무시 (Streamlit Cloud 읽기전용)
+        🔒 [V11.3] 작성자 스레드가 묶어서 원자적으로 기록 — 갱신한 팀만 병합해 다른 세션의 팀 상태 보존
+        """
+        state_file(KALMAN_STORE, indent=4).save({t: self.states[t] for t in self._dirty}, merge=merge_dict,
+                                                owner=self)
 
+    @timed("kalman")
     def get_stabilized_xg(self, team_name, raw_xg):
         """Kalman Filter로 xG 안정화"""
         if team_name not in self.states:
             self.states[team_name] = [raw_xg, 1.0]
+            self._dirty.add(team_name)
             self._save_states()
             return raw_xg
 
@@ -38,8 +41,13 @@ class KalmanGuardianEngine:
         new_estimate = prev_estimate + k * (raw_xg - prev_estimate)
         new_p = (1 - k) * p_prior
         self.states[team_name] = [new_estimate, new_p]
+        self._dirty.add(team_name)
         self._save_states()
         return round(new_estimate, 3)
 
+    def state_version(self):
+        """🧾 [V11.3] 현재 칼만 상태의 내용 해시 (슬레이트 예측 캐시 키용)"""
+        return hashlib.sha1(json.dumps(self.states, sort_keys=True).encode()).hexdigest()[:16]
+
     def get_all_estimates(self):
         return {k: v[0] for k, v in self.states.items()}
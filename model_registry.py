@@ -0,0 +1,267 @@
+"""
+🔁 [V10.5] Model Registry — 백그라운드 학습 + 원자적 핫스왑
+- 학습(데이터 수집 → ELO 리플레이 → 3모델 학습)은 백그라운드 스레드에서 실행
+- 앱은 항상 '마지막으로 검증 통과한' 모델 아티팩트로 예측 (UI 블로킹 없음)
+- 새 앙상블은 Walk-Forward 검증 통과 시에만 디스크 기록 후 참조 교체(원자적)
+- 각 아티팩트는 version / trained_at 을 가지며 예측 결과에 함께 표시됨
+"""
+import os
+import json
+import pickle
+import logging
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from soccer_real_data_engine import initialize_v10_engine
+from reflection_store import ReflectionStore, load_reflection_store
+from model_trainer import train_ensemble, load_training_matrix
+from bootstrap_ensemble import train_bootstrap_ensemble, DEFAULT_MEMBERS
+from goal_model import refit_goal_model
+
+MODEL_DIR = "model_artifacts"
+LATEST_POINTER = "latest.json"
+KEEP_ARTIFACTS = 3
+RETRAIN_INTERVAL_SEC = int(os.getenv("SG_RETRAIN_INTERVAL_SEC", str(6 * 3600)))  # 기본 6시간 주기
+MAX_VAL_BRIER = 0.24        # 3-way Brier(/3) 상한 — 균등 예측(0.222)보다 크게 나쁘면 탈락
+BRIER_TOLERANCE = 0.01      # 현재 모델 대비 허용 악화폭
+
+
+class ModelArtifact:
+    """학습된 앙상블 + 당시 ELO 시스템 + 검증 지표 묶음"""
+
+    def __init__(self, models, elo_system, metrics, version, trained_at):
+        self.models = models
+        self.elo_system = elo_system
+        self.metrics = metrics
+        self.version = version
+        self.trained_at = trained_at
+        self.bootstrap = None      # 📐 [V10.6] BootstrapEnsemble (옵션)
+        self.goal_model = None     # 🥅 [V11.3] DixonColesModel (푸아송 레그 파라미터 테이블)
+        self.reflection_db = None  # 디스크 저장 대상 아님 (로드 시 다시 열기)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['reflection_db'] = None
+        return state
+
+    @property
+    def label(self):
+        return f"{self.version} ({self.trained_at})"
+
+
+def run_training_pipeline():
+    """
+    [V10] 전체 학습 파이프라인 (Streamlit 비의존).
+    Returns: ModelArtifact (아직 검증/저장 전)
+    """
+    logging.info("🚀 [V10] 실제 데이터 기반 학습 파이프라인 가동...")
+
+    # 1. 실제 경기 데이터 수집 + ELO 구축 (🔁 [V11.3] 저장된 레이팅이 아니라 초기값에서 전체 재생 — 재학습마다 같은 피처)
+    X_real, y_real, elo_sys, _ = initialize_v10_engine()
+
+    if X_real is None or len(X_real) == 0:
+        logging.warning("⚠️ 실제 데이터 수집 실패 → 최소 백업 모드")
+        # 최소한의 백업 데이터 생성 (V9.5 폴백)
+        rng = np.random.RandomState(42)
+        n = 500
+        X_real = rng.randn(n, 16)
+        y_real = rng.choice([0, 1, 2], n, p=[0.28, 0.26, 0.46])
+
+    # 2. R2 오답노트 병합 (sample_weight 방식, 복제 아님)
+    reflection_db = load_reflection_store()
+
+    # 3. 저메모리 학습
+    models, metrics = train_ensemble(X_real, y_real, reflection_db)
+
+    # 4. 📐 [V10.6] (옵션) 부트스트랩 앙상블 — 방금 기록한 학습 행렬을 그대로 재사용
+    bootstrap = None
+    if DEFAULT_MEMBERS > 0:
+        try:
+            matrix = load_training_matrix()
+            if matrix is not None:
+                bootstrap = train_bootstrap_ensemble(*matrix, members=DEFAULT_MEMBERS)
+                metrics['bootstrap'] = bootstrap.cost_report() if bootstrap else {}
+        except Exception as e:
+            bootstrap = None
+            logging.warning(f"⚠️ 부트스트랩 앙상블 학습 실패 (단일 앙상블로 서빙): {e}")
+
+    # 5. 🥅 [V11.3] Dixon-Coles 골 모델 — 직전 파라미터 테이블에서 웜 스타트 (실패 시 휴리스틱 푸아송 유지)
+    goal_model = None
+    try:
+        goal_model = refit_goal_model()
+        if goal_model is not None:
+            metrics['goal_model'] = goal_model.info
+    except Exception as e:
+        logging.warning(f"⚠️ Dixon-Coles 적합 실패 (휴리스틱 푸아송 사용): {e}")
+
+    now = datetime.now()
+    artifact = ModelArtifact(models, elo_sys, metrics,
+                             version=now.strftime("m%Y%m%d-%H%M%S"),
+                             trained_at=now.strftime("%Y-%m-%d %H:%M:%S"))
+    artifact.reflection_db = reflection_db
+    artifact.bootstrap = bootstrap
+    artifact.goal_model = goal_model
+    return artifact
+
+
+class ModelRegistry:
+    """
+    현재 서빙 중인 아티팩트를 보관하고, 백그라운드 재학습 후 검증 통과 시 교체합니다.
+    current() 는 락 없이 참조 하나만 읽으므로 예측 경로에 지연이 없습니다.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR):
+        self.model_dir = model_dir
+        self._current = None
+        self._swap_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.training = False
+        self.last_error = None
+        self.last_attempt = None
+        os.makedirs(self.model_dir, exist_ok=True)
+        self.load_latest()
+
+    # ------------------------------------------------------------------
+    # 아티팩트 디스크 입출력
+    # ------------------------------------------------------------------
+    def _artifact_path(self, version):
+        return os.path.join(self.model_dir, f"ensemble_{version}.pkl")
+
+    def load_latest(self):
+        """latest.json 이 가리키는 마지막 검증 통과 아티팩트 로드"""
+        pointer = os.path.join(self.model_dir, LATEST_POINTER)
+        if not os.path.exists(pointer):
+            return None
+        try:
+            with open(pointer, 'r') as f:
+                version = json.load(f)['version']
+            with open(self._artifact_path(version), 'rb') as f:
+                artifact = pickle.load(f)
+            artifact.reflection_db = ReflectionStore()
+            artifact.__dict__.setdefault('bootstrap', None)
+            artifact.__dict__.setdefault('goal_model', None)
+            self._swap(artifact)
+            logging.info(f"📦 [V10.5] 모델 아티팩트 로드: {artifact.label}")
+            return artifact
+        except Exception as e:
+            logging.warning(f"⚠️ 모델 아티팩트 로드 실패: {e}")
+            return None
+
+    def _persist(self, artifact):
+        """아티팩트 기록 (임시 파일 → rename) 후 latest 포인터 교체"""
+        path = self._artifact_path(artifact.version)
+        with open(path + ".tmp", 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+        pointer = os.path.join(self.model_dir, LATEST_POINTER)
+        with open(pointer + ".tmp", 'w') as f:
+            json.dump({'version': artifact.version, 'trained_at': artifact.trained_at,
+                       'metrics': artifact.metrics}, f, indent=2)
+        os.replace(pointer + ".tmp", pointer)
+
+        # 오래된 아티팩트 정리
+        files = sorted(n for n in os.listdir(self.model_dir) if n.startswith("ensemble_") and n.endswith(".pkl"))
+        for name in files[:-KEEP_ARTIFACTS]:
+            try:
+                os.remove(os.path.join(self.model_dir, name))
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # 검증 + 핫스왑
+    # ------------------------------------------------------------------
+    def validate(self, artifact):
+        """검증 통과 여부와 사유 반환"""
+        brier = artifact.metrics.get('val_brier')
+        if brier is None:
+            return False, "검증 구간 없음"
+        if brier > MAX_VAL_BRIER:
+            return False, f"Brier {brier} > 상한 {MAX_VAL_BRIER}"
+        current = self._current
+        if current is not None:
+            cur_brier = current.metrics.get('val_brier')
+            if cur_brier is not None and brier > cur_brier + BRIER_TOLERANCE:
+                return False, f"Brier {brier} — 현재 모델({cur_brier}) 대비 악화"
+        return True, "OK"
+
+    def _swap(self, artifact):
+        with self._swap_lock:
+            self._current = artifact
+        self._ready.set()
+
+    def current(self):
+        """현재 서빙 중인 아티팩트 (없으면 None)"""
+        return self._current
+
+    def wait_until_ready(self, timeout=None):
+        """첫 학습 시도가 끝날 때까지 대기 (최초 1회 실행 시에만 발생). 실패 시 None"""
+        self._ready.wait(timeout)
+        return self._current
+
+    def train_once(self):
+        """학습 1회 → 검증 → 저장 → 교체. 교체되면 True"""
+        self.training = True
+        self.last_attempt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            artifact = run_training_pipeline()
+            ok, reason = self.validate(artifact)
+            # 서빙 중인 모델이 하나도 없으면 검증 실패라도 우선 사용 (기존 동작과 동일하게 항상 예측 가능)
+            if not ok and self._current is not None:
+                logging.warning(f"⚠️ [V10.5] 신규 모델 {artifact.version} 검증 탈락: {reason} → 기존 모델 유지")
+                self.last_error = reason
+                return False
+            self._persist(artifact)
+            self._swap(artifact)
+            self.last_error = None if ok else reason
+            logging.info(f"✅ [V10.5] 모델 핫스왑 완료: {artifact.label}")
+            return True
+        except Exception as e:
+            logging.error(f"❌ [V10.5] 백그라운드 학습 실패: {e}")
+            self.last_error = str(e)
+            return False
+        finally:
+            self.training = False
+            # 첫 시도가 실패해도 대기 중인 호출자가 영원히 멈추지 않도록 깨움 (current()는 None)
+            self._ready.set()
+
+    # ------------------------------------------------------------------
+    # 백그라운드 워커
+    # ------------------------------------------------------------------
+    def start(self, interval_sec=RETRAIN_INTERVAL_SEC):
+        """프로세스 시작 시 1회 + interval_sec 주기로 재학습하는 데몬 스레드 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._thread = threading.Thread(target=self._worker, args=(interval_sec,),
+                                        name="model-trainer", daemon=True)
+        self._thread.start()
+        return self
+
+    def trigger(self):
+        """다음 주기를 기다리지 않고 즉시 재학습"""
+        self._wakeup.set()
+
+    def _worker(self, interval_sec):
+        while True:
+            self.train_once()
+            self._wakeup.wait(interval_sec)
+            self._wakeup.clear()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(start_worker=True):
+    """프로세스당 하나의 레지스트리 (st.cache_resource.clear() 와 무관하게 유지)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        if start_worker:
+            _registry.start()
+        return _registry
@@ -0,0 +1,215 @@
+"""
+🤖 [V10.4] Low-Memory Model Trainer
+- 학습 행렬을 float32 .npy(memmap)로 한 번만 기록 (실데이터 학습분 + 오답노트)
+- XGBoost는 DataIter → QuantileDMatrix로 청크 스트리밍 (밀집 float64 복사본 없음)
+- IsolationForest / LogisticRegression 도 memmap을 직접 사용 (불리언 마스크 슬라이스 제거)
+- Streamlit 비의존: app.py, 백그라운드 학습, CLI 어디서든 호출 가능
+- [V11.3] xgboost / sklearn 은 학습 시점에 import (앱 콜드 스타트에서 제외)
+"""
+import os
+import logging
+import numpy as np
+
+from perf_spans import timed  # ⏱️ [V11.3] 단계별 계측
+
+TRAIN_MATRIX_PATH = "train_matrix_f32.npy"
+N_FEATURES = 16
+CHUNK_ROWS = 65536           # DataIter 한 번에 넘기는 행 수
+ISO_MAX_ROWS = 4096          # IsolationForest 학습용 홈승 샘플 상한 (트리당 256개만 사용)
+REFLECTION_WEIGHT = 3.0      # 오답노트 가중치 (50배 복제 대신)
+
+XGB_PARAMS = {
+    'objective': 'multi:softprob',
+    'num_class': 3,
+    'eval_metric': 'mlogloss',
+    'max_depth': 5,
+    'learning_rate': 0.08,
+    'booster': 'gbtree',
+    'tree_method': 'hist',
+    'subsample': 0.8,         # 🎯 [V10] 과적합 방지
+    'colsample_bytree': 0.8,  # 🎯 [V10] 피처 서브샘플링
+    'reg_alpha': 0.1,         # 🎯 [V10] L1 정규화
+    'reg_lambda': 1.0,        # 🎯 [V10] L2 정규화
+    'seed': 42,
+}
+XGB_ROUNDS = 150
+
+
+class BoosterClassifier:
+    """xgb.Booster를 sklearn 스타일 predict_proba 인터페이스로 감싼 래퍼"""
+
+    classes_ = np.array([0, 1, 2])
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        probs = self.booster.inplace_predict(X)
+        return np.asarray(probs).reshape(len(X), 3)
+
+
+_MatrixChunkIter = None
+
+
+def matrix_chunk_iter(X, y, weights, chunk_rows=CHUNK_ROWS):
+    """memmap 학습 행렬을 CHUNK_ROWS 단위 뷰로 XGBoost에 흘려보내는 반복자 (xgb.DataIter 서브클래스는 첫 호출 시 정의)"""
+    global _MatrixChunkIter
+    if _MatrixChunkIter is None:
+        import xgboost as xgb
+
+        class MatrixChunkIter(xgb.DataIter):
+            def __init__(self, X, y, weights, chunk_rows):
+                self.X, self.y, self.weights = X, y, weights
+                self.chunk_rows = chunk_rows
+                self._pos = 0
+                super().__init__(release_data=True)
+
+            def next(self, input_data):
+                if self._pos >= len(self.X):
+                    return False
+                end = min(self._pos + self.chunk_rows, len(self.X))
+                input_data(data=self.X[self._pos:end], label=self.y[self._pos:end],
+                           weight=self.weights[self._pos:end])
+                self._pos = end
+                return True
+
+            def reset(self):
+                self._pos = 0
+
+        _MatrixChunkIter = MatrixChunkIter
+    return _MatrixChunkIter(X, y, weights, chunk_rows)
+
+
+def write_training_matrix(X_real, train_idx, reflection_db=None, path=TRAIN_MATRIX_PATH):
+    """
+    학습 행렬을 float32 .npy 파일(memmap)로 기록합니다.
+    레이아웃: [실데이터 학습 행 | 오답노트 행]
+    Returns: (X_mm, weights) — X_mm은 읽기 전용 memmap
+    """
+    n_real = len(train_idx)
+    n_refl = len(reflection_db) if reflection_db is not None else 0
+    n_total = n_real + n_refl
+
+    # [V11.3] .part 에 쓴 뒤 os.replace — 이전 학습 행렬을 memmap 으로 읽는 쪽(부트스트랩 등)은 옛 파일을 계속 읽음
+    part_path = f"{path}.part"
+    X_mm = np.lib.format.open_memmap(part_path, mode='w+', dtype=np.float32, shape=(n_total, N_FEATURES))
+    for start in range(0, n_real, CHUNK_ROWS):
+        rows = train_idx[start:start + CHUNK_ROWS]
+        X_mm[start:start + len(rows)] = X_real[rows]
+    if n_refl:
+        X_mm[n_real:] = reflection_db.features
+    X_mm.flush()
+    del X_mm
+    os.replace(part_path, path)
+
+    weights = np.ones(n_total, dtype=np.float32)
+    weights[n_real:] = REFLECTION_WEIGHT
+    return np.load(path, mmap_mode='r'), weights
+
+
+def _side_path(path, name):
+    """학습 행렬 옆에 저장되는 라벨/가중치 파일 경로"""
+    return path[:-len(".npy")] + f".{name}.npy" if path.endswith(".npy") else f"{path}.{name}.npy"
+
+
+def _save_side(path, name, values):
+    """라벨/가중치 파일도 .part → os.replace 로 교체 (np.save 는 파일 객체로 — 확장자 자동 추가 방지)"""
+    side = _side_path(path, name)
+    part_path = f"{side}.part"
+    with open(part_path, 'wb') as f:
+        np.save(f, values)
+    os.replace(part_path, side)
+
+
+def load_training_matrix(path=TRAIN_MATRIX_PATH):
+    """
+    마지막 학습에 쓰인 (X, y, weights) 를 memmap으로 다시 엽니다 (부트스트랩 앙상블 등 재사용).
+    파일이 없으면 None
+    """
+    try:
+        return (np.load(path, mmap_mode='r'),
+                np.load(_side_path(path, "labels"), mmap_mode='r'),
+                np.load(_side_path(path, "weights"), mmap_mode='r'))
+    except (OSError, ValueError):
+        return None
+
+
+def _walk_forward_metrics(clf, X_val, y_val):
+    """검증 구간 정답률 + 3-way Brier Score"""
+    val_probs = clf.predict_proba(X_val)
+    val_acc = np.mean(np.argmax(val_probs, axis=1) == y_val)
+    actual = np.eye(3)[y_val.astype(int)]
+    avg_brier = np.mean(np.sum((val_probs - actual) ** 2, axis=1) / 3.0)
+    return val_acc, avg_brier
+
+
+@timed("training", count=lambda out: out[1]['n_train'], model="ensemble")
+def train_ensemble(X_real, y_real, reflection_db=None, matrix_path=TRAIN_MATRIX_PATH):
+    """
+    [V10] Walk-Forward 분할 + 오답노트 가중 병합 + 3모델(XGB, LR, IsolationForest) 학습.
+    Returns: ((xgb_clf, lr_clf, iso_forest), metrics)
+    """
+    import xgboost as xgb
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.ensemble import IsolationForest
+
+    # 1. NaN 제거 + 시간순 Train/Test 분할 (마지막 20%는 검증용) — 행 인덱스만 계산
+    valid_idx = np.flatnonzero(~np.isnan(X_real).any(axis=1))
+    logging.info(f"📊 [V10] NaN 제거 후: {len(valid_idx)}경기")
+
+    split_idx = int(len(valid_idx) * 0.8)
+    train_idx, val_idx = valid_idx[:split_idx], valid_idx[split_idx:]
+    logging.info(f"📊 [V10] 학습: {len(train_idx)}경기, 검증: {len(val_idx)}경기")
+
+    # 2. 학습 행렬을 float32 memmap으로 한 번만 기록
+    X_train, weights = write_training_matrix(X_real, train_idx, reflection_db, matrix_path)
+    y_train = np.empty(len(X_train), dtype=np.int8)
+    y_train[:len(train_idx)] = y_real[train_idx]
+    if reflection_db is not None and len(reflection_db) > 0:
+        y_train[len(train_idx):] = reflection_db.labels
+        logging.info(f"🧠 [V10] 오답노트 {len(reflection_db)}건 × {REFLECTION_WEIGHT:g}배 가중치로 병합 (기존: 50배 복제)")
+    _save_side(matrix_path, "labels", y_train)
+    _save_side(matrix_path, "weights", weights)
+
+    # 3. XGBoost — QuantileDMatrix로 청크 스트리밍 학습
+    dtrain = xgb.QuantileDMatrix(matrix_chunk_iter(X_train, y_train, weights))
+    booster = xgb.train(XGB_PARAMS, dtrain, num_boost_round=XGB_ROUNDS)
+    del dtrain
+    xgb_clf = BoosterClassifier(booster)
+
+    # 4. Walk-Forward 검증 (Brier Score 측정)
+    metrics = {'n_train': int(len(X_train)), 'n_val': int(len(val_idx))}
+    if len(val_idx) > 0:
+        val_acc, avg_brier = _walk_forward_metrics(xgb_clf, X_real[val_idx], y_real[val_idx])
+        logging.info(f"📊 [V10 Walk-Forward 검증] 정답률: {val_acc*100:.1f}%, Brier Score: {avg_brier:.4f}")
+        metrics['val_accuracy'] = round(float(val_acc) * 100, 1)
+        metrics['val_brier'] = round(float(avg_brier), 4)
+
+    # 5. Isolation Forest (함정 감지 유지) — 홈승 행 중 최대 ISO_MAX_ROWS개만 모아서 학습
+    win_idx = np.flatnonzero(y_train == 2)
+    if len(win_idx) > 10:
+        if len(win_idx) > ISO_MAX_ROWS:
+            rng = np.random.default_rng(42)
+            win_idx = np.sort(rng.choice(win_idx, ISO_MAX_ROWS, replace=False))
+        iso_forest = IsolationForest(contamination=0.05, random_state=42)  # 🔧 [V10.2] 0.15→0.05 (과민 방지)
+        iso_forest.fit(X_train[win_idx])
+    else:
+        iso_forest = None
+
+    # 6. Logistic Regression 앙상블 (float32 memmap 그대로 입력)
+    lr_clf = LogisticRegression(max_iter=1000)
+    lr_clf.fit(X_train, y_train)
+
+    logging.info(f"✅ [V10] 학습 완료! 실제 {len(X_train)}경기 기반 모델")
+    return (xgb_clf, lr_clf, iso_forest), metrics
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB) — 메모리 벤치마크용"""
+    import resource
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
@@ -0,0 +1,179 @@
+"""
+💱 [V11.3] Odds De-vigging — 북메이커 전체 배당 → 마진 제거 합의 확률 + 마감 배당(closing line) 피처
+- 마진 제거: proportional (1/odds 를 합으로 나눔) / power (Σ(1/odds)^k = 1 이 되는 k — 롱샷 편향 보정)
+- power 의 k 는 (경기 × 북메이커) 전체에 대해 배열 뉴턴 반복으로 동시에 풂 (파이썬 루프는 반복 횟수만큼)
+- 매치 캐시를 청크 단위로 한 번 훑어 경기당 ODDS_FEATURES(float32)만 .npy(memmap)로 기록 — 원시 배당 61열은 청크 크기만큼만 메모리에
+- 합의 확률: 개별 북메이커(B365/BW/IW/PS/WH/VC) 평균, 하나도 없으면 시장 평균(Avg) 사용 / 시장 최고(Max)는 마진 < 0 이라 제외
+
+사용법:
+    python odds_devig.py                          # 매치 캐시 → odds_features_f32.npy (power)
+    python odds_devig.py --method proportional --out odds_prop.npy
+"""
+import os
+import json
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+ODDS_FEATURE_PATH = "odds_features_f32.npy"
+DEVIG_METHODS = ('power', 'proportional')
+CONSENSUS_BOOKS = ('b365', 'bw', 'iw', 'ps', 'wh', 'vc')
+FALLBACK_BOOK = 'avg'
+SHARP_BOOK = 'ps'                 # Pinnacle — 마감 배당이 가장 효율적인 기준선
+POWER_ITERS = 20
+POWER_TOL = 1e-10
+
+ODDS_FEATURES = [
+    'cons_h', 'cons_d', 'cons_a',        # 개시 배당 합의 확률
+    'close_h', 'close_d', 'close_a',     # 마감 배당 합의 확률
+    'sharp_h', 'sharp_d', 'sharp_a',     # Pinnacle 마감 (없으면 개시)
+    'move_h', 'move_a',                  # 라인 무브 = 마감 − 개시 (홈/원정)
+    'margin', 'n_books',                 # 개시 평균 오버라운드, 합의에 쓴 북메이커 수
+    'over25', 'over25_close',            # 2.5골 오버 합의 확률 (개시 / 마감)
+]
+
+
+def devig_proportional(odds):
+    """odds (..., K) → 마진 제거 확률 (..., K) — 결측(NaN)이 하나라도 있으면 해당 마켓 전체 NaN"""
+    inv = 1.0 / np.asarray(odds, dtype=np.float64)
+    return inv / inv.sum(axis=-1, keepdims=True)
+
+
+def devig_power(odds, iters=POWER_ITERS, tol=POWER_TOL):
+    """
+    odds (..., K) → p_i = (1/o_i)^k, Σ p_i = 1 이 되는 k 를 마켓별로 풀어 반환 (..., K)
+    뉴턴: f(k) = Σ q^k − 1, f'(k) = Σ q^k ln q — k=1(마진 0)에서 출발, 오버라운드 > 0 이면 k > 1
+    """
+    q = 1.0 / np.asarray(odds, dtype=np.float64)
+    ok = np.isfinite(q).all(axis=-1) & (q < 1.0).all(axis=-1) & (q > 0.0).all(axis=-1)
+    log_q = np.log(q[ok])                      # (M, K) — 결측 마켓은 반복에서 제외
+    k = np.ones(len(log_q))
+    for _ in range(iters):
+        qk = np.exp(k[:, None] * log_q)
+        step = (qk.sum(axis=1) - 1.0) / (qk * log_q).sum(axis=1)
+        k -= step
+        if not len(step) or np.abs(step).max() < tol:
+            break
+    out = np.full(q.shape, np.nan)
+    out[ok] = np.exp(k[:, None] * log_q)
+    return out
+
+
+DEVIG = {'power': devig_power, 'proportional': devig_proportional}
+
+
+def _market(chunk, books, suffix, sides):
+    """청크 → (N, 북메이커, K) float64 배당 배열 (컬럼이 없으면 NaN)"""
+    n = len(chunk)
+    out = np.full((n, len(books), len(sides)), np.nan)
+    for b, book in enumerate(books):
+        for s, side in enumerate(sides):
+            col = f"{book}{suffix}_{side}"
+            if col in chunk:
+                out[:, b, s] = chunk[col].to_numpy(dtype=np.float64)
+    return out
+
+
+def _consensus(probs, fallback):
+    """(N, B, K) 북메이커별 확률 → 평균 (N, K), 유효 북메이커 수 — 없으면 fallback (N, K)"""
+    valid = np.isfinite(probs).all(axis=-1)
+    count = valid.sum(axis=1)
+    total = np.where(valid[..., None], probs, 0.0).sum(axis=1)
+    mean = total / np.maximum(count, 1)[:, None]
+    return np.where((count > 0)[:, None], mean, fallback), count
+
+
+def odds_features(chunk, method='power'):
+    """
+    매치 청크(read_match_cache(odds=True)) → (N, len(ODDS_FEATURES)) float32
+    기본 스키마의 b365_h/d/a 는 0 이 결측이므로 NaN 으로 바꿔 사용
+    """
+    with np.errstate(all='ignore'):      # 결측 배당(NaN)은 결과에서 NaN 으로 남김
+        return _odds_features(chunk, DEVIG[method])
+
+
+def _odds_features(chunk, devig):
+    books = CONSENSUS_BOOKS
+    sides = ('h', 'd', 'a')
+    opening = _market(chunk, books, '', sides)
+    opening[:, 0][opening[:, 0] <= 1.0] = np.nan       # b365 개시 (결측 0)
+    closing = _market(chunk, books, 'c', sides)
+    fb_open = devig(_market(chunk, (FALLBACK_BOOK,), '', sides)[:, 0])
+    fb_close = devig(_market(chunk, (FALLBACK_BOOK,), 'c', sides)[:, 0])
+
+    cons, n_books = _consensus(devig(opening), fb_open)
+    close, _ = _consensus(devig(closing), fb_close)
+    s = books.index(SHARP_BOOK)
+    sharp_close = devig(closing[:, s])
+    sharp = np.where(np.isfinite(sharp_close), sharp_close, devig(opening[:, s]))
+    overround = (1.0 / opening).sum(axis=-1) - 1.0
+    valid = np.isfinite(overround)
+    margin = np.where(valid.any(axis=1), np.where(valid, overround, 0.0).sum(axis=1) / np.maximum(valid.sum(axis=1), 1),
+                      np.nan)
+
+    ou_books = ('b365', 'ps')
+    ou_open, _ = _consensus(devig(_market(chunk, ou_books, '', ('o25', 'u25'))),
+                            devig(_market(chunk, (FALLBACK_BOOK,), '', ('o25', 'u25'))[:, 0]))
+    ou_close, _ = _consensus(devig(_market(chunk, ou_books, 'c', ('o25', 'u25'))),
+                             devig(_market(chunk, (FALLBACK_BOOK,), 'c', ('o25', 'u25'))[:, 0]))
+
+    return np.column_stack([
+        cons, close, sharp,
+        close[:, 0] - cons[:, 0], close[:, 2] - cons[:, 2],
+        margin, n_books, ou_open[:, 0], ou_close[:, 0],
+    ]).astype(np.float32)
+
+
+def build_odds_features(chunks, method='power', path=ODDS_FEATURE_PATH):
+    """
+    매치 청크 반복자(iter_match_chunks(odds=True)) → 경기별 ODDS_FEATURES 를 float32 .npy(memmap)로 기록
+    행 순서는 매치 캐시(= 피처 행렬)와 동일. Returns: 읽기 전용 memmap (N, len(ODDS_FEATURES))
+    """
+    from soccer_real_data_engine import finalize_f32_matrix
+    if method not in DEVIG:
+        raise ValueError(f"unknown de-vig method: {method} (choose from {DEVIG_METHODS})")
+    n_rows = 0
+    part_path = f"{path}.part"
+    with span("odds_devig", method=method) as s:
+        with open(part_path, 'wb') as f:
+            for chunk in chunks:
+                feats = odds_features(chunk, method)
+                f.write(np.ascontiguousarray(feats).tobytes())
+                n_rows += len(feats)
+        s.add(rows=n_rows)
+    return finalize_f32_matrix(part_path, path, n_rows, len(ODDS_FEATURES))
+
+
+def coverage_report(features):
+    """피처별 결측 아닌 비율 + 평균 — 시즌/리그별로 공급되는 배당이 달라서 확인용"""
+    report = {}
+    for j, name in enumerate(ODDS_FEATURES):
+        col = np.asarray(features[:, j], dtype=np.float64)
+        ok = np.isfinite(col)
+        report[name] = {'coverage': round(float(ok.mean()), 4) if len(col) else 0.0,
+                        'mean': round(float(col[ok].mean()), 4) if ok.any() else None}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--method", choices=DEVIG_METHODS, default='power')
+    parser.add_argument("--out", default=ODDS_FEATURE_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from soccer_real_data_engine import iter_match_chunks
+    t0 = time.perf_counter()
+    features = build_odds_features(iter_match_chunks(odds=True), args.method, args.out)
+    seconds = time.perf_counter() - t0
+    logging.info(f"💱 [V11.3] 배당 마진 제거({args.method}): {len(features):,}경기 {seconds:.2f}s → {args.out}")
+    print(json.dumps({'rows': len(features), 'seconds': round(seconds, 3), 'bytes': os.path.getsize(args.out),
+                      'features': coverage_report(features)}, ensure_ascii=False, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+🗂️ [V11.3] Pair Prediction Cache — 리그별 (홈, 원정) 전 페어 예측표
+- 20팀 리그 = 380 페어 → predict_batch 한 번으로 전부 계산, 이후 대진 조회는 dict + 배열 인덱스 (O(1))
+- 표는 의존 입력과 함께 보관: 모델 버전(+ 골 모델) / 팀별 입력 서명 (스탯 xG·xGA·PPDA, ELO 레이팅, 퓨전 행)
+  — ELO 는 version 카운터가 아니라 팀별 레이팅 값으로 비교 (update() 밖에서 바뀐 레이팅도 감지)
+- refresh(): 모델이 바뀌면 전체, 아니면 서명이 바뀐 팀이 낀 페어만 모아 (전 리그 합쳐) predict_batch 1회로 재계산
+- refresh 결과는 바뀌지 않는 PairSnapshot — 새 표를 다 만든 뒤 한 번의 대입으로 교체하고 호출자에게도 반환
+  (세션 간 공유: 슬레이트는 자기가 refresh 한 스냅샷에서만 조회 → 다른 세션의 갱신과 섞이지 않음, 조회에 락 없음)
+- 리그 구성: 매치 캐시의 리그별 최신 시즌 팀 (league_teams) — 다른 리그 팀끼리 / 표에 없는 팀은 조회 실패(None)
+- 칼만 보정 xG 는 요청마다 바뀌므로 표 입력이 아님 — 호출자는 칼만 비활성일 때만 조회
+
+사용법:
+    cache = PairPredictionCache(league_teams(iter_match_chunks()))
+    view = cache.refresh(models, artifact.version, elo_sys, goal_model, core_stats, fusion_table)
+    view.lookup("Arsenal", "Chelsea")      # predict_match_ml 과 같은 튜플, 표에 없으면 None
+    python pair_cache.py --league EPL      # 표 구축 / 부분 갱신 / 조회 시간 리포트
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+from inference_engine import predict_batch
+from team_stats import DEFAULT_HOME_STAT, DEFAULT_AWAY_STAT
+
+FUSION_SIGNATURE_COLUMNS = ("sq_value", "injury", "odds_flow", "luck", "hurst", "eff", "skew")
+STAT_KEYS = ('xG', 'xGA', 'PPDA')
+
+
+def league_teams(chunks):
+    """
+    매치 청크 반복자 → {리그: 최신 시즌 팀 목록(정렬)}
+    캐시는 시간순 — 리그마다 마지막에 등장한 시즌이 최신 (season_simulator 와 같은 규칙)
+    """
+    latest = {}
+    for df in chunks:
+        for (league, season), g in df.groupby(['league', 'season'], sort=False, observed=True):
+            cur = latest.get(league)
+            if cur is None or cur[0] != season:
+                cur = latest[league] = (season, set())
+            cur[1].update(g['home'].astype(str))
+            cur[1].update(g['away'].astype(str))
+    return {str(league): sorted(teams) for league, (_, teams) in latest.items()}
+
+
+class PairTable:
+    """한 리그의 T×T 예측표 — [i, j] = 홈 i vs 원정 j (대각선 미사용). 만든 뒤 바꾸지 않음 (갱신은 updated())"""
+
+    def __init__(self, league, teams, probs=None, deep_trap=None, tier_diff=None, signatures=None):
+        self.league = league
+        self.teams = list(teams)
+        self.index = {t: i for i, t in enumerate(self.teams)}
+        n = len(self.teams)
+        self.probs = np.full((n, n, 3), np.nan) if probs is None else probs     # 홈승 / 무 / 원정승 (%)
+        self.deep_trap = np.zeros((n, n), dtype=bool) if deep_trap is None else deep_trap
+        self.tier_diff = np.zeros((n, n)) if tier_diff is None else tier_diff
+        self.signatures = [None] * n if signatures is None else signatures   # 계산에 쓴 팀별 입력 서명 (None = 미계산)
+
+    def input_signatures(self, stats, elo_sys, fusion_table):
+        """팀별 입력 서명 — 두 팀의 서명이 그대로면 그 페어의 예측도 그대로"""
+        ids = fusion_table.ids(self.teams)
+        arrays = fusion_table.arrays
+        fusion = np.column_stack([arrays[c][ids] for c in FUSION_SIGNATURE_COLUMNS]).tolist()
+        sigs = []
+        for team, row in zip(self.teams, fusion):
+            stat = stats.get(team)
+            sigs.append((tuple(stat[k] for k in STAT_KEYS) if stat is not None else None,
+                         elo_sys.get_elo(team) if elo_sys else None, tuple(row)))
+        return sigs
+
+    def updated(self, hi, ai, probs, deep_trap, tier_diff, signatures):
+        """(hi, ai) 페어만 새 값으로 바꾼 사본 — 원본은 그대로 (다른 스레드가 읽는 중일 수 있음)"""
+        table = PairTable(self.league, self.teams, self.probs.copy(), self.deep_trap.copy(), self.tier_diff.copy(),
+                          signatures)
+        table.probs[hi, ai] = probs
+        table.deep_trap[hi, ai] = deep_trap
+        table.tier_diff[hi, ai] = tier_diff
+        return table
+
+
+class PairSnapshot:
+    """refresh 1회의 결과 — 리그별 PairTable + 팀 → 리그 색인 + 의존 모델 버전 (불변, 락 없이 조회)"""
+
+    def __init__(self, tables, team_league, model_version=None, goal_model=None):
+        self.tables = tables
+        self.team_league = team_league
+        self.model_version = model_version
+        self.goal_model = goal_model
+
+    def lookup(self, home, away):
+        """
+        predict_match_ml 과 같은 튜플 (홈승, 무, 원정승, False, False, False, deep_trap, tier_diff)
+        같은 리그 표에 두 팀이 없거나 아직 계산 전이면 None
+        """
+        table = self.tables.get(self.team_league.get(home))
+        i = table.index.get(home) if table is not None else None
+        j = table.index.get(away) if table is not None else None
+        if i is None or j is None or i == j or table.signatures[i] is None:
+            return None
+        p = table.probs[i, j]
+        return (float(p[0]), float(p[1]), float(p[2]), False, False, False,
+                bool(table.deep_trap[i, j]), float(table.tier_diff[i, j]))
+
+
+class PairPredictionCache:
+    """세션 간 공유되는 현재 PairSnapshot — refresh 는 락으로 직렬화, 교체는 snapshot 대입 한 번"""
+
+    def __init__(self, leagues):
+        tables = {lg: PairTable(lg, teams) for lg, teams in leagues.items() if len(teams) > 1}
+        team_league = {}
+        for lg, table in tables.items():
+            for team in table.teams:
+                team_league.setdefault(team, lg)
+        self.snapshot = PairSnapshot(tables, team_league)
+        self._lock = threading.Lock()
+        self.last_refresh = {'pairs': 0, 'teams': 0, 'seconds': 0.0, 'full': False}
+
+    def __len__(self):
+        return sum(len(t.teams) * (len(t.teams) - 1) for t in self.snapshot.tables.values())
+
+    def refresh(self, models, model_version, elo_sys, goal_model, stats, fusion_table):
+        """
+        현재 입력에 맞춘 스냅샷을 반환 — 모델(또는 골 모델)이 바뀌면 전체, 아니면 입력 서명이 바뀐 팀이 낀 페어만 재계산.
+        stats: {팀: {'xG', 'xGA', 'PPDA'}} (없는 팀은 홈/원정 기본 스탯). 바뀐 것이 없으면 현재 스냅샷 그대로
+        """
+        with self._lock, span("pair_cache_refresh") as s:
+            t0 = time.perf_counter()
+            old = self.snapshot
+            full = model_version != old.model_version or goal_model is not old.goal_model
+            jobs, n_teams = [], 0
+            for table in old.tables.values():
+                sigs = table.input_signatures(stats, elo_sys, fusion_table)
+                changed = np.array([full or new != prev for new, prev in zip(sigs, table.signatures)])
+                if not changed.any():
+                    continue
+                n_teams += int(changed.sum())
+                hi, ai = np.nonzero(changed[:, None] | changed[None, :])
+                keep = hi != ai
+                jobs.append((table, hi[keep], ai[keep], sigs))
+
+            n_pairs = sum(len(hi) for _, hi, _, _ in jobs)
+            if n_pairs:
+                homes = [table.teams[i] for table, hi, _, _ in jobs for i in hi]
+                aways = [table.teams[j] for table, _, ai, _ in jobs for j in ai]
+                cols = fusion_table.pair_features(fusion_table.ids(homes), fusion_table.ids(aways))
+                fusion_rows = [{c: v[k].item() for c, v in cols.items()} for k in range(n_pairs)]
+                out = predict_batch(models, homes, aways,
+                                    [stats.get(h, DEFAULT_HOME_STAT) for h in homes],
+                                    [stats.get(a, DEFAULT_AWAY_STAT) for a in aways],
+                                    fusion_rows, elo_sys, goal_model)
+                probs = np.column_stack([out['h_prob'], out['d_prob'], out['a_prob']])
+                tables, start = dict(old.tables), 0
+                for table, hi, ai, sigs in jobs:
+                    rows = slice(start, start + len(hi))
+                    tables[table.league] = table.updated(hi, ai, probs[rows], out['deep_trap'][rows],
+                                                         out['tier_diff'][rows], sigs)
+                    start = rows.stop
+                self.snapshot = PairSnapshot(tables, old.team_league, model_version, goal_model)
+            elif full:
+                self.snapshot = PairSnapshot(old.tables, old.team_league, model_version, goal_model)
+            s.add(rows=n_pairs)
+            self.last_refresh = {'pairs': n_pairs, 'teams': n_teams, 'seconds': round(time.perf_counter() - t0, 4),
+                                 'full': bool(full)}
+            snapshot = self.snapshot
+        if n_pairs:
+            logging.info(f"🗂️ [V11.3] 페어 예측표 갱신: {n_teams}팀 → {n_pairs}페어 "
+                         f"({'전체' if full else '부분'}, {self.last_refresh['seconds']}s)")
+        return snapshot
+
+    def lookup(self, home, away):
+        """현재 스냅샷에서 조회 (한 슬레이트 안에서 일관된 값이 필요하면 refresh 가 반환한 스냅샷을 사용)"""
+        return self.snapshot.lookup(home, away)
+
+    def report(self):
+        snapshot = self.snapshot
+        return {'leagues': len(snapshot.tables), 'pairs': len(self), 'model_version': snapshot.model_version,
+                'last_refresh': self.last_refresh}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", default=None, help="리그 하나만 (기본: 매치 캐시의 전체 리그)")
+    parser.add_argument("--model-dir", default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from model_registry import ModelRegistry, MODEL_DIR
+    from soccer_real_data_engine import iter_match_chunks
+    from team_stats import build_knowledge_base
+    from fractal_engine import build_fractal_table_from_cache
+    from data_fusion_v8 import get_fusion_table
+
+    artifact = ModelRegistry(args.model_dir or MODEL_DIR).current()
+    if artifact is None:
+        raise SystemExit("❌ 학습된 모델 아티팩트가 없습니다 (앱 실행 또는 model_registry 학습 후 재시도)")
+    leagues = league_teams(iter_match_chunks())
+    if args.league:
+        if args.league not in leagues:
+            raise SystemExit(f"❌ 리그 '{args.league}' 가 매치 캐시에 없습니다 ({', '.join(leagues)})")
+        leagues = {args.league: leagues[args.league]}
+    stats = build_knowledge_base(use_understat=False)
+    fusion_table = get_fusion_table(build_fractal_table_from_cache())
+    goal_model = getattr(artifact, 'goal_model', None)
+
+    cache = PairPredictionCache(leagues)
+    cache.refresh(artifact.models, artifact.version, artifact.elo_system, goal_model, stats, fusion_table)
+    build = cache.last_refresh
+    team = next(iter(cache.snapshot.tables.values())).teams[0]
+    artifact.elo_system.ratings[team] = artifact.elo_system.get_elo(team) + 10.0   # 한 팀만 입력 변경
+    view = cache.refresh(artifact.models, artifact.version, artifact.elo_system, goal_model, stats, fusion_table)
+    partial = cache.last_refresh
+
+    pairs = [(h, a) for t in view.tables.values() for h in t.teams for a in t.teams if h != a]
+    t0 = time.perf_counter()
+    for h, a in pairs:
+        view.lookup(h, a)
+    lookup_us = (time.perf_counter() - t0) / max(len(pairs), 1) * 1e6
+    print(json.dumps({'build': build, 'one_team_changed': partial, 'lookup_us': round(lookup_us, 2),
+                      **cache.report()}, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+⏱️ [V11.3] Perf Spans — 단계별 소요 시간 / 행 수 / 바이트 계측 (Streamlit 비의존)
+- span("http_fetch", source="football-data") 컨텍스트 또는 @timed("inference") 데코레이터로 계측
+- 같은 (이름, 라벨) 별로 횟수 / 누적·최대 시간 / 행 수 / 바이트 / 예외 수를 집계 + 최근 이벤트 링 버퍼
+- 내보내기: Prometheus 텍스트(.prom) 또는 JSON — SG_PERF_EXPORT=경로 지정 시 프로세스 종료 때 자동 기록
+- SG_PERF_SPANS=0 이면 비활성: span() 은 공용 no-op 객체만 반환 (할당/시계 호출 없음)
+
+사용법:
+    from perf_spans import span, timed
+    with span("csv_parse", source="cache") as s:
+        df = pd.read_csv(path)
+        s.add(rows=len(df), nbytes=os.path.getsize(path))
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from functools import wraps
+
+ENABLED = os.getenv("SG_PERF_SPANS", "1") != "0"
+RECENT_EVENTS = 200
+METRIC_PREFIX = "sg_span"
+
+_lock = threading.Lock()
+_stats = {}                                 # (name, labels) → [count, total_sec, max_sec, rows, bytes, errors]
+_recent = deque(maxlen=RECENT_EVENTS)       # (ended_at, name, labels, sec, rows, bytes, ok)
+
+
+class _NullSpan:
+    """비활성 시 반환되는 공용 no-op 스팬"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, rows=0, nbytes=0):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('name', 'labels', 'rows', 'nbytes', '_t0')
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+        self.rows = self.nbytes = 0
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self.name, self.labels, time.perf_counter() - self._t0, self.rows, self.nbytes, exc_type is None)
+        return False
+
+    def add(self, rows=0, nbytes=0):
+        """처리한 행 수 / 바이트 누적 (한 스팬에서 여러 번 호출 가능)"""
+        self.rows += int(rows)
+        self.nbytes += int(nbytes)
+
+
+def _record(name, labels, sec, rows, nbytes, ok):
+    key = (name, labels)
+    with _lock:
+        st = _stats.get(key)
+        if st is None:
+            st = _stats[key] = [0, 0.0, 0.0, 0, 0, 0]
+        st[0] += 1
+        st[1] += sec
+        st[2] = max(st[2], sec)
+        st[3] += rows
+        st[4] += nbytes
+        st[5] += not ok
+        _recent.append((time.time(), name, labels, sec, rows, nbytes, ok))
+
+
+def span(name, **labels):
+    """계측 스팬 (with 문) — 라벨은 Prometheus 라벨로 그대로 내보냄"""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+
+def timed(name, count=None, **labels):
+    """
+    함수 전체를 span(name) 으로 감싸는 데코레이터 (비활성 시 원본 함수 호출만 추가)
+    count: 반환값 → 처리 행 수 (예: lambda out: len(out[1]))
+    """
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with span(name, **labels) as s:
+                out = fn(*args, **kwargs)
+                if count is not None:
+                    s.add(rows=count(out))
+                return out
+        return wrapper
+    return deco
+
+
+def set_enabled(flag):
+    global ENABLED
+    ENABLED = bool(flag)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _recent.clear()
+
+
+def snapshot():
+    """집계 스냅샷 — [{'span', 'labels', 'count', 'total_ms', 'avg_ms', 'max_ms', 'rows', 'bytes', 'errors'}, ...] (누적 시간 내림차순)"""
+    with _lock:
+        items = [(k, list(v)) for k, v in _stats.items()]
+    out = []
+    for (name, labels), (count, total, peak, rows, nbytes, errors) in items:
+        out.append({
+            'span': name, 'labels': dict(labels), 'count': count,
+            'total_ms': round(total * 1000, 3), 'avg_ms': round(total * 1000 / count, 3) if count else 0.0,
+            'max_ms': round(peak * 1000, 3), 'rows': rows, 'bytes': nbytes, 'errors': errors,
+        })
+    return sorted(out, key=lambda r: -r['total_ms'])
+
+
+def recent(limit=50):
+    """최근 스팬 이벤트 (최신순)"""
+    with _lock:
+        events = list(_recent)[-limit:]
+    return [{'ended_at': round(t, 3), 'span': n, 'labels': dict(l), 'ms': round(s * 1000, 3),
+             'rows': r, 'bytes': b, 'ok': ok} for t, n, l, s, r, b, ok in reversed(events)]
+
+
+def _prom_labels(name, labels):
+    pairs = [('span', name)] + sorted(labels.items())
+    escaped = ('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def to_prometheus():
+    """Prometheus 텍스트 노출 포맷 (node_exporter textfile collector 호환)"""
+    rows = snapshot()
+    metrics = [
+        ('count_total', 'counter', 'Number of completed spans', lambda r: r['count']),
+        ('seconds_total', 'counter', 'Total time spent in span', lambda r: r['total_ms'] / 1000),
+        ('seconds_max', 'gauge', 'Slowest single span', lambda r: r['max_ms'] / 1000),
+        ('rows_total', 'counter', 'Rows processed inside span', lambda r: r['rows']),
+        ('bytes_total', 'counter', 'Bytes processed inside span', lambda r: r['bytes']),
+        ('errors_total', 'counter', 'Spans that exited with an exception', lambda r: r['errors']),
+    ]
+    lines = []
+    for suffix, kind, help_text, value in metrics:
+        metric = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for r in rows:
+            lines.append(f"{metric}{_prom_labels(r['span'], r['labels'])} {value(r):g}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json():
+    return json.dumps({'generated_at': round(time.time(), 3), 'spans': snapshot(), 'recent': recent()},
+                      ensure_ascii=False, indent=1)
+
+
+def export(path):
+    """확장자로 포맷 결정 (.prom/.txt → Prometheus, 그 외 JSON) — 임시 파일 후 os.replace 로 원자적 교체"""
+    text = to_prometheus() if path.endswith((".prom", ".txt")) else to_json()
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+_EXPORT_PATH = os.getenv("SG_PERF_EXPORT")
+if _EXPORT_PATH:
+    atexit.register(lambda: ENABLED and _stats and export(_EXPORT_PATH))
@@ -0,0 +1,239 @@
+"""
+🖥️ [V11.2] Headless Batch Prediction CLI — Streamlit 없이 대진표 일괄 예측 (크론/야간 배치용)
+- 입력: CSV (home,away 또는 HomeTeam,AwayTeam 컬럼) 또는 기존 "A vs B" 텍스트 포맷
+- 모델: model_artifacts/ 의 마지막 검증 통과 아티팩트 (학습 없음)
+- ELO: 앱과 같은 라이브 레이팅(elo_ratings.json, 자동 수집/피드백 반영분) — 없으면 아티팩트의 학습 재생 레이팅 (elo_source 로 보고)
+- 배치 추론 후 CSV / JSONL 로 스트리밍 출력, 처리량(fixtures/sec)은 stderr 로 보고
+- --workers N: 대용량 입력을 청크로 나눠 프로세스 풀에서 병렬 예측 (출력 순서 유지)
+
+사용법:
+    python predict_cli.py fixtures.txt                          # 표준출력으로 CSV
+    python predict_cli.py fixtures.csv --format jsonl -o out.jsonl --workers 4
+    cat slate.txt | python predict_cli.py - --no-kalman
+"""
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+from team_names import resolve_team, parse_input_matches
+from inference_engine import predict_batch, classify_pick, calculate_msi, determine_match_state
+from team_stats import build_knowledge_base, DEFAULT_HOME_STAT, DEFAULT_AWAY_STAT
+
+OUTPUT_FIELDS = [
+    'no', 'home', 'away', 'home_team', 'away_team', 'h_prob', 'd_prob', 'a_prob',
+    'pick', 'msi', 'state', 'grade', 'model_version', 'error',
+]
+DEFAULT_BATCH_SIZE = 2048
+
+_ctx = None  # 프로세스별 예측 컨텍스트 (워커는 initializer에서 1회 로드)
+
+
+class PredictionContext:
+    """아티팩트(모델) + ELO + 팀 스탯 + 퓨전 테이블 — 예측에 필요한 읽기 전용 상태"""
+
+    def __init__(self, artifact, core_stats, fusion_table, elo_system=None):
+        self.models = artifact.models
+        # 🧪 [V11.3] elo_system 을 주면 라이브 레이팅, 아니면 아티팩트의 학습 재생 레이팅 (캐시 끝 시점)
+        self.elo_system = elo_system if elo_system is not None else artifact.elo_system
+        self.elo_source = 'live' if elo_system is not None else 'artifact'
+        self.goal_model = getattr(artifact, 'goal_model', None)
+        self.model_version = artifact.version
+        self.core_stats = core_stats
+        self.fusion_table = fusion_table
+        # ELO/스탯이 있는 팀명은 TEAM_MAPPING 에 없어도 그대로 사용 (리그 확장 시 매핑 추가 불필요)
+        self.known_teams = frozenset(self.elo_system.ratings) | frozenset(core_stats)
+
+
+def load_context(model_dir=None, use_understat=False):
+    """디스크의 최신 아티팩트 + 라이브 ELO + 매치 캐시 기반 스탯/프랙탈로 컨텍스트 구성 (백그라운드 학습 없음)"""
+    from model_registry import ModelRegistry, MODEL_DIR
+    from soccer_real_data_engine import MATCH_CACHE_PATH, EloRatingSystem
+    from fractal_engine import build_fractal_table_from_cache
+    from data_fusion_v8 import get_fusion_table
+
+    artifact = ModelRegistry(model_dir or MODEL_DIR).current()
+    if artifact is None:
+        raise SystemExit("❌ 학습된 모델 아티팩트가 없습니다 (앱 실행 또는 model_registry 학습 후 재시도)")
+    fractal_table = None
+    if os.path.exists(MATCH_CACHE_PATH):
+        fractal_table = build_fractal_table_from_cache()
+    live_elo = EloRatingSystem()   # 읽기만 (시드/저장은 앱의 load_live_elo)
+    return PredictionContext(artifact, build_knowledge_base(use_understat), get_fusion_table(fractal_table),
+                             live_elo if live_elo.ratings else None)
+
+
+def _init_worker(model_dir, use_understat, nthread):
+    global _ctx
+    logging.getLogger().setLevel(logging.WARNING)
+    _ctx = load_context(model_dir, use_understat)
+    # 워커 수 × XGBoost 스레드가 코어 수를 넘지 않도록 (과다 구독 방지)
+    booster = getattr(_ctx.models[0], 'booster', None)
+    if booster is not None:
+        booster.set_param({'nthread': nthread})
+
+
+def predict_chunk(chunk, ctx=None):
+    """
+    chunk: [(no, home_input, away_input, h_stat|None, a_stat|None), ...]
+    h_stat/a_stat 가 None 이면 컨텍스트의 팀 스탯 사용 (칼만 보정값은 부모가 미리 채워 전달)
+    Returns: 출력 행 dict 리스트 (입력 순서 유지)
+    """
+    ctx = ctx or _ctx
+    rows, valid = [], []
+    for no, h_in, a_in, h_stat, a_stat in chunk:
+        eh, ea = resolve_team(h_in, ctx.known_teams), resolve_team(a_in, ctx.known_teams)
+        row = {'no': no, 'home': h_in, 'away': a_in, 'home_team': eh, 'away_team': ea,
+               'model_version': ctx.model_version, 'error': None}
+        if not eh or not ea:
+            row['error'] = "unmapped team"
+        else:
+            valid.append((len(rows), eh, ea,
+                          h_stat or dict(ctx.core_stats.get(eh, DEFAULT_HOME_STAT)),
+                          a_stat or dict(ctx.core_stats.get(ea, DEFAULT_AWAY_STAT))))
+        rows.append(row)
+    if not valid:
+        return rows
+
+    idx, homes, aways, h_stats, a_stats = zip(*valid)
+    table = ctx.fusion_table
+    cols = table.pair_features(table.ids(list(homes)), table.ids(list(aways)))
+    fusion_rows = [{c: v[k].item() for c, v in cols.items()} for k in range(len(homes))]
+    out = predict_batch(ctx.models, homes, aways, h_stats, a_stats, fusion_rows, ctx.elo_system,
+                        ctx.goal_model)
+
+    for k, r in enumerate(idx):
+        fusion = fusion_rows[k]
+        h_prob, d_prob, a_prob, pick, grade = classify_pick(
+            float(out['h_prob'][k]), float(out['d_prob'][k]), float(out['a_prob'][k]),
+            fusion, rows[r]['away'], bool(out['deep_trap'][k]))
+        rows[r].update({
+            'h_prob': round(h_prob, 1), 'd_prob': round(d_prob, 1), 'a_prob': round(a_prob, 1),
+            'pick': pick, 'grade': grade,
+            'msi': round(float(calculate_msi(h_prob, d_prob, a_prob, fusion['h_hurst'])), 1),
+            'state': determine_match_state(fusion['h_hurst'], fusion['a_hurst'], fusion['h_eff'])[0],
+        })
+    return rows
+
+
+def read_fixtures(path):
+    """CSV(home/away 컬럼) 또는 "A vs B" 텍스트 → [(home, away), ...] (텍스트는 app 과 같은 정규화)"""
+    handle = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8-sig')
+    with handle:
+        text = handle.read()
+    first = text.lstrip().split("\n", 1)[0]
+    if " vs " not in first and "," in first:
+        reader = csv.DictReader(text.splitlines())
+        fields = {f.lower(): f for f in reader.fieldnames or []}
+        h_col = fields.get('home') or fields.get('hometeam')
+        a_col = fields.get('away') or fields.get('awayteam')
+        if not h_col or not a_col:
+            raise SystemExit(f"❌ CSV 헤더에 home/away (또는 HomeTeam/AwayTeam) 컬럼이 필요합니다: {reader.fieldnames}")
+        return [(r[h_col].strip(), r[a_col].strip()) for r in reader if r.get(h_col) and r.get(a_col)]
+    return parse_input_matches(text)
+
+
+def prepare_chunk(fixtures, start_no, kalman_engine, ctx):
+    """
+    [(home, away), ...] → predict_chunk 입력 [(no, home, away, h_stat, a_stat), ...]
+    칼만 보정은 상태 파일 경쟁을 피하려 호출자(단일 스레드/부모 프로세스)에서 순차 적용
+    """
+    chunk = []
+    for no, (h, a) in enumerate(fixtures, start_no):
+        h_stat = a_stat = None
+        eh, ea = resolve_team(h, ctx.known_teams), resolve_team(a, ctx.known_teams)
+        if kalman_engine is not None and eh and ea:
+            h_stat = dict(ctx.core_stats.get(eh, DEFAULT_HOME_STAT))
+            a_stat = dict(ctx.core_stats.get(ea, DEFAULT_AWAY_STAT))
+            h_stat['xG'] = kalman_engine.get_stabilized_xg(eh, h_stat['xG'])
+            a_stat['xG'] = kalman_engine.get_stabilized_xg(ea, a_stat['xG'])
+        chunk.append((no, h, a, h_stat, a_stat))
+    return chunk
+
+
+def _chunks(fixtures, size, kalman_engine, ctx):
+    for start in range(0, len(fixtures), size):
+        yield prepare_chunk(fixtures[start:start + size], start + 1, kalman_engine, ctx)
+
+
+class _Writer:
+    def __init__(self, fmt, stream):
+        self.fmt, self.stream = fmt, stream
+        if fmt == "csv":
+            self.csv = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+            self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.fmt == "csv":
+                self.csv.writerow(row)
+            else:
+                self.stream.write(json.dumps({k: row.get(k) for k in OUTPUT_FIELDS}, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", help="대진표 파일 (CSV 또는 'A vs B' 텍스트, '-' = stdin)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="예측 프로세스 수 (대용량 입력용)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--model-dir", default=None)
+    parser.add_argument("--no-kalman", action="store_true", help="V13 칼만 xG 안정화 생략")
+    parser.add_argument("--understat", action="store_true", help="Understat 스냅샷 갱신/반영")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s | %(levelname)s | %(message)s', stream=sys.stderr)
+
+    t_load = time.perf_counter()
+    fixtures = read_fixtures(args.fixtures)
+    ctx = load_context(args.model_dir, args.understat)
+    kalman_engine = None
+    if not args.no_kalman:
+        from kalman_guardian_v13 import KalmanGuardianEngine
+        kalman_engine = KalmanGuardianEngine()
+    load_sec = time.perf_counter() - t_load
+
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+    writer = _Writer(args.format, out)
+    chunks = _chunks(fixtures, max(1, args.batch_size), kalman_engine, ctx)
+    n_rows = n_err = 0
+    t0 = time.perf_counter()
+    try:
+        if args.workers > 1:
+            # spawn: 워커마다 아티팩트를 1회 로드, map 은 입력 순서대로 결과를 내보냄
+            with ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context("spawn"),
+                                     initializer=_init_worker,
+                                     initargs=(args.model_dir, args.understat,
+                                               max(1, (os.cpu_count() or 1) // args.workers))) as pool:
+                results = pool.map(predict_chunk, chunks)
+                for rows in results:
+                    writer.write(rows)
+                    n_rows += len(rows)
+                    n_err += sum(r['error'] is not None for r in rows)
+        else:
+            for chunk in chunks:
+                rows = predict_chunk(chunk, ctx)
+                writer.write(rows)
+                n_rows += len(rows)
+                n_err += sum(r['error'] is not None for r in rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - t0
+    print(json.dumps({
+        'fixtures': n_rows, 'unmapped': n_err, 'workers': args.workers, 'model_version': ctx.model_version,
+        'elo_source': ctx.elo_source,
+        'load_sec': round(load_sec, 2), 'predict_sec': round(elapsed, 3),
+        'fixtures_per_sec': round(n_rows / elapsed, 1) if elapsed > 0 else None,
+    }, ensure_ascii=False), file=sys.stderr)
+    return 0 if n_rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
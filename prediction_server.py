@@ -0,0 +1,293 @@
+"""
+🛰️ [V11.3] Prediction Server — 로컬 HTTP 예측 서비스 (마이크로 배칭)
+- 앙상블 / ELO / 칼만 / 퓨전 테이블을 프로세스 메모리에 상주 (요청마다 재학습·재로드 없음)
+- 동시 요청은 배처 스레드가 최대 --max-wait-ms 동안 모아 한 번의 predict_batch 호출로 처리
+- 요청 지연(p50 / p99), 배치 크기 통계는 GET /stats 로 조회
+- 표준 라이브러리(http.server)만 사용 — localhost 에서 실행 + 부하 테스트 가능
+
+엔드포인트:
+    POST /predict   {"fixtures": [{"home": "Arsenal", "away": "Chelsea"}, ["아스널", "첼시"], ...]}
+                    또는 {"home": ..., "away": ...}  →  {"model_version", "results": [...]}
+    GET  /health    서빙 모델 버전 + ELO 출처 (live = elo_ratings.json, artifact = 학습 재생 레이팅)
+    GET  /stats     요청 수, 배치 수, 평균 배치 크기, p50/p99 지연(ms)
+    POST /reload    model_artifacts/ 의 최신 아티팩트 + 라이브 ELO 로 교체 (핫스왑)
+
+사용법:
+    python prediction_server.py --port 8502
+    python prediction_server.py --loadtest 2000 --concurrency 32     # 임시 포트에 띄워 부하 테스트
+"""
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+from predict_cli import load_context, prepare_chunk, predict_chunk
+
+DEFAULT_PORT = 8502
+DEFAULT_MAX_WAIT_MS = 5.0       # 첫 요청 도착 후 추가 요청을 기다리는 최대 시간
+DEFAULT_MAX_BATCH = 512         # 배치 1회 최대 경기 수
+MAX_FIXTURES_PER_REQUEST = 1000
+LATENCY_WINDOW = 10000          # p50/p99 계산용 최근 요청 수
+
+
+class MicroBatcher:
+    """
+    요청 큐 → 배처 스레드 1개. 먼저 온 요청 이후 max_wait 동안 모인 요청을 합쳐 한 번에 예측.
+    칼만 상태 갱신과 모델 호출이 모두 이 스레드에서만 일어나므로 별도 락이 필요 없습니다.
+    """
+
+    def __init__(self, ctx, kalman_engine=None, max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.ctx = ctx
+        self.kalman_engine = kalman_engine
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.fixtures = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, fixtures):
+        """[(home, away), ...] → Future(결과 행 리스트)"""
+        future = Future()
+        self._queue.put((fixtures, future, time.perf_counter()))
+        return future
+
+    def swap_context(self, ctx):
+        """다음 배치부터 새 컨텍스트 사용 (참조 교체 1회)"""
+        self.ctx = ctx
+
+    def _collect(self):
+        items = [self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            ctx = self.ctx
+            try:
+                fixtures = [f for fx, _, _ in items for f in fx]
+                rows = predict_chunk(prepare_chunk(fixtures, 1, self.kalman_engine, ctx), ctx)
+            except Exception as e:
+                logging.error(f"❌ [V11.3] 배치 예측 실패: {e}")
+                for _, future, _ in items:
+                    future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            offset = 0
+            with self._lock:
+                self.batch_sizes.append(len(fixtures))
+                for fx, future, t_in in items:
+                    part = rows[offset:offset + len(fx)]
+                    for no, row in enumerate(part, 1):
+                        row['no'] = no
+                    offset += len(fx)
+                    self.latencies_ms.append((now - t_in) * 1000)
+                    self.requests += 1
+                    self.fixtures += len(fx)
+                    future.set_result(part)
+
+    def stats(self):
+        with self._lock:
+            lat = np.array(self.latencies_ms) if self.latencies_ms else None
+            sizes = np.array(self.batch_sizes) if self.batch_sizes else None
+            return {
+                'model_version': self.ctx.model_version,
+                'requests': self.requests, 'fixtures': self.fixtures,
+                'batches_window': 0 if sizes is None else int(len(sizes)),
+                'avg_batch_fixtures': None if sizes is None else round(float(sizes.mean()), 1),
+                'p50_ms': None if lat is None else round(float(np.percentile(lat, 50)), 2),
+                'p99_ms': None if lat is None else round(float(np.percentile(lat, 99)), 2),
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+
+def _parse_fixtures(payload):
+    """요청 JSON → [(home, away), ...]"""
+    if isinstance(payload, dict) and 'fixtures' not in payload:
+        payload = {'fixtures': [payload]}
+    fixtures = []
+    for item in payload.get('fixtures', []) if isinstance(payload, dict) else []:
+        if isinstance(item, dict):
+            fixtures.append((str(item.get('home', '')), str(item.get('away', ''))))
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            fixtures.append((str(item[0]), str(item[1])))
+        else:
+            raise ValueError(f"잘못된 fixture 형식: {item!r}")
+    if not fixtures:
+        raise ValueError("fixtures 가 비어 있습니다")
+    if len(fixtures) > MAX_FIXTURES_PER_REQUEST:
+        raise ValueError(f"요청당 최대 {MAX_FIXTURES_PER_REQUEST}경기")
+    return fixtures
+
+
+class PredictionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # 기본 backlog(5)는 동시 접속 시 연결 리셋 발생
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    server_version = "SoccerGuardian/11.3"
+    batcher = None          # make_server 에서 주입
+    model_dir = None
+    use_understat = False
+
+    def log_message(self, fmt, *args):  # 요청별 access log 생략 (지연 측정 왜곡 방지)
+        pass
+
+    def _send(self, code, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            ctx = self.batcher.ctx
+            self._send(200, {'status': 'ok', 'model_version': ctx.model_version, 'elo_source': ctx.elo_source})
+        elif self.path == '/stats':
+            self._send(200, self.batcher.stats())
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path == '/reload':
+            try:
+                self.batcher.swap_context(load_context(self.model_dir, self.use_understat))
+                ctx = self.batcher.ctx
+                self._send(200, {'status': 'reloaded', 'model_version': ctx.model_version,
+                                 'elo_source': ctx.elo_source})
+            except (Exception, SystemExit) as e:  # load_context 는 아티팩트 부재 시 SystemExit
+                self._send(500, {'error': str(e)})
+            return
+        if self.path != '/predict':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            fixtures = _parse_fixtures(json.loads(self.rfile.read(length) or b'{}'))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'error': str(e)})
+            return
+        try:
+            rows = self.batcher.submit(fixtures).result(timeout=30)
+        except Exception as e:
+            self._send(500, {'error': str(e)})
+            return
+        self._send(200, {'model_version': rows[0]['model_version'] if rows else None, 'results': rows})
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, model_dir=None, use_understat=False, use_kalman=True,
+                max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch=DEFAULT_MAX_BATCH):
+    """컨텍스트 로드 + 배처 시작 + HTTP 서버 생성 (serve_forever 는 호출자가 실행)"""
+    ctx = load_context(model_dir, use_understat)
+    kalman_engine = None
+    if use_kalman:
+        from kalman_guardian_v13 import KalmanGuardianEngine
+        kalman_engine = KalmanGuardianEngine()
+    handler = type("BoundPredictionHandler", (PredictionHandler,), {
+        'batcher': MicroBatcher(ctx, kalman_engine, max_wait_ms, max_batch),
+        'model_dir': model_dir, 'use_understat': use_understat,
+    })
+    return PredictionHTTPServer((host, port), handler)
+
+
+def run_loadtest(server, n_requests, concurrency, fixtures_per_request=1):
+    """같은 프로세스에서 서버를 띄우고 동시 클라이언트로 부하 → 클라이언트/서버 지연 보고"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}/predict"
+    ctx = server.RequestHandlerClass.batcher.ctx
+    teams = sorted(ctx.known_teams) or ["Arsenal", "Chelsea"]
+
+    def one(i):
+        picks = np.random.default_rng(i).choice(len(teams), size=(fixtures_per_request, 2))
+        body = json.dumps({'fixtures': [[teams[h], teams[a]] for h, a in picks]}).encode('utf-8')
+        t0 = time.perf_counter()
+        with urlopen(Request(url, data=body, headers={'Content-Type': 'application/json'}), timeout=30) as resp:
+            resp.read()
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        client_ms = np.array(list(pool.map(one, range(n_requests))))
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+    report = {
+        'requests': n_requests, 'concurrency': concurrency, 'fixtures_per_request': fixtures_per_request,
+        'requests_per_sec': round(n_requests / elapsed, 1),
+        'client_p50_ms': round(float(np.percentile(client_ms, 50)), 2),
+        'client_p99_ms': round(float(np.percentile(client_ms, 99)), 2),
+        'server': server.RequestHandlerClass.batcher.stats(),
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model-dir", default=None)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--no-kalman", action="store_true")
+    parser.add_argument("--understat", action="store_true")
+    parser.add_argument("--loadtest", type=int, metavar="N", help="임시 포트에서 N개 요청 부하 테스트 후 종료")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fixtures-per-request", type=int, default=1)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+
+    # 부하 테스트는 칼만 상태 파일을 오염시키지 않도록 칼만 보정 없이 실행
+    port = 0 if args.loadtest else args.port
+    use_kalman = not (args.no_kalman or args.loadtest)
+    server = make_server(args.host, port, args.model_dir, args.understat, use_kalman,
+                         args.max_wait_ms, args.max_batch)
+    if args.loadtest:
+        logging.getLogger().setLevel(logging.WARNING)
+        print(json.dumps(run_loadtest(server, args.loadtest, args.concurrency, args.fixtures_per_request),
+                         ensure_ascii=False, indent=2))
+        return 0
+
+    logging.info(f"🛰️ [V11.3] 예측 서버 가동: http://{args.host}:{server.server_address[1]} "
+                 f"(모델 {server.RequestHandlerClass.batcher.ctx.model_version}, "
+                 f"ELO {server.RequestHandlerClass.batcher.ctx.elo_source}, 배치 대기 {args.max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+🧠 [V10.3] Reflection Store — 오답노트(Continuous Learning DB) 컬럼형 바이너리 저장소
+- features.f32 : float32 고정폭(16) 피처 행렬 (raw 바이너리, append 전용)
+- labels.i8    : int8 라벨 배열 (0=원정승, 1=무, 2=홈승)
+- keys.txt     : 행 순서대로 "{home}_vs_{away}" 매치 키 (한 줄에 하나)
+- 읽기는 np.memmap (전체 로드 없음), 추가는 파일 끝에 append (재작성 없음)
+- v8_continuous_learning_db.json 은 원본(마스터) — 저장소는 여기서 가져온 float32 사본, R2 에는 JSON 원본을 그대로 올림
+- source.sha256 : 마지막으로 가져온 JSON 의 해시 — 재학습마다 같은 JSON 이면 저장소를 다시 쓰지 않음
+"""
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+REFLECTION_DIR = "reflection_store"
+REFLECTION_JSON = "v8_continuous_learning_db.json"
+REFLECTION_EXPORT_JSON = "reflection_store_export.json"  # float32 사본 export (마스터 JSON 덮어쓰기 방지)
+N_FEATURES = 16
+MIN_FEATURES = 15  # 15개 이상인 행만 유효 (V9.5 호환, 부족분은 0.0 패딩)
+
+_FEATURES_FILE = "features.f32"
+_LABELS_FILE = "labels.i8"
+_KEYS_FILE = "keys.txt"
+_SOURCE_FILE = "source.sha256"  # 마지막으로 가져온 JSON 의 sha256 — 같으면 import_json 이 재작성 생략
+_ROW_BYTES = N_FEATURES * 4
+
+
+class ReflectionStore:
+    """
+    오답노트를 (피처 배열, 라벨 배열, 매치 키 인덱스)로 보관합니다.
+    - features / labels: memmap 뷰 (읽기 전용)
+    - lookup / has_upset: "{home}_vs_{away}" 키 기반 O(1) 조회
+    """
+
+    def __init__(self, path=REFLECTION_DIR):
+        self.path = path
+        self.keys = []
+        self.index = {}  # {match_key: [row, ...]}
+        self._features = None
+        self._labels = None
+        os.makedirs(self.path, exist_ok=True)
+        self._open()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _open(self):
+        """파일 크기에서 행 수를 계산하고, 중단된 append의 잔여 바이트는 잘라냄"""
+        for name in (_FEATURES_FILE, _LABELS_FILE, _KEYS_FILE):
+            if not os.path.exists(self._file(name)):
+                open(self._file(name), "ab").close()
+
+        with open(self._file(_KEYS_FILE), "r", encoding="utf-8") as f:
+            keys = f.read().split("\n")[:-1]
+
+        n_feat = os.path.getsize(self._file(_FEATURES_FILE)) // _ROW_BYTES
+        n_label = os.path.getsize(self._file(_LABELS_FILE))
+        n = min(n_feat, n_label, len(keys))
+
+        # 라벨은 마지막에 기록되므로 라벨 수가 곧 커밋된 행 수 — 나머지 파일을 맞춰줌
+        if os.path.getsize(self._file(_FEATURES_FILE)) != n * _ROW_BYTES:
+            os.truncate(self._file(_FEATURES_FILE), n * _ROW_BYTES)
+        if n_label != n:
+            os.truncate(self._file(_LABELS_FILE), n)
+        if len(keys) != n:
+            keys = keys[:n]
+            with open(self._file(_KEYS_FILE), "w", encoding="utf-8") as f:
+                f.write("".join(k + "\n" for k in keys))
+
+        self.keys = keys
+        self.index = {}
+        for row, key in enumerate(keys):
+            self.index.setdefault(key, []).append(row)
+        self._features = None
+        self._labels = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def features(self):
+        """(N, 16) float32 memmap — 복사 없이 디스크에서 바로 읽음"""
+        if self._features is None:
+            if len(self) == 0:
+                self._features = np.empty((0, N_FEATURES), dtype=np.float32)
+            else:
+                self._features = np.memmap(self._file(_FEATURES_FILE), dtype=np.float32,
+                                           mode="r", shape=(len(self), N_FEATURES))
+        return self._features
+
+    @property
+    def labels(self):
+        """(N,) int8 memmap"""
+        if self._labels is None:
+            if len(self) == 0:
+                self._labels = np.empty(0, dtype=np.int8)
+            else:
+                self._labels = np.memmap(self._file(_LABELS_FILE), dtype=np.int8,
+                                         mode="r", shape=(len(self),))
+        return self._labels
+
+    def lookup(self, match_key):
+        """매치 키에 해당하는 행 번호 목록 (O(1))"""
+        return self.index.get(match_key, [])
+
+    def has_upset(self, match_key):
+        """해당 매치가 오답노트에 '홈승 아님(이변)'으로 기록되어 있는지"""
+        rows = self.lookup(match_key)
+        return any(int(self.labels[r]) != 2 for r in rows)
+
+    def append(self, match_key, features, label):
+        """단일 행 추가"""
+        self.append_many([match_key], [features], [label])
+
+    def append_many(self, match_keys, features, labels):
+        """
+        여러 행을 파일 끝에 추가 (기존 데이터 재작성 없음).
+        피처 → 키 → 라벨 순서로 기록하여 중단 시에도 라벨 수 기준으로 복구 가능.
+        """
+        if not match_keys:
+            return 0
+        feats = np.ascontiguousarray(features, dtype=np.float32).reshape(len(match_keys), N_FEATURES)
+        labs = np.asarray(labels, dtype=np.int8).reshape(len(match_keys))
+        self._set_source(None)  # JSON 과 달라졌으므로 다음 import_json 은 다시 가져옴
+
+        with open(self._file(_FEATURES_FILE), "ab") as f:
+            f.write(feats.tobytes())
+        with open(self._file(_KEYS_FILE), "a", encoding="utf-8") as f:
+            f.write("".join(str(k) + "\n" for k in match_keys))
+        with open(self._file(_LABELS_FILE), "ab") as f:
+            f.write(labs.tobytes())
+
+        start = len(self.keys)
+        for offset, key in enumerate(match_keys):
+            key = str(key)
+            self.keys.append(key)
+            self.index.setdefault(key, []).append(start + offset)
+        # memmap은 길이가 고정이므로 다음 접근 시 새로 매핑
+        self._features = None
+        self._labels = None
+        return len(match_keys)
+
+    def clear(self):
+        """저장소 비우기"""
+        self._set_source(None)
+        self._rewrite([], np.empty((0, N_FEATURES), dtype=np.float32), [])
+
+    def _rewrite(self, match_keys, features, labels):
+        """
+        저장소 전체 교체 — 임시 파일에 쓴 뒤 os.replace로 교체.
+        기존 파일을 truncate하지 않으므로, 다른 스레드가 열어둔 memmap은 이전 inode를 안전하게 계속 읽음.
+        """
+        feats = np.ascontiguousarray(features, dtype=np.float32).reshape(len(match_keys), N_FEATURES)
+        labs = np.asarray(labels, dtype=np.int8).reshape(len(match_keys))
+        payloads = [
+            (_FEATURES_FILE, feats.tobytes()),
+            (_KEYS_FILE, "".join(str(k) + "\n" for k in match_keys).encode("utf-8")),
+            (_LABELS_FILE, labs.tobytes()),
+        ]
+        for name, data in payloads:
+            tmp = self._file(name) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._file(name))
+        self._open()
+
+    def _source(self):
+        try:
+            with open(self._file(_SOURCE_FILE), "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _set_source(self, digest):
+        """가져온 JSON 의 sha256 기록 (None 이면 삭제) — 저장소 교체가 끝난 뒤에만 기록"""
+        if digest is None:
+            try:
+                os.remove(self._file(_SOURCE_FILE))
+            except FileNotFoundError:
+                pass
+            return
+        tmp = self._file(_SOURCE_FILE) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(digest)
+        os.replace(tmp, self._file(_SOURCE_FILE))
+
+    def refresh(self):
+        """다른 인스턴스가 파일을 교체/추가했으면 다시 열기"""
+        if os.path.getsize(self._file(_LABELS_FILE)) != len(self) or \
+                os.path.getsize(self._file(_FEATURES_FILE)) != len(self) * _ROW_BYTES:
+            self._open()
+        return self
+
+    def import_json(self, json_path=REFLECTION_JSON, replace=True):
+        """
+        JSON 오답노트([{match, features, label}, ...])를 바이너리 저장소로 변환.
+        features가 15개 미만인 행은 제외, 16개 미만은 0.0 패딩.
+        [V11.3] replace=True 이고 마지막으로 가져온 JSON 과 내용(sha256)이 같으면 파싱/재작성 생략
+        반환: 가져온 행 수
+        """
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if replace and digest == self._source():
+            return len(self)
+        db_data = json.loads(raw.decode("utf-8"))
+
+        keys, feats, labs = [], [], []
+        for row in db_data:
+            row_feats = row.get("features", [])
+            if len(row_feats) < MIN_FEATURES:
+                continue
+            keys.append(str(row.get("match", "")))
+            feats.append(list(row_feats[:N_FEATURES]) + [0.0] * (N_FEATURES - len(row_feats)))
+            labs.append(row["label"])
+
+        if replace:
+            self._rewrite(keys, feats, labs)
+            self._set_source(digest)
+            count = len(keys)
+        else:
+            count = self.append_many(keys, feats, labs)
+        logging.info(f"🧠 [V10.3] 오답노트 JSON → 바이너리 저장소: {count}건")
+        return count
+
+    def export_json(self, json_path=REFLECTION_EXPORT_JSON):
+        """바이너리 저장소 → JSON (외부 도구 호환용) — 피처는 float32 정밀도이므로 마스터 JSON 에 쓰지 않음"""
+        feats = np.asarray(self.features, dtype=np.float64).tolist()
+        labs = np.asarray(self.labels).tolist()
+        payload = [{"match": k, "features": f, "label": l} for k, f, l in zip(self.keys, feats, labs)]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=4)
+        return len(payload)
+
+
+def load_reflection_store(path=REFLECTION_DIR):
+    """
+    R2 → 로컬 JSON → 기존 바이너리 저장소 순으로 오답노트를 준비합니다.
+    R2 JSON이 있으면 최신본으로 저장소를 교체, 없으면 저장소가 비어 있을 때만 로컬 JSON을 가져옴.
+    """
+    r2_acc = os.getenv("R2_ACCESS_KEY_ID")
+    r2_sec = os.getenv("R2_SECRET_ACCESS_KEY")
+    r2_ep = os.getenv("R2_ENDPOINT_URL", "")
+
+    store = ReflectionStore(path)
+
+    # R2에서 로드 시도
+    if r2_acc and r2_sec:
+        try:
+            import boto3  # R2 키가 있을 때만 import (boto3 없는 로컬 설치 지원)
+            from botocore.config import Config
+            r2_config = Config(connect_timeout=3, read_timeout=3, retries={'max_attempts': 1})
+            s3 = boto3.client('s3', endpoint_url=r2_ep, aws_access_key_id=r2_acc,
+                aws_secret_access_key=r2_sec, region_name='auto', config=r2_config)
+            with span("r2_io", op="download", key=REFLECTION_JSON) as s:
+                s3.download_file("soccer-guardian-memory", REFLECTION_JSON, "temp_db.json")
+                s.add(nbytes=os.path.getsize("temp_db.json"))
+            store.import_json("temp_db.json")
+            logging.info(f"✅ [V10] R2 오답노트: {len(store)}건 로드")
+        except Exception as e:
+            logging.info(f"💭 R2 오답노트 로드 실패: {e}")
+
+    # 로컬 폴백 (바이너리 저장소가 비어 있을 때만 JSON 가져오기)
+    if len(store) == 0 and os.path.exists(REFLECTION_JSON):
+        try:
+            store.import_json(REFLECTION_JSON)
+        except:
+            pass
+    return store
@@ -0,0 +1,223 @@
+"""
+🎲 [V11.3] Monte Carlo Season Simulator — 잔여 일정 × N시즌 일괄 시뮬레이션 (우승 / 톱4 / 강등 확률)
+- 경기별 H/D/A 확률: EloRatingSystem.expected_score 무승부 모델 그대로 (expected_score_arrays)
+- 배치 하나 = (시즌 수 × 잔여 경기) 균등난수 한 번 → 결과 → 승점(원-핫 행렬곱) → 순위 (파이썬 루프 없음)
+- 배치는 SeedSequence 로 시드 분할 후 프로세스 풀로 코어에 분산 — 같은 seed / n_sims 면 워커 수와 무관하게 같은 결과
+- 동점 순위: 현재 득실차 → 무작위 (경기 스코어는 시뮬레이션하지 않음)
+
+사용법:
+    python season_simulator.py --league EPL --sims 100000 --workers 4
+    python season_simulator.py --league Serie_A --fixtures remaining.csv --json out.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+DEFAULT_SIMS = 100_000
+BATCH_SIMS = 10_000          # 배치당 시즌 수 (균등난수 배열 = BATCH_SIMS × 잔여 경기)
+TOP_N = 4
+RELEGATION_N = 3
+
+
+def _simulate_batch(spec):
+    """워커: 시즌 spec['n'] 개를 한 번에 시뮬레이션 → (순위 카운트 [T, T], 팀별 승점 합 [T], 승점 제곱합 [T])"""
+    probs, home_idx, away_idx = spec['probs'], spec['home_idx'], spec['away_idx']
+    base, tiebreak = spec['base_points'], spec['tiebreak']
+    n, n_fix, n_teams = spec['n'], len(probs), len(base)
+    rng = np.random.default_rng(spec['seed'])
+
+    # 1. 결과 추첨: u < p_h → 홈승, p_h ≤ u < p_h + p_d → 무, 나머지 → 원정승 (비교 결과를 바로 float32 로)
+    u = rng.random((n, n_fix))
+    home_win = np.less(u, probs[:, 0], out=np.empty((n, n_fix), dtype=np.float32), casting='unsafe')
+    not_loss = np.less(u, probs[:, 0] + probs[:, 1], out=np.empty((n, n_fix), dtype=np.float32), casting='unsafe')
+
+    # 2. 승점 누적 (선형): 홈 = 2·홈승 + 비패, 원정 = 3 − 2·비패 − 홈승 → 원-핫 가중 (F, T) 행렬곱 두 번
+    #    정수 값이라 float32 행렬곱도 정확
+    home_onehot = np.zeros((n_fix, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_fix, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_fix), home_idx] = 1
+    away_onehot[np.arange(n_fix), away_idx] = 1
+    points = (base + 3 * away_onehot.sum(axis=0)
+              + home_win @ (2 * home_onehot - away_onehot) + not_loss @ (home_onehot - 2 * away_onehot))
+
+    # 3. 순위: 승점 → 현재 득실차 → 무작위 (tiebreak 는 [0, 0.5), 잡음은 득실차 간격보다 작게)
+    key = points + tiebreak + rng.random((n, n_teams)) * spec['noise']
+    order = np.argsort(-key, axis=1)                       # order[s, p] = p위 팀
+    counts = np.bincount((order * n_teams + np.arange(n_teams)).ravel(), minlength=n_teams * n_teams)
+    return counts.reshape(n_teams, n_teams), points.sum(axis=0, dtype=np.float64), \
+        np.square(points, dtype=np.float64).sum(axis=0)
+
+
+class SeasonSimulation:
+    """시뮬레이션 결과 — 팀별 순위 분포 / 기대 승점 + 처리 속도"""
+
+    def __init__(self, teams, position_counts, points_sum, points_sq, n_sims, seconds, n_workers, n_fixtures):
+        self.teams = list(teams)
+        self.position_counts = position_counts        # [팀, 순위] 횟수
+        self.n_sims = n_sims
+        self.expected_points = points_sum / max(n_sims, 1)
+        self.points_std = np.sqrt(np.maximum(points_sq / max(n_sims, 1) - self.expected_points ** 2, 0))
+        self.seconds = seconds
+        self.n_workers = n_workers
+        self.n_fixtures = n_fixtures
+
+    @property
+    def sims_per_sec(self):
+        return self.n_sims / self.seconds if self.seconds > 0 else float('inf')
+
+    def position_probs(self):
+        """(T, T) 순위 확률 — [i, p] = 팀 i 가 p+1 위로 끝날 확률"""
+        return self.position_counts / max(self.n_sims, 1)
+
+    def summary(self, top_n=TOP_N, relegation_n=RELEGATION_N):
+        """팀별 요약 (기대 승점 내림차순) — 확률은 % 단위"""
+        probs = self.position_probs() * 100
+        n_teams = len(self.teams)
+        rows = []
+        for i, team in enumerate(self.teams):
+            rows.append({
+                'team': team,
+                'exp_points': round(float(self.expected_points[i]), 2),
+                'points_std': round(float(self.points_std[i]), 2),
+                'title': round(float(probs[i, 0]), 2),
+                'top4': round(float(probs[i, :top_n].sum()), 2),
+                'relegation': round(float(probs[i, n_teams - relegation_n:].sum()), 2) if relegation_n else 0.0,
+                'exp_position': round(float((probs[i] / 100) @ np.arange(1, n_teams + 1)), 2),
+            })
+        return sorted(rows, key=lambda r: (-r['exp_points'], r['exp_position']))
+
+    def perf_report(self):
+        return {'sims': self.n_sims, 'fixtures': self.n_fixtures, 'workers': self.n_workers,
+                'seconds': round(self.seconds, 3), 'sims_per_sec': round(self.sims_per_sec, 1)}
+
+
+def simulate_season(fixtures, elo_system, table=None, n_sims=DEFAULT_SIMS, n_workers=None, seed=42,
+                    batch_sims=BATCH_SIMS):
+    """
+    잔여 일정을 n_sims 시즌 몬테카를로 시뮬레이션합니다.
+    fixtures: [(home, away), ...] 잔여 경기
+    table: {team: {'points': int, 'gd': int}} 현재 순위표 (없으면 전원 0점 — 시즌 개막 전 전망)
+    Returns: SeasonSimulation
+    """
+    table = table or {}
+    teams = sorted({t for f in fixtures for t in f} | set(table))
+    index = {t: i for i, t in enumerate(teams)}
+    homes, aways = [h for h, _ in fixtures], [a for _, a in fixtures]
+
+    base = np.array([table.get(t, {}).get('points', 0) for t in teams], dtype=np.float32)
+    gd = np.array([table.get(t, {}).get('gd', 0) for t in teams], dtype=np.float64)
+    gd_span = gd.max() - gd.min() + 1 if len(gd) else 1
+    tiebreak = ((gd - gd.min()) / gd_span * 0.5) if len(gd) else gd
+    spec_base = {
+        'probs': elo_system.expected_score_arrays(homes, aways) if fixtures else np.zeros((0, 3)),
+        'home_idx': np.array([index[h] for h in homes], dtype=np.int64),
+        'away_idx': np.array([index[a] for a in aways], dtype=np.int64),
+        'base_points': base, 'tiebreak': tiebreak.astype(np.float32), 'noise': 0.25 / gd_span,
+    }
+
+    sizes = [min(batch_sims, n_sims - start) for start in range(0, n_sims, batch_sims)]
+    seeds = np.random.SeedSequence(seed).generate_state(len(sizes))
+    specs = [dict(spec_base, n=size, seed=int(s)) for size, s in zip(sizes, seeds)]
+    n_workers = max(1, min(len(specs), n_workers or os.cpu_count() or 1))
+
+    t0 = time.perf_counter()
+    with span("season_sim", teams=len(teams)) as s:
+        if n_workers == 1:
+            results = [_simulate_batch(spec) for spec in specs]
+        else:
+            # spawn: Streamlit 등 스레드가 있는 부모 프로세스에서도 안전
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn")) as pool:
+                results = list(pool.map(_simulate_batch, specs))
+        s.add(rows=n_sims)
+    seconds = time.perf_counter() - t0
+
+    counts = sum(r[0] for r in results) if results else np.zeros((len(teams), len(teams)), dtype=np.int64)
+    points_sum = sum(r[1] for r in results) if results else np.zeros(len(teams))
+    points_sq = sum(r[2] for r in results) if results else np.zeros(len(teams))
+    sim = SeasonSimulation(teams, counts, points_sum, points_sq, n_sims, seconds, n_workers, len(fixtures))
+    logging.info(f"🎲 [V11.3] 시즌 시뮬레이션 {n_sims:,}회 × 잔여 {len(fixtures)}경기 — "
+                 f"{seconds:.2f}s ({sim.sims_per_sec:,.0f} sims/s, 워커 {n_workers}개)")
+    return sim
+
+
+def current_table(df):
+    """
+    이미 치른 경기 DataFrame(home, away, h_goals, a_goals, result) → {team: {'points', 'gd', 'played'}}
+    """
+    if df is None or len(df) == 0:
+        return {}
+    h_pts = np.select([df['result'] == 2, df['result'] == 1], [3, 1], 0)
+    a_pts = np.select([df['result'] == 0, df['result'] == 1], [3, 1], 0)
+    h_gd = df['h_goals'].to_numpy(dtype=np.int64) - df['a_goals'].to_numpy(dtype=np.int64)
+    table = {}
+    for teams, pts, gd in ((df['home'].astype(str), h_pts, h_gd), (df['away'].astype(str), a_pts, -h_gd)):
+        for team, p, g in zip(teams, pts, gd):
+            row = table.setdefault(team, {'points': 0, 'gd': 0, 'played': 0})
+            row['points'] += int(p)
+            row['gd'] += int(g)
+            row['played'] += 1
+    return table
+
+
+def remaining_fixtures(df, teams=None):
+    """더블 라운드로빈 가정 — 아직 치르지 않은 (홈, 원정) 조합 목록 (teams 미지정 시 df 에 등장한 팀)"""
+    played = set(zip(df['home'].astype(str), df['away'].astype(str))) if len(df) else set()
+    teams = sorted(teams or (set(df['home'].astype(str)) | set(df['away'].astype(str))))
+    return [(h, a) for h in teams for a in teams if h != a and (h, a) not in played]
+
+
+def _load_fixtures(path):
+    """잔여 일정 CSV (home,away 또는 HomeTeam,AwayTeam) → [(home, away), ...]"""
+    import pandas as pd
+    df = pd.read_csv(path)
+    cols = ('home', 'away') if 'home' in df else ('HomeTeam', 'AwayTeam')
+    return list(zip(df[cols[0]].astype(str).str.strip(), df[cols[1]].astype(str).str.strip()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", default="EPL", help="매치 캐시의 리그명 (예: EPL, La_Liga)")
+    parser.add_argument("--season", default=None, help="시즌 코드 (기본: 캐시의 해당 리그 최신 시즌)")
+    parser.add_argument("--fixtures", default=None, help="잔여 일정 CSV (기본: 더블 라운드로빈 잔여 조합)")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from soccer_real_data_engine import read_match_cache, EloRatingSystem, MATCH_CACHE_PATH
+    if not os.path.exists(MATCH_CACHE_PATH):
+        raise SystemExit(f"❌ 매치 캐시({MATCH_CACHE_PATH})가 없습니다 — 앱 또는 학습 파이프라인을 먼저 실행하세요")
+    df = read_match_cache()
+    df = df[df['league'] == args.league]
+    if df.empty:
+        raise SystemExit(f"❌ 리그 '{args.league}' 경기가 매치 캐시에 없습니다")
+    season = args.season or df['season'].astype(str).iloc[-1]
+    played = df[df['season'].astype(str) == season]
+    fixtures = _load_fixtures(args.fixtures) if args.fixtures else remaining_fixtures(played)
+
+    sim = simulate_season(fixtures, EloRatingSystem(), current_table(played), args.sims, args.workers, args.seed)
+    rows = sim.summary()
+    print(f"{'team':<26}{'pts':>7}{'±':>6}{'title%':>8}{'top4%':>8}{'rel%':>8}")
+    for r in rows:
+        print(f"{r['team']:<26}{r['exp_points']:>7.1f}{r['points_std']:>6.1f}{r['title']:>8.1f}"
+              f"{r['top4']:>8.1f}{r['relegation']:>8.1f}")
+    print(json.dumps(sim.perf_report()), file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'league': args.league, 'season': season, 'table': rows, 'perf': sim.perf_report()},
+                      f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
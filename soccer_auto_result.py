@@ -4,8 +4,14 @@
 - API-Football (무료 Tier: api-sports.io) 또는 football-data.co.uk 최근 결과 사용
 - 수동 입력 없이 재실행 시 자동 반영
 """
-import os, json, logging, requests
+import os, logging
 from datetime import datetime, timedelta
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+from state_store import state_file, merge_union  # 🔒 [V11.3] 상태 파일 단일 작성자
+
+# 🌐 [V11.3] 데이터 소스 베이스 URL — 호출 시점에 SG_FDATA_URL / SG_API_FOOTBALL_URL 로 교체 가능
+FDATA_CURRENT_SEASON = "2425"
+API_FOOTBALL_URL = "https://v3.football.api-sports.io"
 
 def fetch_recent_results_fdata():
     """
@@ -13,7 +19,9 @@ def fetch_recent_results_fdata():
     이미 캐시된 데이터와 비교하여 새로운 경기만 추출.
     """
     import pandas as pd
+    import requests
     from io import StringIO
+    from soccer_real_data_engine import fdata_base_url
     
     LEAGUES = {"E0": "EPL", "SP1": "La_Liga", "D1": "Bundesliga", "I1": "Serie_A", "F1": "Ligue_1"}
     new_results = []
@@ -21,13 +29,17 @@ def fetch_recent_results_fdata():
     for code, name in LEAGUES.items():
         try:
             ts = int(datetime.now().timestamp() * 1000)
-            url = f"https://www.football-data.co.uk/mmz4281/2425/{code}.csv?t={ts}"
-            resp = requests.get(url, timeout=10)
+            url = f"{fdata_base_url()}/mmz4281/{FDATA_CURRENT_SEASON}/{code}.csv?t={ts}"
+            with span("http_fetch", source="football-data-recent") as s:
+                resp = requests.get(url, timeout=10)
+                s.add(nbytes=len(resp.content))
             if resp.status_code != 200:
                 continue
             
             raw = resp.content.decode('utf-8', errors='replace')
-            df = pd.read_csv(StringIO(raw), on_bad_lines='skip')
+            with span("csv_parse", source="football-data-recent") as s:
+                df = pd.read_csv(StringIO(raw), on_bad_lines='skip')
+                s.add(rows=len(df), nbytes=len(resp.content))
             
             required = ['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'Date']
             if not all(c in df.columns for c in required):
@@ -69,6 +81,8 @@ def fetch_recent_results_api_football(days=7):
     if not api_key:
         return []
     
+    import requests
+    base_url = os.getenv("SG_API_FOOTBALL_URL", API_FOOTBALL_URL).rstrip("/")
     results = []
     today = datetime.now()
     
@@ -76,11 +90,13 @@ def fetch_recent_results_api_football(days=7):
         date = (today - timedelta(days=delta)).strftime("%Y-%m-%d")
         try:
             ts = int(datetime.now().timestamp() * 1000)
-            resp = requests.get(
-                f"https://v3.football.api-sports.io/fixtures?date={date}&t={ts}",
-                headers={"x-apisports-key": api_key},
-                timeout=10
-            )
+            with span("http_fetch", source="api-football") as s:
+                resp = requests.get(
+                    f"{base_url}/fixtures?date={date}&t={ts}",
+                    headers={"x-apisports-key": api_key},
+                    timeout=10
+                )
+                s.add(nbytes=len(resp.content))
             data = resp.json()
             
             for fixture in data.get('response', []):
@@ -117,18 +133,40 @@ def auto_update_elo_and_brier(elo_system, brier_tracker):
     반환: 새로 처리된 경기 수
     """
     # 이미 처리된 경기 ID 로드
-    processed_path = "auto_processed_matches.json"
-    if os.path.exists(processed_path):
-        with open(processed_path, 'r') as f:
-            processed = set(json.load(f))
-    else:
-        processed = set()
+    processed_store = state_file("auto_processed_matches.json")
+    processed = set(processed_store.load([]))
     
     # 결과 수집 (두 소스 병합)
     results = fetch_recent_results_fdata()
     api_results = fetch_recent_results_api_football()
     results.extend(api_results)
     
+    new_count = apply_results(elo_system, brier_tracker, results, processed)
+    
+    # 처리 완료 기록 저장
+    # 🔒 [V11.3] 다른 세션이 그사이 기록한 match_id 와 합집합으로 원자적 저장
+    processed_store.save(sorted(processed), merge=merge_union, wait=True)
+    
+    if new_count > 0:
+        elo_system.save()
+        logging.info(f"✅ [Auto Update] {new_count}경기 자동 반영 완료! ELO + Brier 업데이트됨")
+    
+    return new_count
+
+
+def _result_date(date):
+    """결과 날짜 → Timestamp (football-data 는 dd/mm/yyyy, API-Football 은 YYYY-MM-DD / 파싱 불가 → NaT)"""
+    import pandas as pd
+    text = str(date).strip()
+    return pd.to_datetime(text, dayfirst='/' in text, errors='coerce')
+
+
+def apply_results(elo_system, brier_tracker, results, processed):
+    """
+    [V11.3] 수집된 결과를 ELO + 대기 중인 Brier 예측에 반영 (네트워크 없음 — 벤치마크에서 직접 호출)
+    processed: 이미 처리한 match_id 집합 (이 함수가 갱신)
+    반환: 새로 처리된 경기 수
+    """
     new_count = 0
     for r in results:
         match_id = f"{r['home']}_vs_{r['away']}_{r['date']}"
@@ -136,8 +174,8 @@ def auto_update_elo_and_brier(elo_system, brier_tracker):
         if match_id in processed:
             continue
         
-        # ELO 업데이트
-        elo_system.update(r['home'], r['away'], r['result'])
+        # ELO 업데이트 (🕰️ [V11.3] 경기 날짜도 넘겨 레이팅 이력에 기록)
+        elo_system.update(r['home'], r['away'], r['result'], _result_date(r['date']))
         
         # Brier Score에 기존 예측이 있으면 기록
         for pred in brier_tracker.predictions:
@@ -147,18 +185,33 @@ def auto_update_elo_and_brier(elo_system, brier_tracker):
                     pred['home'].lower() in r['home'].lower()):
                     if (r['away'].lower() in pred['away'].lower() or 
                         pred['away'].lower() in r['away'].lower()):
-                        brier_tracker.record_result(pred['match_id'], r['result'])
+                        brier_tracker.record_result(pred['match_id'], r['result'], save=False)
         
         processed.add(match_id)
         new_count += 1
-    
-    # 처리 완료 기록 저장
-    with open(processed_path, 'w') as f:
-        json.dump(list(processed), f)
-    
-    if new_count > 0:
-        elo_system.save()
-        brier_tracker.save()
-        logging.info(f"✅ [Auto Update] {new_count}경기 자동 반영 완료! ELO + Brier 업데이트됨")
-    
+    if new_count:
+        brier_tracker.save()  # 🔒 [V11.3] 결과마다가 아니라 묶음 끝에 1회 저장
     return new_count
+
+
+def load_live_elo(replay=None):
+    """
+    [V11.3] 서빙용 라이브 ELO — elo_ratings.json(+R2) 이 기준, 학습 재생(아티팩트 elo_system)과 분리
+    라이브 레이팅이 없을 때만 재생 결과로 시드: 캐시 마지막 날짜 이후의 처리 완료 기록을 지워
+    다음 자동 수집이 그 결과를 다시 반영하게 함 (수동 피드백 입력은 기록이 없어 복구되지 않음)
+    """
+    from soccer_real_data_engine import EloRatingSystem, NAT_DAY, _to_day
+    live = EloRatingSystem()
+    if live.ratings or replay is None or not replay.ratings:
+        return live
+    
+    live.ratings = dict(replay.ratings)
+    last_day = replay.history.last_day() if replay.history is not None else NAT_DAY
+    processed_store = state_file("auto_processed_matches.json")
+    processed = processed_store.load([])
+    keep = [m for m in processed if _to_day(_result_date(m.rsplit('_', 1)[-1])) <= last_day]
+    if len(keep) != len(processed):
+        processed_store.save(keep, wait=True)
+        logging.info(f"🔁 [Auto Update] 캐시 이후 결과 {len(processed) - len(keep)}경기 재반영 예정")
+    live.save()
+    return live
@@ -10,10 +10,11 @@ import json
 import logging
 import numpy as np
 import pandas as pd
-import requests
-import boto3
+from collections import deque
 from datetime import datetime
-from botocore.config import Config
+
+from perf_spans import span, timed  # ⏱️ [V11.3] 단계별 계측
+from state_store import state_file, merge_deltas  # 🔒 [V11.3] 상태 파일 단일 작성자 + 원자적 기록
 
 # ==============================================================================
 # 1. 실제 경기 데이터 수집 (football-data.co.uk)
@@ -22,6 +23,7 @@ from botocore.config import Config
 # CSV 컬럼 매핑: https://www.football-data.co.uk/notes.txt
 # Div, Date, HomeTeam, AwayTeam, FTHG, FTAG, FTR (Full Time Result: H/D/A)
 # HS, AS (Shots), HST, AST (Shots on Target), B365H, B365D, B365A (Bet365 odds)
+# [V11.3] 북메이커별 1X2 (PSH=Pinnacle, MaxH/AvgH=시장 최고/평균, ...CH=마감 배당), 2.5골 오버/언더 (B365>2.5, P<2.5 ...)
 
 LEAGUE_URLS = {
     "EPL": "E0",
@@ -34,6 +36,73 @@ LEAGUE_URLS = {
 # 최근 5시즌 (2020~2025)
 SEASONS = ["2021", "2122", "2223", "2324", "2425"]
 
+# 🌍 [V11.3] football-data 가 공개하는 전체 디비전 (2~5부 + 추가 국가) — SG_FDATA_LEAGUES=all 로 사용
+FDATA_DIVISIONS = {
+    **LEAGUE_URLS,
+    "Championship": "E1", "League_One": "E2", "League_Two": "E3", "National_League": "EC",
+    "Scottish_Premiership": "SC0", "Scottish_Championship": "SC1",
+    "Scottish_League_One": "SC2", "Scottish_League_Two": "SC3",
+    "Bundesliga_2": "D2", "Serie_B": "I2", "La_Liga_2": "SP2", "Ligue_2": "F2",
+    "Eredivisie": "N1", "Belgian_Pro_League": "B1", "Primeira_Liga": "P1",
+    "Super_Lig": "T1", "Greek_Super_League": "G1",
+}
+FDATA_FIRST_SEASON = 1993  # mmz4281 아카이브 시작 (9394) — 없는 시즌/디비전은 404 로 건너뜀
+
+MATCH_CACHE_PATH = "real_match_data_cache.csv"
+CACHE_ORDER = "date"  # 🕰️ [V11.3] 캐시 행 = 전 리그 통합 날짜순 (메타에 없으면 리그 × 시즌 순 구버전 → 재수집)
+MATCH_CHUNK_ROWS = int(os.getenv("SG_MATCH_CHUNK_ROWS", "50000"))  # 피처/ELO 청크 크기 (메모리 상한)
+FEATURE_MATRIX_PATH = "feature_matrix_f32.npy"
+N_FEATURES = 16  # build_features_from_real_data 출력 폭 (model_trainer.N_FEATURES 와 동일)
+FORM_WINDOW = 5  # 팀별 최근 경기 히스토리 길이
+
+
+def season_codes(first_year, last_year):
+    """시즌 시작 연도 구간 → football-data 시즌 코드 — season_codes(2000, 2002) → ['0001', '0102', '0203']"""
+    return [f"{y % 100:02d}{(y + 1) % 100:02d}" for y in range(first_year, last_year + 1)]
+
+
+def configured_leagues():
+    """
+    [V11.3] 수집 대상 리그 {리그명: 코드} — 호출 시점에 SG_FDATA_LEAGUES 로 결정
+    미설정/'top5' → LEAGUE_URLS, 'all' → FDATA_DIVISIONS, 그 외 리그명 또는 코드 콤마 목록 (예: "EPL,E1,SC0")
+    """
+    spec = os.getenv("SG_FDATA_LEAGUES", "").strip()
+    if not spec or spec.lower() == "top5":
+        return dict(LEAGUE_URLS)
+    if spec.lower() == "all":
+        return dict(FDATA_DIVISIONS)
+    by_code = {code: name for name, code in FDATA_DIVISIONS.items()}
+    leagues = {}
+    for token in (t.strip() for t in spec.split(",")):
+        if token in FDATA_DIVISIONS:
+            leagues[token] = FDATA_DIVISIONS[token]
+        elif token:
+            leagues[by_code.get(token, token)] = token  # 미등록 코드는 코드 자체를 리그명으로
+    return leagues
+
+
+def configured_seasons():
+    """
+    [V11.3] 수집 대상 시즌 코드 — 호출 시점에 SG_FDATA_SEASONS 로 결정
+    미설정 → SEASONS, 'all' → FDATA_FIRST_SEASON ~ 현재 시즌, '2000-2024' → 시작 연도 구간, 그 외 코드 콤마 목록
+    """
+    spec = os.getenv("SG_FDATA_SEASONS", "").strip()
+    if not spec:
+        return list(SEASONS)
+    if spec.lower() == "all":
+        now = datetime.now()
+        return season_codes(FDATA_FIRST_SEASON, now.year if now.month >= 7 else now.year - 1)
+    if "-" in spec:
+        first, last = (int(x) for x in spec.split("-", 1))
+        return season_codes(first, last)
+    return [s.strip() for s in spec.split(",") if s.strip()]
+
+# 🌐 [V11.3] 데이터 소스 베이스 URL — 호출 시점에 SG_FDATA_URL 로 교체 가능 (오프라인 스탠드인 서버 / 미러)
+FDATA_BASE_URL = "https://www.football-data.co.uk"
+
+def fdata_base_url():
+    return os.getenv("SG_FDATA_URL", FDATA_BASE_URL).rstrip("/")
+
 # 팀명 정규화 맵 (football-data.co.uk → 내부 영문명)
 FDATA_TEAM_MAP = {
     "Man City": "Manchester City", "Man United": "Manchester Utd",
@@ -57,114 +126,552 @@ def _normalize_fdata_team(name):
     return FDATA_TEAM_MAP.get(name, name)
 
 
-def fetch_real_match_data(use_cache=True):
+# 🧱 [V11.3] 매치 프레임 스키마 — 파싱 시점에 적용, 캐시 CSV 재로드 시 같은 dtype 으로 복원
+MATCH_SCHEMA = {
+    'home': 'category', 'away': 'category',
+    'h_goals': 'int8', 'a_goals': 'int8', 'result': 'int8',
+    'h_shots': 'float32', 'a_shots': 'float32', 'h_sot': 'float32', 'a_sot': 'float32',
+    'b365_h': 'float32', 'b365_d': 'float32', 'b365_a': 'float32',
+    'league': 'category', 'season': 'category',
+    'date': 'datetime64[ns]',
+}
+MATCH_COLUMNS = list(MATCH_SCHEMA)
+
+# 💱 [V11.3] 전체 배당 컬럼 — 매치 캐시 옆 float32 사이드카(<cache>.odds.npy)에 저장, read_match_cache(odds=True) 로만 로드 (결측 = NaN)
+ODDS_BOOKS = {'b365': 'B365', 'bw': 'BW', 'iw': 'IW', 'ps': 'PS', 'wh': 'WH', 'vc': 'VC', 'max': 'Max', 'avg': 'Avg'}
+OU_BOOKS = {'b365': 'B365', 'ps': 'P', 'max': 'Max', 'avg': 'Avg'}
+_LEGACY_ODDS_PREFIX = {'max': 'BbMx', 'avg': 'BbAv'}  # 2019년 이전 시즌의 시장 최고/평균 (BetBrain)
+
+
+def _odds_sources():
+    """캐시 컬럼 → football-data 원본 컬럼 후보 (앞쪽 우선) — b365_h/d/a 는 기본 스키마에 이미 있음"""
+    sources = {}
+    markets = [(ODDS_BOOKS, (('h', 'H'), ('d', 'D'), ('a', 'A'))), (OU_BOOKS, (('o25', '>2.5'), ('u25', '<2.5')))]
+    for books, sides in markets:
+        for book, src in books.items():
+            legacy = _LEGACY_ODDS_PREFIX.get(book)
+            for side, code in sides:
+                sources[f"{book}_{side}"] = [f"{src}{code}"] + ([f"{legacy}{code}"] if legacy else [])
+                sources[f"{book}c_{side}"] = [f"{src}C{code}"]
+    for col in ('b365_h', 'b365_d', 'b365_a'):
+        del sources[col]
+    return sources
+
+
+ODDS_SOURCES = _odds_sources()
+ODDS_COLUMNS = list(ODDS_SOURCES)
+ODDS_SCHEMA = {c: 'float32' for c in ODDS_COLUMNS}
+STORE_COLUMNS = MATCH_COLUMNS + ODDS_COLUMNS  # 수집 행(parse_fdata_rows(with_odds=True)) 컬럼
+
+
+def _parse_fdata_dates(col):
+    """football-data Date 컬럼 (dd/mm/yyyy, 2017년 이전 시즌은 dd/mm/yy) → datetime (파싱 불가 → NaT)"""
+    text = col.astype(str).str.strip()
+    dates = pd.to_datetime(text, format="%d/%m/%Y", errors='coerce')
+    short = dates.isna()
+    if short.any():
+        dates[short] = pd.to_datetime(text[short], format="%d/%m/%y", errors='coerce')
+    return dates
+
+
+def apply_match_schema(df):
     """
-    football-data.co.uk에서 실제 5대 리그 × 5시즌 경기 데이터를 수집합니다.
-    캐시 파일이 있으면 재사용, 없으면 HTTP 요청으로 수집.
-    
-    Returns: pd.DataFrame with columns:
-        home, away, h_goals, a_goals, result (0=away win, 1=draw, 2=home win),
-        h_shots, a_shots, h_sot, a_sot, b365_h, b365_d, b365_a, league, season
+    [V11.3] 매치 DataFrame → MATCH_SCHEMA dtype (date 없는 구버전 캐시는 NaT 로 채움, 스키마 외 컬럼은 뒤에 유지)
+    일부 컬럼만 읽은 프레임(read_match_cache(columns=...))은 있는 스키마 컬럼만 변환
     """
-    cache_path = "real_match_data_cache.csv"
-    
-    if use_cache and os.path.exists(cache_path):
-        df = pd.read_csv(cache_path)
-        logging.info(f"📦 캐시에서 {len(df)}경기 로드 완료")
-        return df
-    
-    all_rows = []
+    if 'date' not in df:
+        df = df.assign(date=pd.NaT)
+    out = df.astype({c: t for c, t in {**MATCH_SCHEMA, **ODDS_SCHEMA}.items()
+                     if c not in ('season', 'date') and c in df})
+    if 'season' in df:
+        out['season'] = df['season'].astype(str).astype('category')
+    out['date'] = pd.to_datetime(df['date'], errors='coerce').astype(MATCH_SCHEMA['date'])
+    return out[[c for c in MATCH_COLUMNS if c in out] + [c for c in df.columns if c not in MATCH_SCHEMA]]
+
+
+def match_frame(rows, columns=MATCH_COLUMNS):
+    """[V11.3] parse_fdata_rows 행 리스트 → MATCH_SCHEMA DataFrame (columns=STORE_COLUMNS 면 배당 컬럼 포함)"""
+    return apply_match_schema(pd.DataFrame(rows, columns=columns))
+
+
+def match_odds_path(cache_path=MATCH_CACHE_PATH):
+    """[V11.3] 배당 사이드카 — 매치 캐시와 같은 행 순서의 (N, len(ODDS_COLUMNS)) float32 .npy"""
+    return f"{cache_path}.odds.npy"
+
+
+def _load_odds_sidecar(cache_path):
+    path = match_odds_path(cache_path)
+    if os.path.exists(path):
+        odds = np.load(path, mmap_mode='r')
+        if odds.ndim == 2 and odds.shape[1] == len(ODDS_COLUMNS):
+            return odds
+    logging.warning("⚠️ 배당 사이드카 없음/형식 불일치 → 배당 컬럼 NaN (캐시 재수집 시 생성)")
+    return None
+
+
+def _attach_odds(df, odds, start):
+    """df 행(캐시 start 번째부터)에 사이드카 배당 컬럼을 붙임 — 사이드카가 없거나 짧으면 NaN"""
+    block = odds[start:start + len(df)] if odds is not None else None
+    if block is None or len(block) != len(df):
+        block = np.full((len(df), len(ODDS_COLUMNS)), np.nan, dtype=np.float32)
+    return pd.concat([df, pd.DataFrame(np.asarray(block), columns=ODDS_COLUMNS, index=df.index)], axis=1)
+
+
+def _iter_cache_chunks(reader, odds):
+    start = 0
+    for chunk in reader:
+        chunk = apply_match_schema(chunk)
+        if odds is not False:
+            chunk = _attach_odds(chunk, odds, start)
+        start += len(chunk)
+        yield chunk
+
+
+def read_match_cache(path=MATCH_CACHE_PATH, chunksize=None, odds=False, columns=None):
+    """
+    [V11.3] 매치 캐시 CSV 를 MATCH_SCHEMA 로 읽기 (문자열 재파싱 없이 read_csv 단계에서 dtype 지정)
+    chunksize 지정 시 DataFrame 청크 반복자
+    odds=True 면 배당 사이드카(memmap)에서 ODDS_COLUMNS 를 붙임 — 청크 모드는 청크 행만큼만 메모리에 올림
+    columns 지정 시 그 컬럼(+ date)만 파싱 (예: 프랙탈 테이블은 팀 / 득점 / 날짜만)
+    """
+    header = set(pd.read_csv(path, nrows=0).columns)
+    if columns is not None:
+        header &= set(columns) | {'date'}
+    dtype = {c: (str if c == 'season' else t) for c, t in MATCH_SCHEMA.items() if c != 'date' and c in header}
+    kwargs = {'dtype': dtype, 'parse_dates': ['date'] if 'date' in header else False}
+    if columns is not None:
+        kwargs['usecols'] = sorted(header)
+    sidecar = _load_odds_sidecar(path) if odds else False
+    if chunksize is None:
+        df = apply_match_schema(pd.read_csv(path, **kwargs))
+        return _attach_odds(df, sidecar, 0) if odds else df
+    return _iter_cache_chunks(pd.read_csv(path, chunksize=chunksize, **kwargs), sidecar)
+
+
+def _extract_fdata_odds(df_raw):
+    """[V11.3] 원본 CSV 의 배당 컬럼 → 행별 ODDS_COLUMNS 값 리스트 (컬럼 단위 변환, 없거나 1.0 이하인 배당은 NaN)"""
+    values = []
+    for col in ODDS_COLUMNS:
+        src = next((s for s in ODDS_SOURCES[col] if s in df_raw), None)
+        if src is None:
+            values.append(np.full(len(df_raw), np.nan, dtype=np.float32))
+            continue
+        v = pd.to_numeric(df_raw[src], errors='coerce').to_numpy(dtype=np.float32)
+        values.append(np.where(v > 1.0, v, np.float32(np.nan)))
+    return np.column_stack(values).tolist() if len(df_raw) else []
+
+
+def parse_fdata_rows(df_raw, league_name, season, with_odds=False):
+    """
+    [V11.3] football-data.co.uk 시즌 CSV(DataFrame) → 엔진 매치 행 dict 리스트 (파싱 불가 행은 건너뜀, match_frame() 으로 스키마 적용)
+    with_odds=True 면 행마다 ODDS_COLUMNS 도 포함 (match_frame(rows, STORE_COLUMNS) 로 캐시 기록)
+    """
+    rows = []
+    dates = _parse_fdata_dates(df_raw['Date']).tolist() if 'Date' in df_raw else [pd.NaT] * len(df_raw)
+    odds = _extract_fdata_odds(df_raw) if with_odds else None
+    for i, (_, row) in enumerate(df_raw.iterrows()):
+        try:
+            home = _normalize_fdata_team(str(row['HomeTeam']).strip())
+            away = _normalize_fdata_team(str(row['AwayTeam']).strip())
+            h_goals = int(row['FTHG'])
+            a_goals = int(row['FTAG'])
+            ftr = str(row['FTR']).strip()
+            
+            if ftr == 'H': result = 2
+            elif ftr == 'D': result = 1
+            else: result = 0
+            
+            # 선택적 컬럼
+            h_shots = float(row.get('HS', 0) or 0)
+            a_shots = float(row.get('AS', 0) or 0)
+            h_sot = float(row.get('HST', 0) or 0)
+            a_sot = float(row.get('AST', 0) or 0)
+            b365_h = float(row.get('B365H', 0) or 0)
+            b365_d = float(row.get('B365D', 0) or 0)
+            b365_a = float(row.get('B365A', 0) or 0)
+            
+            rows.append({
+                'home': home, 'away': away,
+                'h_goals': h_goals, 'a_goals': a_goals,
+                'result': result,
+                'h_shots': h_shots, 'a_shots': a_shots,
+                'h_sot': h_sot, 'a_sot': a_sot,
+                'b365_h': b365_h, 'b365_d': b365_d, 'b365_a': b365_a,
+                'league': league_name, 'season': season,
+                'date': dates[i],
+            })
+            if odds is not None:
+                rows[-1].update(zip(ODDS_COLUMNS, odds[i]))
+        except:
+            continue
+    return rows
+
+
+def iter_fdata_seasons(leagues=None, seasons=None, base_url=None, with_odds=False):
+    """
+    [V11.3] 리그 × 시즌 CSV 를 하나씩 수집/파싱해 (league_name, season, rows) 로 흘려보냄
+    한 번에 한 시즌 CSV 만 메모리에 유지 (전체 디비전 × 전체 시즌 수집용)
+    """
+    import requests  # [V11.3] 캐시 미스(원격 수집) 시에만 import
+    from io import StringIO
+    leagues = configured_leagues() if leagues is None else leagues
+    seasons = configured_seasons() if seasons is None else seasons
+    base_url = base_url or fdata_base_url()
     
-    for league_name, league_code in LEAGUE_URLS.items():
-        for season in SEASONS:
-            url = f"https://www.football-data.co.uk/mmz4281/{season}/{league_code}.csv"
+    for league_name, league_code in leagues.items():
+        for season in seasons:
+            url = f"{base_url}/mmz4281/{season}/{league_code}.csv"
             try:
                 ts = int(datetime.now().timestamp() * 1000)
-                resp = requests.get(f"{url}?t={ts}", timeout=10)
+                with span("http_fetch", source="football-data") as s:
+                    resp = requests.get(f"{url}?t={ts}", timeout=10)
+                    s.add(nbytes=len(resp.content))
                 if resp.status_code != 200:
                     continue
                 
                 # CSV 파싱 (인코딩 이슈 대응)
-                from io import StringIO
                 raw_text = resp.content.decode('utf-8', errors='replace')
-                df_raw = pd.read_csv(StringIO(raw_text), on_bad_lines='skip')
+                with span("csv_parse", source="football-data") as s:
+                    df_raw = pd.read_csv(StringIO(raw_text), on_bad_lines='skip')
+                    s.add(rows=len(df_raw), nbytes=len(resp.content))
                 
                 required_cols = ['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR']
                 if not all(c in df_raw.columns for c in required_cols):
                     continue
                 
-                for _, row in df_raw.iterrows():
-                    try:
-                        home = _normalize_fdata_team(str(row['HomeTeam']).strip())
-                        away = _normalize_fdata_team(str(row['AwayTeam']).strip())
-                        h_goals = int(row['FTHG'])
-                        a_goals = int(row['FTAG'])
-                        ftr = str(row['FTR']).strip()
-                        
-                        if ftr == 'H': result = 2
-                        elif ftr == 'D': result = 1
-                        else: result = 0
-                        
-                        # 선택적 컬럼
-                        h_shots = float(row.get('HS', 0) or 0)
-                        a_shots = float(row.get('AS', 0) or 0)
-                        h_sot = float(row.get('HST', 0) or 0)
-                        a_sot = float(row.get('AST', 0) or 0)
-                        b365_h = float(row.get('B365H', 0) or 0)
-                        b365_d = float(row.get('B365D', 0) or 0)
-                        b365_a = float(row.get('B365A', 0) or 0)
-                        
-                        all_rows.append({
-                            'home': home, 'away': away,
-                            'h_goals': h_goals, 'a_goals': a_goals,
-                            'result': result,
-                            'h_shots': h_shots, 'a_shots': a_shots,
-                            'h_sot': h_sot, 'a_sot': a_sot,
-                            'b365_h': b365_h, 'b365_d': b365_d, 'b365_a': b365_a,
-                            'league': league_name, 'season': season
-                        })
-                    except:
-                        continue
-                        
+                rows = parse_fdata_rows(df_raw, league_name, season, with_odds)
                 logging.info(f"✅ {league_name}/{season}: {len(df_raw)}경기 수집")
+                yield league_name, season, rows
             except Exception as e:
                 logging.warning(f"⚠️ {league_name}/{season} 수집 실패: {e}")
+
+
+def _cache_meta_path(cache_path):
+    return f"{cache_path}.meta.json"
+
+
+def _cache_config(leagues, seasons):
+    return {'leagues': dict(leagues), 'seasons': list(seasons), 'odds': ODDS_COLUMNS, 'order': CACHE_ORDER}
+
+
+def match_cache_is_current(cache_path=MATCH_CACHE_PATH, leagues=None, seasons=None):
+    """[V11.3] 매치 캐시가 현재 리그/시즌 설정으로 만들어졌는지 (메타 없는 구버전 캐시는 기본 설정일 때만 인정)"""
+    if not os.path.exists(cache_path):
+        return False
+    leagues = configured_leagues() if leagues is None else leagues
+    seasons = configured_seasons() if seasons is None else seasons
+    config = _cache_config(leagues, seasons)
+    try:
+        with open(_cache_meta_path(cache_path), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return {k: meta.get(k) for k in config} == config
+    except FileNotFoundError:
+        # 메타 없는 구버전 = 5대 리그 (리그 간 이동 팀이 없어 리그 × 시즌 순도 팀별로는 시간순)
+        return config == _cache_config(LEAGUE_URLS, SEASONS)
+    except:
+        return False
+
+
+def _date_key(row):
+    date = row['date']
+    return (True, 0) if pd.isna(date) else (False, date)
+
+
+def iter_chronological_batches(leagues, seasons, base_url=None):
+    """
+    [V11.3] 시즌별로 모든 리그의 행을 모아 날짜순(안정 정렬, 날짜 없는 행은 시즌 끝)으로 흘려보냄
+    리그 × 시즌 순으로 쓰면 디비전 간 승강 팀의 경기가 캐시에서 시간 역순이 됨 → ELO 재생 / as-of 이력이 미래 결과를 봄
+    메모리는 한 시즌(전 리그)분
+    """
+    for season in seasons:
+        rows = [row for _, _, batch in iter_fdata_seasons(leagues, [season], base_url, with_odds=True) for row in batch]
+        rows.sort(key=_date_key)
+        yield rows
+
+
+def write_match_cache(row_batches, cache_path=MATCH_CACHE_PATH):
+    """
+    [V11.3] 행 묶음 반복자(parse_fdata_rows(with_odds=True) 결과) → 매치 캐시 CSV + 배당 사이드카
+    두 파일 모두 임시 파일에 이어 쓴 뒤 os.replace 로 교체. Returns: 기록한 경기 수 (0 이면 기존 캐시 유지)
+    """
+    tmp_path = f"{cache_path}.tmp"
+    odds_part = f"{match_odds_path(cache_path)}.part"
+    total = 0
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f, open(odds_part, 'wb') as fo:
+        for rows in row_batches:
+            if rows:
+                frame = match_frame(rows, STORE_COLUMNS)
+                frame[MATCH_COLUMNS].to_csv(f, header=(total == 0), index=False, date_format="%Y-%m-%d")
+                fo.write(np.ascontiguousarray(frame[ODDS_COLUMNS].to_numpy(dtype=np.float32)).tobytes())
+                total += len(rows)
     
-    if not all_rows:
-        logging.error("❌ 실제 데이터 수집 실패. 백업 모드 사용.")
-        return pd.DataFrame()
+    if total == 0:
+        os.remove(tmp_path)
+        os.remove(odds_part)
+        return 0
+    finalize_f32_matrix(odds_part, match_odds_path(cache_path), total, len(ODDS_COLUMNS))
+    os.replace(tmp_path, cache_path)
+    return total
+
+
+def ingest_match_cache(leagues=None, seasons=None, base_url=None, cache_path=MATCH_CACHE_PATH):
+    """
+    [V11.3] 리그 × 시즌 단위로 수집하며 매치 캐시 CSV 에 바로 이어 씀 (전체 DataFrame 을 만들지 않음)
+    임시 파일에 기록 후 os.replace 로 교체 + 설정 메타(<cache>.meta.json) 기록
+    Returns: 수집된 경기 수 (0 이면 캐시를 건드리지 않음)
+    """
+    leagues = configured_leagues() if leagues is None else leagues
+    seasons = configured_seasons() if seasons is None else seasons
+    total = write_match_cache(iter_chronological_batches(leagues, seasons, base_url), cache_path)
+    if total == 0:
+        return 0
+    with open(_cache_meta_path(cache_path), 'w', encoding='utf-8') as f:
+        json.dump({**_cache_config(leagues, seasons), 'rows': total,
+                   'created_at': datetime.now().isoformat()}, f, ensure_ascii=False)
+    logging.info(f"✅ 총 {total}경기 수집 → 캐시 저장 완료")
+    return total
+
+
+def ensure_match_cache(use_cache=True, base_url=None, cache_path=MATCH_CACHE_PATH):
+    """[V11.3] 현재 설정의 매치 캐시를 보장 — 없거나 설정이 바뀌었으면 재수집. Returns: 캐시 사용 가능 여부"""
+    if use_cache and match_cache_is_current(cache_path):
+        return True
+    if ingest_match_cache(base_url=base_url, cache_path=cache_path) > 0:
+        return True
+    if use_cache and os.path.exists(cache_path):
+        logging.warning("⚠️ 재수집 실패 → 설정/스키마가 이전인 기존 매치 캐시 사용")
+        return True
+    logging.error("❌ 실제 데이터 수집 실패. 백업 모드 사용.")
+    return False
+
+
+def iter_match_chunks(chunk_rows=MATCH_CHUNK_ROWS, use_cache=True, base_url=None, cache_path=MATCH_CACHE_PATH,
+                      odds=False, columns=None):
+    """
+    [V11.3] 매치 캐시를 chunk_rows 행씩 시간순(캐시 순서)으로 읽어 DataFrame 청크를 흘려보냄 — 메모리는 청크 크기에 비례
+    columns: 필요한 컬럼만 읽기 (read_match_cache 참고)
+    """
+    if not ensure_match_cache(use_cache, base_url, cache_path):
+        return
+    reader = read_match_cache(cache_path, chunksize=chunk_rows, odds=odds, columns=columns)
+    while True:
+        with span("csv_parse", source="cache") as s:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                break
+            s.add(rows=len(chunk))
+        yield chunk
+
+
+def fetch_real_match_data(use_cache=True, base_url=None):
+    """
+    football-data.co.uk에서 설정된 리그 × 시즌 경기 데이터를 수집합니다 (기본: 5대 리그 × 5시즌).
+    캐시 파일이 있으면 재사용, 없으면 HTTP 요청으로 수집.
+    [V11.3] 대용량(전체 디비전 × 전체 시즌)은 iter_match_chunks() 로 청크 단위 처리
+    [V11.3] 전체 북메이커 배당은 사이드카에 — read_match_cache(odds=True) / odds_devig.py
+    
+    Returns: pd.DataFrame with columns (dtype 은 MATCH_SCHEMA):
+        home, away, h_goals, a_goals, result (0=away win, 1=draw, 2=home win),
+        h_shots, a_shots, h_sot, a_sot, b365_h, b365_d, b365_a, league, season, date
+    """
+    cache_path = MATCH_CACHE_PATH
     
-    df = pd.DataFrame(all_rows)
-    df.to_csv(cache_path, index=False)
-    logging.info(f"✅ 총 {len(df)}경기 수집 → 캐시 저장 완료")
-    return df
+    if use_cache and match_cache_is_current(cache_path):
+        with span("csv_parse", source="cache") as s:
+            df = read_match_cache(cache_path)
+            s.add(rows=len(df), nbytes=os.path.getsize(cache_path))
+        logging.info(f"📦 캐시에서 {len(df)}경기 로드 완료")
+        return df
+    
+    if not ensure_match_cache(use_cache=use_cache, base_url=base_url, cache_path=cache_path):
+        return pd.DataFrame()
+    return read_match_cache(cache_path)
 
 
 # ==============================================================================
 # 2. ELO 레이팅 시스템 (TRUTH_MAP / TEAM_TIERS 완전 대체)
 # ==============================================================================
 
+NAT_DAY = -(1 << 63)              # 날짜 없음 (NaT 를 int64 로 본 값, 파이썬 int — 재생 루프 비교 비용 최소화)
+_DAY_BIAS = 1 << 31               # 검색 키 = (팀 코드 << 32) | (epoch 일 수 + 2^31)
+_EPOCH = pd.Timestamp(0)
+
+
+def _to_days(dates):
+    """[V11.3] 날짜 시퀀스(문자열 / datetime / datetime64) → epoch 기준 일 수 int64 배열 (NaT → NAT_DAY)"""
+    values = dates.to_numpy() if isinstance(dates, pd.Series) else np.asarray(dates)
+    if values.dtype.kind != 'M':                # 매치 프레임 date 컬럼(datetime64)은 파싱 없이 바로 변환
+        d = pd.to_datetime(pd.Series(values), errors='coerce')
+        if getattr(d.dt, 'tz', None) is not None:
+            d = d.dt.tz_localize(None)
+        values = d.to_numpy()
+    return values.astype('datetime64[D]').astype(np.int64)
+
+
+def _to_day(date):
+    """스칼라 버전 — 정수는 이미 epoch 일 수로 간주"""
+    if type(date) is int:
+        return date
+    if isinstance(date, np.integer):
+        return int(date)
+    ts = pd.Timestamp(date) if date is not None else pd.NaT
+    return NAT_DAY if pd.isna(ts) else (ts.tz_localize(None) - _EPOCH).days if ts.tz else (ts - _EPOCH).days
+
+
+class EloHistory:
+    """
+    [V11.3] 팀별 ELO 시계열 — 재생 중 (경기 인덱스, 날짜, 경기 후 레이팅)을 평행 배열로 기록
+    - 재생 루프에서는 경기당 튜플 1개만 append → HISTORY_FLUSH_ROWS 마다 타입 배열 청크(int32 / float64)로 압축
+    - 첫 조회 때 (팀, 날짜, 경기 인덱스) 순 CSR 로 한 번 정렬 (이후 기록이 생기면 다음 조회 때 재정렬)
+    - as-of = 팀 구간 이진 탐색 → 그 날짜 이전 마지막 경기 후 레이팅 (그 전 기록이 없으면 기록 시작 직전 레이팅)
+    - 날짜 없는 경기(NaT)는 경기 인덱스만 소비하고 기록하지 않음
+    """
+    FLUSH_ROWS = 65536
+
+    def __init__(self):
+        self.codes = {}                 # 팀 → 코드 (등장 순)
+        self.start = []                 # 코드별 첫 기록 직전 레이팅
+        self.n_matches = 0
+        self._buf = []                  # (홈 코드, 원정 코드, 일 수, 경기 인덱스, 홈 레이팅, 원정 레이팅)
+        self._chunks = []               # 압축된 (codes int32 (n,2), day int32, idx int32, rating float64 (n,2))
+        self._index = None              # 정렬된 CSR 캐시 — 피클 제외, 기록 시 무효화
+
+    def __getstate__(self):
+        self._compact()
+        state = self.__dict__.copy()
+        state['_index'] = None
+        return state
+
+    def __len__(self):
+        return sum(len(c[1]) for c in self._chunks) + len(self._buf)
+
+    def _new_code(self, team, before):
+        code = self.codes[team] = len(self.start)
+        self.start.append(before)
+        return code
+
+    def record(self, home, away, day, h_before, a_before, h_after, a_after):
+        """경기 1개 기록 (재생 루프 안 — dict 조회 2번 + append 1번)"""
+        idx = self.n_matches
+        self.n_matches = idx + 1
+        if day == NAT_DAY:
+            return
+        codes = self.codes
+        h_code = codes.get(home)
+        if h_code is None:
+            h_code = self._new_code(home, h_before)
+        a_code = codes.get(away)
+        if a_code is None:
+            a_code = self._new_code(away, a_before)
+        self._buf.append((h_code, a_code, day, idx, h_after, a_after))
+        self._index = None
+        if len(self._buf) >= self.FLUSH_ROWS:
+            self._compact()
+
+    def last_day(self):
+        """기록된 마지막 경기 날짜 (epoch 일 수, 기록 없으면 NAT_DAY)"""
+        self._compact()
+        return int(self._chunks[0][1].max()) if self._chunks and len(self._chunks[0][1]) else NAT_DAY
+
+    def _compact(self):
+        if self._buf:
+            rows = np.array(self._buf, dtype=np.float64)
+            self._chunks.append((rows[:, :2].astype(np.int32), rows[:, 2].astype(np.int32),
+                                 rows[:, 3].astype(np.int32), rows[:, 4:].copy()))
+            self._buf = []
+        if len(self._chunks) > 1:
+            self._chunks = [tuple(np.concatenate(parts) for parts in zip(*self._chunks))]
+
+    def _build(self):
+        if self._index is None:
+            self._compact()
+            n_teams = len(self.start)
+            if self._chunks:
+                codes, day, idx, rating = self._chunks[0]
+            else:
+                codes, day, idx, rating = (np.empty((0, 2), np.int32), np.empty(0, np.int32),
+                                           np.empty(0, np.int32), np.empty((0, 2)))
+            team = codes.T.ravel().astype(np.int64)                 # 홈 전체 → 원정 전체
+            day = np.concatenate([day, day]).astype(np.int64)
+            idx = np.concatenate([idx, idx])
+            order = np.lexsort((idx, day, team))
+            team, day = team[order], day[order]
+            self._index = {
+                'offsets': np.searchsorted(team, np.arange(n_teams + 1)),
+                'key': (team << 32) | (day + _DAY_BIAS),
+                'day': day.astype(np.int32), 'idx': idx[order], 'rating': rating.T.ravel()[order],
+                'start': np.asarray(self.start, dtype=np.float64),
+            }
+        return self._index
+
+    def series(self, team):
+        """팀 시계열 (경기 인덱스 int32, 날짜 datetime64[D], 경기 후 레이팅 float64) — 날짜순"""
+        ix = self._build()
+        code = self.codes.get(team)
+        lo, hi = (ix['offsets'][code], ix['offsets'][code + 1]) if code is not None else (0, 0)
+        return ix['idx'][lo:hi], ix['day'][lo:hi].astype('datetime64[D]'), ix['rating'][lo:hi]
+
+    def asof_one(self, code, day, inclusive=False):
+        """asof 스칼라 버전 (코드는 기록된 팀, day 는 NaT 아님)"""
+        ix = self._build()
+        pos = int(ix['key'].searchsorted((code << 32) | (day + _DAY_BIAS), 'right' if inclusive else 'left')) - 1
+        return float(ix['rating'][pos]) if pos >= ix['offsets'][code] else self.start[code]
+
+    def asof(self, codes, days, inclusive=False):
+        """
+        코드 배열(-1 = 기록 없는 팀) × epoch 일 수 배열 → 레이팅 float64 (기록 없는 팀 / NaT 날짜는 NaN)
+        inclusive=False 면 그 날짜 경기 전 (누수 없는 피처용), True 면 그 날짜 경기 후
+        """
+        ix = self._build()
+        codes = np.asarray(codes, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        ok = (codes >= 0) & (days != NAT_DAY)
+        if not len(ix['start']):
+            return np.full(len(codes), np.nan)
+        c = np.where(ok, codes, 0)
+        q = (c << 32) | (np.where(ok, days, 0) + _DAY_BIAS)
+        pos = np.searchsorted(ix['key'], q, side='right' if inclusive else 'left') - 1
+        found = pos >= ix['offsets'][c]
+        rating = ix['rating'][np.maximum(pos, 0)] if len(ix['rating']) else 0.0
+        return np.where(ok, np.where(found, rating, ix['start'][c]), np.nan)
+
+
 class EloRatingSystem:
     """
     경기 결과에 따라 팀 실력을 자동으로 업데이트하는 ELO 레이팅.
     - 초기값 1500, K-factor 32
     - 홈 어드밴티지 보정 +65
     - R2 클라우드 영구 보존
+    - [V11.3] K / 홈 어드밴티지 / 무승부 기준값은 생성자 인자로 조정 (elo_tuner.py 로 그리드 탐색)
+    - [V11.3] load=False 면 저장된 레이팅을 읽지 않고 초기값에서 시작 (전체 재생용 — 재학습마다 같은 결과)
     """
     
     DEFAULT_ELO = 1500
     HOME_ADVANTAGE = 65  # ELO 포인트 (약 55% 홈승 기대)
+    DRAW_BASE = 0.28     # 동급(기대 승점 0.5) 매치업의 무승부 확률
+    version = 0  # 🧾 [V11.3] update() 마다 증가 — 슬레이트 예측 캐시 키 (구버전 피클은 클래스 기본값 사용)
+    history = None  # 🕰️ [V11.3] EloHistory — 날짜가 있는 update() 를 기록 (구버전 피클은 첫 기록 때 생성)
+    _base = None  # 🔒 [V11.3] 마지막 저장 이후 바뀐 팀 → 바뀌기 전 레이팅 (save 가 디스크 값에 변경분만 재적용)
     
-    def __init__(self, k_factor=32):
+    def __init__(self, k_factor=32, home_advantage=None, draw_base=None, load=True):
         self.k = k_factor
+        if home_advantage is not None:
+            self.HOME_ADVANTAGE = home_advantage
+        if draw_base is not None:
+            self.DRAW_BASE = draw_base
         self.ratings = {}
-        self._load()
+        self.history = EloHistory()
+        if load:
+            self._load()
     
     def _get_r2_client(self):
         r2_acc = os.getenv("R2_ACCESS_KEY_ID")
         r2_sec = os.getenv("R2_SECRET_ACCESS_KEY")
         r2_ep = os.getenv("R2_ENDPOINT_URL")
         if r2_acc and r2_sec:
+            import boto3  # [V11.3] R2 키가 있을 때만 import (콜드 스타트에서 제외)
+            from botocore.config import Config
             r2_config = Config(connect_timeout=3, read_timeout=3, retries={'max_attempts': 1})
             return boto3.client('s3', endpoint_url=r2_ep, aws_access_key_id=r2_acc,
                               aws_secret_access_key=r2_sec, region_name='auto', config=r2_config)
@@ -174,31 +681,35 @@ class EloRatingSystem:
         """R2 → 로컬 순으로 ELO 데이터 로드"""
         local_path = "elo_ratings.json"
         
+        store = state_file(local_path, indent=2)
         s3 = self._get_r2_client()
         if s3:
             try:
-                s3.download_file("soccer-guardian-memory", "elo_ratings.json", local_path)
+                store.flush()   # 🔒 [V11.3] 내 대기 중 저장이 덮이지 않도록 먼저 기록 + 다운로드는 파일 락 안에서
+                with store.lock(), span("r2_io", op="download", key="elo_ratings.json"):
+                    s3.download_file("soccer-guardian-memory", "elo_ratings.json", local_path)
             except:
                 pass
         
-        if os.path.exists(local_path):
-            try:
-                with open(local_path, 'r') as f:
-                    self.ratings = json.load(f)
-                logging.info(f"📊 ELO 로드: {len(self.ratings)}팀")
-            except:
-                self.ratings = {}
+        ratings = store.load()
+        if isinstance(ratings, dict):
+            self.ratings = ratings
+            logging.info(f"📊 ELO 로드: {len(self.ratings)}팀")
     
     def save(self):
-        """로컬 + R2 동시 저장"""
+        """로컬(원자적 기록, 바꾼 팀은 변경분만 디스크 값에 재적용 — 다른 세션의 갱신 보존) + R2 동시 저장"""
         local_path = "elo_ratings.json"
-        with open(local_path, 'w') as f:
-            json.dump(self.ratings, f, indent=2, ensure_ascii=False)
+        base = self._base or {}
+        if not state_file(local_path, indent=2).save(self.ratings, merge=merge_deltas(base), owner=self, wait=True):
+            return
+        self._base = None
         
         s3 = self._get_r2_client()
         if s3:
             try:
-                s3.upload_file(local_path, "soccer-guardian-memory", "elo_ratings.json")
+                with span("r2_io", op="upload", key="elo_ratings.json") as s:
+                    s3.upload_file(local_path, "soccer-guardian-memory", "elo_ratings.json")
+                    s.add(nbytes=os.path.getsize(local_path))
             except:
                 pass
     
@@ -226,15 +737,57 @@ class EloRatingSystem:
         exp_a = 1.0 - exp_h
         
         # 승/무/패 분배 (Dixon-Coles 방식 근사)
-        draw_prob = 0.28 * (1.0 - abs(exp_h - 0.5) * 2)  # 박빙일수록 무승부 확률 높음
+        draw_prob = self.DRAW_BASE * (1.0 - abs(exp_h - 0.5) * 2)  # 박빙일수록 무승부 확률 높음
         h_win = exp_h * (1.0 - draw_prob)
         a_win = exp_a * (1.0 - draw_prob)
         
         total = h_win + draw_prob + a_win + 1e-9
         return h_win/total, draw_prob/total, a_win/total
     
-    def update(self, home, away, result):
-        """경기 결과에 따라 ELO 업데이트. result: 2=홈승, 1=무, 0=원정승"""
+    def expected_score_arrays(self, homes, aways, include_home_adv=True):
+        """[V11.3] expected_score 벡터화 — 팀명 시퀀스 → (n, 3) [홈승, 무, 원정승] 확률 배열 (시즌 시뮬레이션용)"""
+        h_elo = np.array([self.get_elo(t) for t in homes], dtype=np.float64)
+        a_elo = np.array([self.get_elo(t) for t in aways], dtype=np.float64)
+        if include_home_adv:
+            h_elo += self.HOME_ADVANTAGE
+        exp_h = 1.0 / (1.0 + 10 ** ((a_elo - h_elo) / 400.0))
+        draw_prob = self.DRAW_BASE * (1.0 - np.abs(exp_h - 0.5) * 2)
+        h_win = exp_h * (1.0 - draw_prob)
+        a_win = (1.0 - exp_h) * (1.0 - draw_prob)
+        total = h_win + draw_prob + a_win + 1e-9
+        return np.stack([h_win, draw_prob, a_win], axis=1) / total[:, None]
+    
+    def get_elo_asof(self, team, date, inclusive=False):
+        """
+        🕰️ [V11.3] date 시점의 레이팅 (재생 없이 이력 이진 탐색) — 기본은 그 날짜 경기 전 값 (누수 없는 피처용)
+        이력에 없는 팀은 기록 시작 후 레이팅이 바뀐 적 없으므로 현재 값, 날짜가 없으면(NaT) 현재 값
+        """
+        hist = self.history
+        code = hist.codes.get(team) if hist is not None else None
+        day = _to_day(date)
+        if code is None or day == NAT_DAY:
+            return self.get_elo(team)
+        return hist.asof_one(code, day, inclusive)
+
+    def get_elo_asof_batch(self, teams, dates, inclusive=False):
+        """get_elo_asof 배열 버전 — 팀명 시퀀스 × 날짜 시퀀스(또는 epoch 일 수 int 배열) → float64 (n,)"""
+        teams = list(teams)
+        days = (np.asarray(dates, dtype=np.int64) if np.issubdtype(np.asarray(dates).dtype, np.integer)
+                else _to_days(dates))
+        hist = self.history
+        if hist is None or not len(hist):
+            return np.array([self.get_elo(t) for t in teams], dtype=np.float64)
+        out = hist.asof([hist.codes.get(t, -1) for t in teams], days, inclusive)
+        missing = np.flatnonzero(np.isnan(out))
+        for i in missing:
+            out[i] = self.get_elo(teams[i])
+        return out
+
+    def update(self, home, away, result, date=None):
+        """
+        경기 결과에 따라 ELO 업데이트. result: 2=홈승, 1=무, 0=원정승
+        [V11.3] date(날짜 또는 epoch 일 수)를 주면 레이팅 이력(history)에 기록 → get_elo_asof
+        """
         h_elo = self.get_elo(home)
         a_elo = self.get_elo(away)
         
@@ -248,15 +801,35 @@ class EloRatingSystem:
         
         # ELO 업데이트
         delta = self.k * (actual_h - exp_h)
+        base = self._base
+        if base is None:
+            base = self._base = {}
+        base.setdefault(home, h_elo)
+        base.setdefault(away, a_elo)
         self.ratings[home] = h_elo + delta
         self.ratings[away] = a_elo - delta
+        self.version += 1
+        if date is not None:
+            if self.history is None:
+                self.history = EloHistory()
+            self.history.record(home, away, date if type(date) is int else _to_day(date),
+                                h_elo, a_elo, h_elo + delta, a_elo - delta)
     
     def batch_update_from_df(self, df):
         """DataFrame의 모든 경기로 ELO 일괄 업데이트"""
+        return self.batch_update_from_chunks([df])
+    
+    def batch_update_from_chunks(self, chunks):
+        """[V11.3] DataFrame 청크 반복자(예: iter_match_chunks())로 ELO 일괄 업데이트 — 저장은 마지막에 한 번"""
         count = 0
-        for _, row in df.iterrows():
-            self.update(row['home'], row['away'], row['result'])
-            count += 1
+        with span("elo_replay") as s:
+            for df in chunks:
+                days = _to_days(df['date']).tolist() if 'date' in df else [NAT_DAY] * len(df)
+                for home, away, result, day in zip(df['home'].tolist(), df['away'].tolist(), df['result'].tolist(),
+                                                   days):
+                    self.update(home, away, result, day)
+                    count += 1
+            s.add(rows=count)
         self.save()
         logging.info(f"✅ ELO 일괄 업데이트: {count}경기 처리, {len(self.ratings)}팀")
         return count
@@ -266,10 +839,12 @@ class EloRatingSystem:
 # 3. 피처 엔지니어링 (실제 데이터 → ML 입력)
 # ==============================================================================
 
-def build_features_from_real_data(df, elo_system):
+@timed("feature_build", count=lambda out: len(out[1]))
+def build_features_from_real_data(df, elo_system, teams_history=None):
     """
     실제 경기 DataFrame에서 머신러닝 피처를 추출합니다.
     각 경기에 대해 해당 경기 이전 직전 5경기의 평균 통계를 사용.
+    [V11.3] teams_history 를 넘기면 그 dict 를 이어서 갱신 (청크 간 팀 폼 유지, 팀당 최근 FORM_WINDOW 경기만 보관)
     
     Features (16개, V9.5 호환):
         0: home_avg_goals (≈xG 대체)
@@ -290,9 +865,11 @@ def build_features_from_real_data(df, elo_system):
         15: upset_potential (ELO 약체가 이길 확률)
     """
     X, y = [], []
-    teams_history = {}  # {team: deque of recent results}
+    if teams_history is None:
+        teams_history = {}  # {team: deque of recent results}
     
-    for idx, row in df.iterrows():
+    days = _to_days(df['date']).tolist() if 'date' in df else [NAT_DAY] * len(df)  # 🕰️ [V11.3] ELO 이력용
+    for row, day in zip(df.to_dict('records'), days):  # [V11.3] 스키마 dtype → 파이썬 스칼라 (iterrows 행 Series 생성 없음)
         home, away = row['home'], row['away']
         
         # 각 팀의 최근 5경기 히스토리 수집
@@ -301,8 +878,8 @@ def build_features_from_real_data(df, elo_system):
         
         if len(h_hist) >= 3 and len(a_hist) >= 3:
             # 홈팀 최근 통계 (최대 5경기)
-            h_recent = h_hist[-5:]
-            a_recent = a_hist[-5:]
+            h_recent = list(h_hist)
+            a_recent = list(a_hist)
             
             h_avg_goals = np.mean([g['goals_for'] for g in h_recent])
             h_avg_conceded = np.mean([g['goals_against'] for g in h_recent])
@@ -357,7 +934,7 @@ def build_features_from_real_data(df, elo_system):
         else: h_pts, a_pts = 0, 3
         
         if home not in teams_history:
-            teams_history[home] = []
+            teams_history[home] = deque(maxlen=FORM_WINDOW)
         teams_history[home].append({
             'goals_for': h_goals, 'goals_against': a_goals,
             'shots_ratio': h_shots / (h_shots + a_shots),
@@ -365,7 +942,7 @@ def build_features_from_real_data(df, elo_system):
         })
         
         if away not in teams_history:
-            teams_history[away] = []
+            teams_history[away] = deque(maxlen=FORM_WINDOW)
         teams_history[away].append({
             'goals_for': a_goals, 'goals_against': h_goals,
             'shots_ratio': a_shots / (h_shots + a_shots),
@@ -373,15 +950,75 @@ def build_features_from_real_data(df, elo_system):
         })
         
         # ELO 업데이트 (시간순)
-        elo_system.update(home, away, row['result'])
+        elo_system.update(home, away, row['result'], day)
     
     return np.array(X), np.array(y)
 
 
+def build_feature_matrix(chunks, elo_system, path=FEATURE_MATRIX_PATH):
+    """
+    [V11.3] 매치 청크 반복자 → 피처 행렬을 float32 .npy(memmap)로 기록 (메모리는 청크 크기에 비례)
+    팀 히스토리 / ELO 는 청크 경계를 넘어 시간순으로 이어짐 — 결과는 전체 DataFrame 한 번 처리와 동일
+    Returns: (X_mm, y) — X_mm 은 읽기 전용 memmap, y 는 int8 라벨
+    """
+    teams_history = {}
+    labels = []
+    n_rows = 0
+    part_path = f"{path}.part"
+    with open(part_path, 'wb') as f:
+        for chunk in chunks:
+            X, y = build_features_from_real_data(chunk, elo_system, teams_history)
+            if len(X):
+                f.write(np.ascontiguousarray(X, dtype=np.float32).tobytes())
+                labels.append(y.astype(np.int8))
+                n_rows += len(X)
+    
+    y = np.concatenate(labels) if labels else np.empty(0, dtype=np.int8)
+    return finalize_f32_matrix(part_path, path, n_rows, N_FEATURES), y
+
+
+def finalize_f32_matrix(part_path, path, n_rows, n_cols):
+    """
+    [V11.3] 청크 단위로 이어 쓴 원시 float32 파일(part_path) → .npy 로 변환 후 읽기 전용 memmap 반환
+    교체는 os.replace — 이전 memmap 을 잡고 있는 쪽은 옛 파일을 계속 읽음
+    """
+    tmp_path = f"{path}.tmp.npy"
+    X_mm = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(n_rows, n_cols))
+    if n_rows:
+        part = np.memmap(part_path, dtype=np.float32, mode='r', shape=(n_rows, n_cols))
+        for start in range(0, n_rows, MATCH_CHUNK_ROWS):
+            X_mm[start:start + MATCH_CHUNK_ROWS] = part[start:start + MATCH_CHUNK_ROWS]
+        del part
+    X_mm.flush()
+    del X_mm
+    os.replace(tmp_path, path)
+    os.remove(part_path)
+    return np.load(path, mmap_mode='r')
+
+
 # ==============================================================================
 # 4. Brier Score 추적 시스템
 # ==============================================================================
 
+BRIER_STORE = "brier_score_history.json"
+
+
+def merge_brier_history(disk, mine):
+    """
+    🔒 [V11.3] Brier 기록 병합 — (match_id, 기록 시각) 단위, 다른 세션이 추가한 예측은 유지
+    같은 예측이 양쪽에 있으면 결과가 반영된 쪽을 우선 (내 쪽이 미반영이면 디스크 것 유지)
+    """
+    if not isinstance(disk, list):
+        return mine
+    merged = {(p.get('match_id'), p.get('date')): p for p in disk}
+    for p in mine:
+        key = (p.get('match_id'), p.get('date'))
+        old = merged.get(key)
+        if old is None or p.get('actual_result') is not None or old.get('actual_result') is None:
+            merged[key] = p
+    return list(merged.values())
+
+
 class BrierScoreTracker:
     """
     예측 확률과 실제 결과를 비교하여 Brier Score를 계산·저장합니다.
@@ -393,17 +1030,14 @@ class BrierScoreTracker:
         self._load()
     
     def _load(self):
-        local_path = "brier_score_history.json"
-        if os.path.exists(local_path):
-            try:
-                with open(local_path, 'r') as f:
-                    self.predictions = json.load(f)
-            except:
-                self.predictions = []
+        predictions = state_file(BRIER_STORE, indent=2).load()
+        if isinstance(predictions, list):
+            self.predictions = predictions
     
     def save(self):
-        with open("brier_score_history.json", 'w') as f:
-            json.dump(self.predictions, f, indent=2, ensure_ascii=False)
+        if not state_file(BRIER_STORE, indent=2).save(self.predictions, merge=merge_brier_history, owner=self,
+                                                      wait=True):
+            return
         
         # R2 동기화
         try:
@@ -411,14 +1045,18 @@ class BrierScoreTracker:
             r2_sec = os.getenv("R2_SECRET_ACCESS_KEY")
             r2_ep = os.getenv("R2_ENDPOINT_URL")
             if r2_acc and r2_sec:
+                import boto3
                 s3 = boto3.client('s3', endpoint_url=r2_ep,
                     aws_access_key_id=r2_acc, aws_secret_access_key=r2_sec, region_name='auto')
-                s3.upload_file("brier_score_history.json", "soccer-guardian-memory", "brier_score_history.json")
+                with span("r2_io", op="upload", key="brier_score_history.json") as s:
+                    s3.upload_file("brier_score_history.json", "soccer-guardian-memory", "brier_score_history.json")
+                    s.add(nbytes=os.path.getsize("brier_score_history.json"))
         except:
             pass
     
-    def add_prediction(self, match_id, home, away, h_prob, d_prob, a_prob, prediction):
-        """예측 결과를 기록 (경기 전)"""
+    @timed("brier", op="add_prediction")
+    def add_prediction(self, match_id, home, away, h_prob, d_prob, a_prob, prediction, save=True):
+        """예측 결과를 기록 (경기 전) — save=False 면 호출자가 묶음 끝에 save() 1회"""
         self.predictions.append({
             'match_id': match_id,
             'home': home, 'away': away,
@@ -430,10 +1068,12 @@ class BrierScoreTracker:
             'brier_score': None,
             'date': datetime.now().isoformat()
         })
-        self.save()
+        if save:
+            self.save()
     
-    def record_result(self, match_id, actual_result):
-        """실제 결과 기록 + Brier Score 계산"""
+    @timed("brier", op="record_result")
+    def record_result(self, match_id, actual_result, save=True):
+        """실제 결과 기록 + Brier Score 계산 — save=False 면 호출자가 묶음 끝에 save() 1회"""
         for pred in self.predictions:
             if pred['match_id'] == match_id and pred['actual_result'] is None:
                 pred['actual_result'] = actual_result
@@ -446,7 +1086,8 @@ class BrierScoreTracker:
                 brier = sum((p - a) ** 2 for p, a in zip(pred_vec, actual_vec)) / 3.0
                 pred['brier_score'] = round(brier, 4)
                 break
-        self.save()
+        if save:
+            self.save()
     
     def get_average_brier(self, last_n=None):
         """최근 N경기의 평균 Brier Score"""
@@ -486,25 +1127,23 @@ def initialize_v10_engine():
     """
     V10 엔진 초기화: 실제 데이터 수집 → ELO 구축 → XGBoost 학습
     Returns: (X_train, y_train, elo_system, brier_tracker)
+    [V11.3] X_train 은 float32 memmap — 매치 캐시를 MATCH_CHUNK_ROWS 행씩 스트리밍 (전체 디비전 × 전체 시즌 대응)
     """
     logging.info("🚀 [V10] 실제 데이터 기반 학습 엔진 초기화 중...")
     
-    # 1. 실제 데이터 수집
-    df = fetch_real_match_data()
-    
-    if df.empty:
+    # 1. 실제 데이터 수집 (캐시 없거나 리그/시즌 설정이 바뀌었으면 리그 × 시즌 단위로 수집)
+    if not ensure_match_cache():
         logging.error("❌ 데이터 수집 실패")
-        return None, None, EloRatingSystem(), BrierScoreTracker()
+        return None, None, EloRatingSystem(load=False), BrierScoreTracker()
     
     # 2. ELO 시스템 초기화 + 경기 데이터로 ELO 구축
-    elo = EloRatingSystem()
-    
-    if not elo.ratings:
-        logging.info("📊 ELO 초기 구축 중 (과거 데이터 기반)...")
+    # 🔁 [V11.3] 저장된 레이팅 위에 전체 히스토리를 다시 얹지 않도록 초기값에서 재생 (재학습마다 같은 레이팅/피처)
+    elo = EloRatingSystem(load=False)
+    logging.info("📊 ELO 구축 중 (과거 데이터 전체 재생)...")
     
-    # 3. 피처 엔지니어링 (ELO도 시간순으로 업데이트됨)
-    X, y = build_features_from_real_data(df, elo)
-    elo.save()
+    # 3. 피처 엔지니어링 (ELO도 시간순으로 업데이트됨) — 청크 단위
+    # 🧪 [V11.3] 재생 결과는 아티팩트 전용 — 저장하지 않음 (라이브 elo_ratings.json 은 soccer_auto_result.load_live_elo)
+    X, y = build_feature_matrix(iter_match_chunks(), elo)
     
     logging.info(f"✅ [V10] 학습 데이터: {len(X)}경기, ELO: {len(elo.ratings)}팀")
     
@@ -0,0 +1,279 @@
+"""
+🔒 [V11.3] State Store — 공유 상태 JSON(ELO / Brier / 칼만 / 처리 완료 경기 / 슬레이트 예측)의 단일 작성자 영속화
+- 상태 파일마다 프로세스당 작성자 스레드 1개: save() 는 스냅샷을 큐에 넣고 반환, 작성자가 모아서 한 번에 기록 (coalescing)
+- 같은 owner 의 대기 중 스냅샷은 최신 것으로 교체 — 칼만처럼 호출마다 저장하는 경로도 디스크 쓰기는 묶음 단위
+- 기록: 프로세스 간 파일 락(<파일>.lock, flock) 안에서 디스크 최신본을 다시 읽어 merge → 임시 파일 + fsync → os.replace → 디렉터리 fsync
+- merge 정책으로 다른 세션/프로세스가 먼저 쓴 내용을 보존 (replace / merge_dict / merge_deltas / merge_union, 또는 호출 측 함수)
+- 읽기: 깨진 JSON 은 조용히 비우지 않고 <파일>.corrupt 로 옮겨 보존 + 에러 로그 후 기본값
+- SG_STATE_COALESCE_MS: 첫 스냅샷 도착 후 묶음을 모으는 대기 시간 (기본 20ms, 0 이면 즉시)
+  — 반영을 기다리는 호출자(wait=True / flush / load)가 있으면 대기 없이 바로 기록
+
+사용법:
+    from state_store import state_file, merge_dict
+    store = state_file("elo_ratings.json", indent=2)
+    ratings = store.load({})
+    store.save(ratings, merge=merge_dict, owner=self, wait=True)   # 디스크 반영까지 대기 (성공 여부 반환)
+"""
+import os
+import json
+import atexit
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:         # Windows — 프로세스 간 락 없이 원자적 교체만
+    fcntl = None
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+COALESCE_SEC = max(float(os.getenv("SG_STATE_COALESCE_MS", "20")), 0.0) / 1000.0
+FLUSH_TIMEOUT = 10.0        # 프로세스 종료 시 파일당 최대 대기
+_MISSING = object()
+
+
+# ==============================================================================
+# merge 정책 — (디스크 최신본 | None, 내 스냅샷) → 기록할 값
+# ==============================================================================
+
+def replace(disk, mine):
+    """마지막 작성자 우선 (슬레이트 예측처럼 통째로 교체되는 파일)"""
+    return mine
+
+
+def merge_dict(disk, mine):
+    """키 단위 병합 — 내 키는 덮어쓰고, 다른 작성자만 가진 키는 유지"""
+    if not isinstance(disk, dict):
+        return mine
+    return {**disk, **mine}
+
+
+def merge_deltas(base):
+    """
+    수치 dict 의 변경분 재적용 — base: 내가 바꾼 키 → 바꾸기 전 값 (ELO 처럼 여러 작성자가 같은 팀을 갱신)
+    바꾼 키는 디스크 값 + (내 값 - base), 나머지 키는 디스크 우선 (디스크에 없으면 내 값)
+    """
+    def merge(disk, mine):
+        if not isinstance(disk, dict):
+            disk = {}
+        out = {**mine, **disk}
+        for key, before in base.items():
+            if key in mine:
+                out[key] = disk.get(key, before) + (mine[key] - before)
+        return out
+    return merge
+
+
+def merge_union(disk, mine):
+    """리스트 합집합 (처음 등장 순서 유지) — 처리 완료 match_id 목록용"""
+    if not isinstance(disk, list):
+        return list(mine)
+    seen = dict.fromkeys(disk)
+    seen.update(dict.fromkeys(mine))
+    return list(seen)
+
+
+def _fsync_dir(path):
+    """rename 자체를 디스크에 반영 (디렉터리 fsync 미지원 플랫폼은 건너뜀)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StateFile:
+    """상태 파일 하나의 프로세스 내 단일 작성자 — state_file(path) 로 얻음"""
+
+    def __init__(self, path, indent=None):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.indent = indent
+        self._cond = threading.Condition()
+        self._pending = {}                  # id(owner) → (seq, 스냅샷 JSON, merge, owner) — 삽입 순 = 적용 순
+        self._seq = 0                       # 마지막으로 접수한 스냅샷 번호
+        self._done = 0                      # 기록(성공/실패) 처리가 끝난 최대 번호
+        self._outcomes = deque(maxlen=256)  # (묶음 최대 번호, 성공 여부)
+        self._thread = None
+        self._waiters = 0                   # 디스크 반영을 기다리는 호출자 수 (있으면 묶음 대기 생략)
+        self.submits = 0
+        self.writes = 0
+        self.last_error = None
+
+    # ------------------------------------------------------------------ 락
+    @contextmanager
+    def lock(self):
+        """프로세스 간 배타 락 (flock 은 열린 파일 단위라 같은 프로세스의 다른 스레드와도 배타)"""
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)          # close 시 락 해제
+
+    # ------------------------------------------------------------------ 읽기
+    def load(self, default=None):
+        """디스크 최신본 (이 프로세스의 대기 중 저장을 먼저 반영) — 없으면 default, 깨졌으면 보존 후 default"""
+        self.flush()
+        value = self._read()
+        if value is _MISSING:
+            return default
+        return value
+
+    def _read(self, locked=False):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except ValueError as e:
+            return self._quarantine(e, locked)
+
+    def _quarantine(self, error, locked):
+        """깨진 파일 → <파일>.corrupt (락 안에서 다시 확인 — 그 사이 정상본으로 교체됐으면 그것을 사용)"""
+        if not locked:
+            try:
+                with self.lock():
+                    return self._read(locked=True)
+            except OSError:
+                pass
+        try:
+            os.replace(self.path, f"{self.path}.corrupt")
+            logging.error(f"❌ [V11.3] 상태 파일 손상 {self.path}: {error} → {self.path}.corrupt 로 보존")
+        except OSError:
+            logging.error(f"❌ [V11.3] 상태 파일 손상 {self.path}: {error}")
+        return _MISSING
+
+    # ------------------------------------------------------------------ 쓰기
+    def save(self, data, merge=replace, owner=None, wait=False, timeout=None):
+        """
+        스냅샷을 큐에 넣습니다 (직렬화는 호출 스레드에서 — 이후 원본을 바꿔도 안전).
+        owner 가 같은 대기 중 스냅샷은 교체. wait=True 면 디스크 반영까지 대기 후 성공 여부 반환.
+        """
+        text = json.dumps(data, ensure_ascii=False)
+        key = None if owner is None else id(owner)
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            self._pending.pop(key, None)
+            self._pending[key] = (seq, text, merge, owner)   # owner 참조 유지 — 대기 중 id 재사용 방지
+            self.submits += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"state-writer:{os.path.basename(self.path)}",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        if wait:
+            return self.wait(seq, timeout)
+        return None
+
+    def wait(self, seq, timeout=None):
+        with self._cond:
+            self._waiters += 1
+            self._cond.notify_all()           # 묶음 대기 중인 작성자를 깨움
+            try:
+                if not self._cond.wait_for(lambda: self._done >= seq, timeout):
+                    return False
+            finally:
+                self._waiters -= 1
+            return next((ok for last, ok in self._outcomes if last >= seq), True)
+
+    def flush(self, timeout=None):
+        """지금까지 접수한 저장이 모두 기록될 때까지 대기"""
+        with self._cond:
+            seq = self._seq
+        return seq == 0 or self.wait(seq, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                if COALESCE_SEC:
+                    # 묶음 대기는 fire-and-forget 저장에만 이득 — 기다리는 호출자가 있으면 즉시 기록
+                    self._cond.wait_for(lambda: self._waiters, COALESCE_SEC)
+                batch = list(self._pending.values())
+                self._pending.clear()
+            ok = self._write(batch)
+            with self._cond:
+                self._done = max(entry[0] for entry in batch)
+                self._outcomes.append((self._done, ok))
+                self._cond.notify_all()
+
+    def _write(self, batch):
+        try:
+            with span("state_write", file=os.path.basename(self.path)) as s, self.lock():
+                state = _MISSING
+                for _, text, merge, _ in batch:
+                    mine = json.loads(text)
+                    if merge is replace:
+                        state = mine
+                        continue
+                    if state is _MISSING:
+                        state = self._read(locked=True)
+                    state = merge(None if state is _MISSING else state, mine)
+                payload = json.dumps(state, indent=self.indent, ensure_ascii=False).encode('utf-8')
+                self._atomic_write(payload)
+                s.add(rows=len(batch), nbytes=len(payload))
+        except Exception as e:
+            if repr(e) != self.last_error:    # 읽기 전용 FS 등 반복 실패는 한 번만 로그
+                logging.warning(f"⚠️ [V11.3] 상태 저장 실패 {self.path}: {e}")
+            self.last_error = repr(e)
+            return False
+        self.writes += 1
+        self.last_error = None
+        return True
+
+    def _atomic_write(self, payload):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        _fsync_dir(os.path.dirname(os.path.abspath(self.path)))
+
+    def stats(self):
+        with self._cond:
+            return {'path': self.path, 'submits': self.submits, 'writes': self.writes,
+                    'pending': len(self._pending), 'last_error': self.last_error}
+
+
+_registry_lock = threading.Lock()
+_registry = {}
+
+
+def state_file(path, indent=None):
+    """경로별 프로세스 단일 StateFile (fork 된 자식은 작성자 스레드가 없으므로 새로 생성)"""
+    key = (os.getpid(), os.path.abspath(path))
+    with _registry_lock:
+        store = _registry.get(key)
+        if store is None:
+            store = _registry[key] = StateFile(path, indent)
+        return store
+
+
+def flush_all(timeout=FLUSH_TIMEOUT):
+    """모든 상태 파일의 대기 중 저장을 기록 (프로세스 종료 시 자동 호출)"""
+    with _registry_lock:
+        stores = [s for (pid, _), s in _registry.items() if pid == os.getpid()]
+    return all([s.flush(timeout) for s in stores])
+
+
+atexit.register(flush_all)
@@ -0,0 +1,217 @@
+"""
+🏷️ [V11.2] Team Names — 팀명 매핑 / 정규화 / 대진표 파싱 (Streamlit 비의존)
+- TEAM_MAPPING: 입력 팀명(한글/약칭) → 내부 영문명 (ELO·스탯·퓨전 테이블 공통 키)
+- app.py 와 predict_cli.py 가 같은 정의를 공유합니다.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+TEAM_MAPPING = {
+    # EPL
+    "맨체스터시티": "Manchester City", "맨시티": "Manchester City", "맨체스C": "Manchester City",
+    "아스널": "Arsenal", "아스날": "Arsenal",
+    "리버풀": "Liverpool",
+    "아스턴빌라": "Aston Villa", "아스톤빌라": "Aston Villa", "A빌라": "Aston Villa",
+    "토트넘": "Tottenham", "홋스퍼": "Tottenham",
+    "첼시": "Chelsea",
+    "뉴캐슬": "Newcastle United", "뉴캐슬U": "Newcastle United",
+    "맨체스터유나이티드": "Manchester Utd", "맨유": "Manchester Utd", "맨체스U": "Manchester Utd",
+    "웨스트햄": "West Ham",
+    "브라이튼": "Brighton", "브라이턴": "Brighton",
+    "본머스": "Bournemouth",
+    "풀럼": "Fulham",
+    "울버햄튼": "Wolverhampton Wanderers", "울버햄프": "Wolverhampton Wanderers", "울버햄프턴": "Wolverhampton Wanderers",
+    "브렌트포드": "Brentford", "브렌트퍼드": "Brentford", "브렌트퍼": "Brentford",
+    "에버턴": "Everton", "에버튼": "Everton",
+    "노팅엄": "Nottingham Forest", "노팅엄포": "Nottingham Forest",
+    "레스터": "Leicester",
+    "리즈": "Leeds", "리즈U": "Leeds", "리즈유나이티드": "Leeds",
+
+    # Serie A
+    "유벤투스": "Juventus",
+    "인자기": "Inter", "인테르": "Inter",
+    "AC밀란": "AC Milan", "A밀란": "AC Milan",
+    "나폴리": "Napoli",
+    "아탈란타": "Atalanta", "아틀란타": "Atalanta",
+    "AS로마": "Roma", "로마": "Roma",
+    "라치오": "Lazio",
+    "피오렌티나": "Fiorentina",
+    "토리노": "Torino",
+    "제노아": "Genoa",
+    "파르마": "Parma",
+    "코모": "Como", "코모1907": "Como",
+    "칼리아리": "Cagliari",
+    "크레모네": "Cremonese", "크레모네세": "Cremonese",
+    
+    "선덜랜드": "Sunderland",
+    "크리스털": "Crystal Palace", "크리스탈": "Crystal Palace",
+
+    # La Liga
+    "레알마드리드": "Real Madrid", "레알": "Real Madrid",
+    "바르셀로나": "Barcelona", "바르사": "Barcelona",
+    "아틀레티코": "Atletico Madrid", "AT마드리드": "Atletico Madrid",
+    "지로나": "Girona", "빌바오": "Athletic Club", "소시에다드": "Real Sociedad",
+
+    # Bundesliga
+    "레버쿠젠": "Bayer Leverkusen", "바이엘": "Bayer Leverkusen",
+    "바이에른뮌헨": "Bayern Munich", "뮌헨": "Bayern Munich",
+    "슈투트가르트": "Stuttgart", "도르트문트": "Borussia Dortmund", "돌문": "Borussia Dortmund",
+    "라이프치히": "RB Leipzig",
+
+    # Ligue 1
+    "PSG": "Paris Saint Germain", "파리생제르망": "Paris Saint Germain", "파리SG": "Paris Saint Germain",
+    "모나코": "Monaco", "브레스투": "Brest", "릴": "Lille", "니스": "Nice",
+
+    # European & Others (Special Upset Targets)
+    "피오렌티나": "Fiorentina", "야기엘로니아": "Jagiellonia", "삼순스포르": "Samsunspor",
+    "스켄디야": "Shkendija", "첼레": "Celje", "드리타": "Drita", "리예카": "Rijeka",
+    "오모니아": "Omonia Nicosia", "페렌츠바로시": "Ferencvaros", "루도고레츠": "Ludogorets",
+    "플젠": "Viktoria Plzen", "파나티나이코스": "Panathinaikos", "츠르베나": "Red Star",
+    "셀틱": "Celtic", "알크마르": "AZ Alkmaar", "로잔": "Lausanne-Sport",
+    "시그마": "Sigma Olomouc", "헹크": "Genk", "자그레브": "Dinamo Zagreb",
+    "셀타데비고": "Celta Vigo", "셀타": "Celta Vigo", "PAOK": "PAOK", "브란": "Brann",
+    "페네르바체": "Fenerbahce", "페네르바흐체": "Fenerbahce", "볼로냐": "Bologna",
+
+    # [V9.7.7] 영문 팀명 직접 매핑 (English Name Failover) - 공백 및 특수문자 무관 매칭
+    "Noah": "Noah", "AZ Alkmaar": "AZ Alkmaar", "Sigma Olomouc": "Sigma Olomouc",
+    "Lausanne-Sport": "Lausanne-Sport", "Dinamo Zagreb": "Dinamo Zagreb",
+    "Genk": "Genk", "Celta Vigo": "Celta Vigo", "Celta de Vigo": "Celta Vigo", "Brann": "Brann",
+    "Fenerbahce": "Fenerbahce", "Fenerbahce": "Fenerbahce", "Nottingham Forest": "Nottingham Forest",
+    "Jagiellonia": "Jagiellonia", "Shkendija": "Shkendija", "Skenndija": "Shkendija", "Samsunspor": "Samsunspor",
+    "Drita": "Drita", "Celje": "Celje", "Omonia Nicosia": "Omonia Nicosia",
+    "Rijeka": "Rijeka", "Ludogorets": "Ludogorets", "Ferencvaros": "Ferencvaros", "Ferencvarosi": "Ferencvaros",
+    "Panathinaikos": "Panathinaikos", "Viktoria Plzen": "Viktoria Plzen",
+    "Lille": "Lille", "FK Zeljeznicar": "FK Zeljeznicar", "Zeljeznicar": "FK Zeljeznicar", "Stuttgart": "Stuttgart",
+    "Bologna": "Bologna", "Fiorentina": "Fiorentina",
+    
+    # [V9.7.8] English Key Failover (Ensuring English names work as keys)
+    "Celtic": "Celtic", "PAOK": "PAOK", "Celta": "Celta Vigo", "RCCelta": "Celta Vigo", 
+    "Stuttgart": "Stuttgart", "Lille": "Lille", "Bologna": "Bologna",
+
+    # [V9.7.11] Global English Failover (Ensuring all major English names work as keys)
+    "Manchester City": "Manchester City", "Arsenal": "Arsenal", "Liverpool": "Liverpool",
+    "Aston Villa": "Aston Villa", "Tottenham": "Tottenham", "Chelsea": "Chelsea",
+    "Newcastle United": "Newcastle United", "Manchester Utd": "Manchester Utd", "Manchester United": "Manchester Utd",
+    "West Ham": "West Ham", "Brighton": "Brighton", "Bournemouth": "Bournemouth",
+    "Fulham": "Fulham", "Wolverhampton": "Wolverhampton Wanderers", "Wolverhampton Wanderers": "Wolverhampton Wanderers",
+    "Brentford": "Brentford", "Everton": "Everton", "Nottingham Forest": "Nottingham Forest", "Leicester": "Leicester",
+    "Juventus": "Juventus", "Napoli": "Napoli", "Inter": "Inter", "Inter Milan": "Inter",
+    "AC Milan": "AC Milan", "Roma": "Roma", "Lazio": "Lazio", "Atalanta": "Atalanta",
+    "Fiorentina": "Fiorentina", "Bologna": "Bologna", "Real Madrid": "Real Madrid",
+    "Barcelona": "Barcelona", "Atletico Madrid": "Atletico Madrid", "Villarreal": "Villarreal",
+    "Bayer Leverkusen": "Bayer Leverkusen", "Bayern Munich": "Bayern Munich", "Borussia Dortmund": "Borussia Dortmund",
+    "RB Leipzig": "RB Leipzig", "Stuttgart": "Stuttgart", "Ajax": "Ajax", "Olympiacos": "Olympiacos",
+    "Benfica": "Benfica", "Sporting CP": "Sporting CP", "Porto": "Porto", "PSV": "PSV", "Feyenoord": "Feyenoord",
+    "Club Brugge": "Club Brugge", "Marseille": "Marseille", "Lille": "Lille",
+    "Monaco": "Monaco", "Paris Saint Germain": "Paris Saint Germain", "Paris Saint-Germain": "Paris Saint Germain",
+    "Union Saint-Gilloise": "Union Saint-Gilloise", "Slavia Prague": "Slavia Prague", "Bodo/Glimt": "Bodo/Glimt",
+    "Celta Vigo": "Celta Vigo", "Eintracht Frankfurt": "Eintracht Frankfurt",
+    "Athletic Club": "Athletic Club", "Athletic Bilbao": "Athletic Club", "Pafos": "Pafos",
+    "Kairat": "Kairat", "Copenhagen": "Copenhagen", "Galatasaray": "Galatasaray", "Qarabag": "Qarabag"
+}
+
+PUBLIC_FAVORITES = ["Manchester City", "Arsenal", "Liverpool", "Juventus", "Inter", "Napoli", "AC Milan", "Atalanta"]
+HIGH_MOTIVATION_TEAMS = ["Nottingham Forest", "Everton", "Cagliari", "Genoa"]
+HEAVY_SCHEDULE_TEAMS = ["Aston Villa", "Tottenham", "Lazio", "Roma", "Atalanta"]
+
+# 📊 [V9.7] 팀 체급 등급 (Team Tiers)
+# 같은 리그 내에서도 '체급' 차이를 수치화하여 전력 우위를 판단합니다.
+TEAM_TIERS = {
+    # Tier 1 (1.0): 월드클래스 (EPL Top, CL 우승후보)
+    "Manchester City": 1.0, "Arsenal": 1.0, "Liverpool": 1.0, "Real Madrid": 1.0, 
+    "Bayern Munich": 1.0, "Paris Saint Germain": 1.0, "Inter": 1.0, "Bayer Leverkusen": 1.0,
+    "Barcelona": 1.0, "Atletico Madrid": 1.0, "Borussia Dortmund": 1.0,
+    
+    # Tier 2 (0.9): 5대 리그 상위권 명문팀
+    "Tottenham": 0.9, "Chelsea": 0.9, "Aston Villa": 0.9, "Newcastle United": 0.9, "Manchester Utd": 0.9,
+    "Juventus": 0.9, "AC Milan": 0.9, "Napoli": 0.9, "Atalanta": 0.9, "Roma": 0.9, "Lazio": 0.9,
+    "Girona": 0.9, "Athletic Club": 0.9, "Real Sociedad": 0.9, "Villarreal": 0.9,
+    "RB Leipzig": 0.9, "Stuttgart": 0.9, "Eintracht Frankfurt": 0.9,
+    "Monaco": 0.9, "Lille": 0.9, "Nice": 0.9, "Brest": 0.9,
+    
+    # Tier 3 (0.75): 중견 및 빅리그 중위권
+    "Porto": 0.75, "Benfica": 0.75, "Sporting CP": 0.75, "Ajax": 0.75, "PSV": 0.75, "Feyenoord": 0.75,
+    "Fenerbahce": 0.75, "Galatasaray": 0.75, "Dinamo Zagreb": 0.75, "Celtic": 0.75, "Rangers": 0.75,
+    "PAOK": 0.75, "Olympiakos": 0.75, "AZ Alkmaar": 0.75, "Brann": 0.75, "Bologna": 0.75,
+    "Fiorentina": 0.75, "Celta Vigo": 0.75, "Genoa": 0.75, "Torino": 0.75,
+    "Everton": 0.75, "Fulham": 0.75, "Brighton": 0.75, "Brentford": 0.75, "West Ham": 0.75,
+    "Club Brugge": 0.75, "Marseille": 0.75, "Slavia Prague": 0.75, "Bodo/Glimt": 0.75, "Union Saint-Gilloise": 0.70,
+    "Pafos": 0.65, "Galatasaray": 0.75, "Copenhagen": 0.75, "Qarabag": 0.65, "Kairat": 0.65
+}
+# 기본값 (Tier 4 / Others): 0.65
+# 기본값 (Minor Leagues / Others): 0.65
+
+
+def normalize_team_name(name):
+    """사용자가 입력한 팀명(예: 토트넘 홋스퍼 FC)을 내부 키(예: 토트넘)로 정규화"""
+    if not name: return None
+    
+    # [V9.7.7] 특수문자(NFD 정규화) 제거를 통한 diacritic-insensitive 매칭
+    name = "".join(c for c in unicodedata.normalize('NFD', name) if unicodedata.category(c) != 'Mn')
+    
+    # [V9.7.10] 특정 지명 및 고유명사 전처리 (Replace first)
+    name = name.replace("Munchen", "Munich").replace("Praha", "Prague").replace("Bilbao", "Club")
+    name = name.replace("Ø", "O").replace("ø", "o")
+    
+    # 1. 불필요한 수식어 및 공백 제거
+    clean_name = re.sub(r'\b(FC|CFC|AFC|BC|SSC|US|SC|Utd|SK|KR|GNK|KF|FK|HNK|NK|R|S|P|T|TC|RC|ACF|KV|CFP|SL)\b', '', name, flags=re.IGNORECASE)
+    clean_name = re.sub(r'칼초 1913|홋스퍼|포레스트|팰리스|원더러스|유나이티드|앤 호브 알비온|1907|1909|de Vigo', '', clean_name, flags=re.IGNORECASE)
+    
+    # [V9.7.10] 최종 특수문자 제거 후 비교용 문자열 생성 (Alphanumeric only)
+    def get_comp_str(s):
+        if not s: return ""
+        s = "".join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
+        s = s.replace("ø", "o").replace("Ø", "O")
+        return re.sub(r'[\W_]', '', s).lower()
+
+    comp_target = get_comp_str(clean_name)
+    
+    # 2. TEAM_MAPPING 매칭
+    sorted_keys = sorted(TEAM_MAPPING.keys(), key=len, reverse=True)
+    for key in sorted_keys:
+        comp_key = get_comp_str(key)
+        if comp_key and (comp_key in comp_target or comp_target in comp_key):
+            return key
+            
+    return clean_name.replace(" ", "").strip()
+
+def parse_input_matches(text):
+    parsed_matches = []
+    for line in text.strip().split('\n'):
+        line = line.strip()
+        if not line: continue
+        
+        # 숫자: 팀A vs 팀B 형태 또는 그냥 팀A vs 팀B 형태 모두 지원
+        match = re.search(r'(?:\d+:\s*)?(.*?)\s*vs\s*(.*)', line)
+        if match:
+            h_raw, a_raw = match.group(1).strip(), match.group(2).strip()
+            h_norm = normalize_team_name(h_raw)
+            a_norm = normalize_team_name(a_raw)
+            parsed_matches.append((h_norm, a_norm))
+    return parsed_matches
+
+
+_INTERNAL_NAMES = set(TEAM_MAPPING.values())
+
+
+@lru_cache(maxsize=65536)
+def _resolve_cached(name):
+    if name in TEAM_MAPPING:
+        return TEAM_MAPPING[name]
+    if name in _INTERNAL_NAMES:
+        return name
+    return TEAM_MAPPING.get(normalize_team_name(name))
+
+
+def resolve_team(name, known_teams=()):
+    """
+    입력 팀명 → 내부 영문명. 이미 내부 영문명(또는 known_teams: ELO/스탯에 있는 팀)이면 그대로, 매핑 불가면 None.
+    정규화 결과는 팀명 단위로 캐시 (대용량 대진표에서 같은 팀 반복 정규화 방지)
+    """
+    if not name:
+        return None
+    name = str(name).strip()
+    if name in known_teams:
+        return name
+    return _resolve_cached(name)
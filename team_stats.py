@@ -0,0 +1,189 @@
+"""
+📊 [V11.1] Live Team Stats — 매치 캐시에서 팀별 공격/수비/슈팅 점유 스탯 산출
+- 하드코딩 dict(약 80팀) 대신 real_match_data_cache.csv 의 모든 리그 × 모든 팀을 한 번의 groupby로 집계
+- xG  ≈ 최근 N경기 평균 득점, xGA ≈ 최근 N경기 평균 실점 (build_features_from_real_data 와 같은 대체 정의)
+- PPDA ≈ 슈팅 점유율 기반 압박 지표 (점유 50% → 10.0, 점유가 높을수록 낮아짐)
+- 결과는 캐시 파일 내용 해시(sha256)로 키잉 — 새 경기가 들어올 때만 재계산 (디스크 + 메모리)
+"""
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from soccer_real_data_engine import MATCH_CACHE_PATH, read_match_cache
+from understat_ingest import load_understat_stats
+
+TEAM_STATS_PATH = "team_stats_cache.json"
+RECENT_MATCHES = 5
+PPDA_BASE = 10.0                  # 슈팅 점유 50% 팀의 PPDA
+PPDA_RANGE = (5.0, 20.0)
+
+# 백업 스탯: Understat에 없는 유럽 대회 팀 + 수집 실패 시 폴백
+BACKUP_TEAM_STATS = {
+    "Juventus": {'xG': 1.85, 'xGA': 0.70, 'PPDA': 9.2}, "Como": {'xG': 1.15, 'xGA': 1.35, 'PPDA': 10.8},
+    "Aston Villa": {'xG': 1.65, 'xGA': 1.15, 'PPDA': 10.5}, "Leeds": {'xG': 1.40, 'xGA': 1.25, 'PPDA': 10.2},
+    "Brentford": {'xG': 1.45, 'xGA': 1.50, 'PPDA': 12.0}, "Brighton": {'xG': 1.60, 'xGA': 1.35, 'PPDA': 9.8},
+    "West Ham": {'xG': 1.35, 'xGA': 1.55, 'PPDA': 13.5}, "Bournemouth": {'xG': 1.40, 'xGA': 1.45, 'PPDA': 11.8},
+    "Cagliari": {'xG': 1.05, 'xGA': 1.60, 'PPDA': 14.5}, "Lazio": {'xG': 1.55, 'xGA': 1.10, 'PPDA': 10.2},
+    "Manchester City": {'xG': 2.45, 'xGA': 0.85, 'PPDA': 8.5}, "Newcastle United": {'xG': 1.55, 'xGA': 1.35, 'PPDA': 10.5},
+    "Nottingham Forest": {'xG': 1.10, 'xGA': 1.65, 'PPDA': 14.2}, "Liverpool": {'xG': 2.30, 'xGA': 0.95, 'PPDA': 8.8},
+    "Atalanta": {'xG': 1.95, 'xGA': 1.20, 'PPDA': 9.5}, "Napoli": {'xG': 1.75, 'xGA': 1.05, 'PPDA': 10.1},
+    "Tottenham": {'xG': 1.85, 'xGA': 1.45, 'PPDA': 9.0}, "Arsenal": {'xG': 2.10, 'xGA': 0.80, 'PPDA': 8.2},
+    "AC Milan": {'xG': 1.80, 'xGA': 1.10, 'PPDA': 9.8}, "Parma": {'xG': 1.65, 'xGA': 1.40, 'PPDA': 10.2},
+    "Roma": {'xG': 1.65, 'xGA': 1.25, 'PPDA': 10.5}, "Cremonese": {'xG': 1.10, 'xGA': 1.50, 'PPDA': 11.5},
+    "Crystal Palace": {'xG': 1.20, 'xGA': 1.40, 'PPDA': 12.5}, "Wolverhampton Wanderers": {'xG': 1.15, 'xGA': 1.55, 'PPDA': 13.0},
+    "Genoa": {'xG': 1.10, 'xGA': 1.35, 'PPDA': 13.2}, "Torino": {'xG': 1.25, 'xGA': 1.15, 'PPDA': 12.1},
+    "Chelsea": {'xG': 1.70, 'xGA': 1.15, 'PPDA': 9.5}, "Manchester Utd": {'xG': 1.50, 'xGA': 1.30, 'PPDA': 10.8},
+    "Fulham": {'xG': 1.30, 'xGA': 1.25, 'PPDA': 11.5}, "Everton": {'xG': 1.05, 'xGA': 1.45, 'PPDA': 13.0},
+    "Sunderland": {'xG': 1.20, 'xGA': 1.30, 'PPDA': 12.0}, "Leicester": {'xG': 1.25, 'xGA': 1.40, 'PPDA': 12.5},
+    # 유럽 대회 팀
+    "Fiorentina": {'xG': 1.55, 'xGA': 1.10, 'PPDA': 10.0}, "Bologna": {'xG': 1.45, 'xGA': 1.15, 'PPDA': 10.5},
+    "Celta Vigo": {'xG': 1.30, 'xGA': 1.35, 'PPDA': 11.5}, "Stuttgart": {'xG': 1.60, 'xGA': 1.20, 'PPDA': 10.0},
+    "Lille": {'xG': 1.50, 'xGA': 1.05, 'PPDA': 9.8}, "Celtic": {'xG': 1.80, 'xGA': 0.90, 'PPDA': 9.0},
+    "AZ Alkmaar": {'xG': 1.55, 'xGA': 1.15, 'PPDA': 10.2}, "Genk": {'xG': 1.45, 'xGA': 1.20, 'PPDA': 10.5},
+    "Fenerbahce": {'xG': 1.60, 'xGA': 1.00, 'PPDA': 9.5}, "PAOK": {'xG': 1.35, 'xGA': 1.15, 'PPDA': 10.8},
+    "Dinamo Zagreb": {'xG': 1.50, 'xGA': 1.10, 'PPDA': 10.0}, "Brann": {'xG': 1.20, 'xGA': 1.30, 'PPDA': 12.0},
+    "Viktoria Plzen": {'xG': 1.35, 'xGA': 1.20, 'PPDA': 11.0}, "Panathinaikos": {'xG': 1.30, 'xGA': 1.15, 'PPDA': 11.0},
+    "Ferencvaros": {'xG': 1.55, 'xGA': 1.05, 'PPDA': 9.8}, "Ludogorets": {'xG': 1.40, 'xGA': 1.10, 'PPDA': 10.5},
+    "Red Star": {'xG': 1.50, 'xGA': 1.00, 'PPDA': 10.0}, "Omonia Nicosia": {'xG': 1.20, 'xGA': 1.30, 'PPDA': 12.0},
+    "Rijeka": {'xG': 1.25, 'xGA': 1.25, 'PPDA': 11.5}, "Celje": {'xG': 1.15, 'xGA': 1.35, 'PPDA': 12.5},
+    "Samsunspor": {'xG': 1.20, 'xGA': 1.25, 'PPDA': 12.0}, "Shkendija": {'xG': 0.90, 'xGA': 1.50, 'PPDA': 14.0},
+    "Jagiellonia": {'xG': 1.10, 'xGA': 1.40, 'PPDA': 13.0}, "Drita": {'xG': 0.85, 'xGA': 1.55, 'PPDA': 14.5},
+    "Lausanne-Sport": {'xG': 1.15, 'xGA': 1.30, 'PPDA': 12.5}, "Sigma Olomouc": {'xG': 1.10, 'xGA': 1.35, 'PPDA': 13.0},
+    "Noah": {'xG': 0.80, 'xGA': 1.60, 'PPDA': 15.0},
+    # 추가 주요 팀
+    "Real Madrid": {'xG': 2.30, 'xGA': 0.80, 'PPDA': 8.0}, "Barcelona": {'xG': 2.20, 'xGA': 0.90, 'PPDA': 8.5},
+    "Atletico Madrid": {'xG': 1.65, 'xGA': 0.85, 'PPDA': 9.5}, "Bayern Munich": {'xG': 2.40, 'xGA': 0.95, 'PPDA': 8.0},
+    "Bayer Leverkusen": {'xG': 2.10, 'xGA': 0.90, 'PPDA': 8.2}, "Borussia Dortmund": {'xG': 1.80, 'xGA': 1.10, 'PPDA': 9.5},
+    "RB Leipzig": {'xG': 1.70, 'xGA': 1.05, 'PPDA': 9.8}, "Paris Saint Germain": {'xG': 2.30, 'xGA': 0.85, 'PPDA': 8.3},
+    "Monaco": {'xG': 1.55, 'xGA': 1.10, 'PPDA': 10.0}, "Inter": {'xG': 1.90, 'xGA': 0.85, 'PPDA': 9.2},
+}
+
+# 📡 [V11.0] Understat 팀명 → 내부 영문명 (TEAM_MAPPING 값 기준)
+UNDERSTAT_NAME_ALIASES = {"Manchester United": "Manchester Utd"}
+DEFAULT_HOME_STAT = {'xG': 1.3, 'xGA': 1.1, 'PPDA': 10.0}
+DEFAULT_AWAY_STAT = {'xG': 1.1, 'xGA': 1.2, 'PPDA': 11.0}
+
+_memo = {}         # {(sha256, recent): {팀명: 스탯}}
+_fingerprint = {}  # {path: ((mtime_ns, size), sha256)} — 파일이 바뀌지 않았으면 재해시 생략
+
+
+def match_cache_hash(path=MATCH_CACHE_PATH):
+    """캐시 파일 sha256 (mtime/크기가 그대로면 이전 해시 재사용). 파일 없으면 None"""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    stamp = (info.st_mtime_ns, info.st_size)
+    cached = _fingerprint.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _fingerprint[path] = (stamp, digest.hexdigest())
+    return _fingerprint[path][1]
+
+
+def build_team_stats(df, recent=RECENT_MATCHES):
+    """
+    매치 DataFrame(시간순) → {팀명: {'xG', 'xGA', 'PPDA', 'shot_share', 'matches'}}
+    홈/원정 행을 팀 관점 long 포맷으로 펼친 뒤 팀별 최근 N경기를 한 번에 집계합니다.
+    """
+    if df is None or len(df) == 0:
+        return {}
+    n = len(df)
+    rows = np.arange(n)
+
+    def col(name):
+        return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64) if name in df else np.zeros(n)
+
+    h_goals, a_goals, h_shots, a_shots = col('h_goals'), col('a_goals'), col('h_shots'), col('a_shots')
+    long = pd.DataFrame({
+        'team': np.concatenate([df['home'].astype(str).to_numpy(), df['away'].astype(str).to_numpy()]),
+        'order': np.concatenate([rows * 2, rows * 2 + 1]),
+        'gf': np.concatenate([h_goals, a_goals]),
+        'ga': np.concatenate([a_goals, h_goals]),
+        'sf': np.concatenate([h_shots, a_shots]),
+        'sa': np.concatenate([a_shots, h_shots]),
+    })
+    recent_rows = long.sort_values('order', kind='stable').groupby('team', sort=False).tail(recent)
+    agg = recent_rows.groupby('team').agg(xG=('gf', 'mean'), xGA=('ga', 'mean'), sf=('sf', 'sum'),
+                                          sa=('sa', 'sum'), matches=('gf', 'size'))
+
+    total = (agg['sf'] + agg['sa']).to_numpy()
+    share = np.where(total > 0, agg['sf'].to_numpy() / np.where(total > 0, total, 1.0), 0.5)
+    ppda = np.clip(PPDA_BASE * 0.5 / np.maximum(share, 0.05), *PPDA_RANGE)
+
+    out = pd.DataFrame({
+        'xG': agg['xG'].round(2), 'xGA': agg['xGA'].round(2), 'PPDA': np.round(ppda, 2),
+        'shot_share': np.round(share, 3), 'matches': agg['matches'].astype(int),
+    }, index=agg.index)
+    out = out[out[['xG', 'xGA']].notna().all(axis=1)]
+    return out.to_dict(orient='index')
+
+
+def get_team_stats(cache_path=MATCH_CACHE_PATH, recent=RECENT_MATCHES, stats_path=TEAM_STATS_PATH):
+    """
+    현재 매치 캐시 기준 팀 스탯 (해시가 같으면 메모리 → 디스크 순으로 재사용).
+    매치 캐시가 없으면 빈 dict.
+    """
+    digest = match_cache_hash(cache_path)
+    if digest is None:
+        return {}
+    key = (digest, recent)
+    if key in _memo:
+        return _memo[key]
+
+    try:
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('source_sha256') == digest and saved.get('recent') == recent:
+            _memo[key] = saved['teams']
+            return _memo[key]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    stats = build_team_stats(read_match_cache(cache_path), recent)
+    payload = {'source_sha256': digest, 'recent': recent,
+               'built_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'teams': stats}
+    try:
+        with open(stats_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(stats_path + ".tmp", stats_path)
+    except OSError as e:
+        logging.warning(f"⚠️ 팀 스탯 캐시 저장 실패: {e}")
+    _memo.clear()
+    _memo[key] = stats
+    logging.info(f"📊 [V11.1] 매치 캐시 기반 팀 스탯 재계산: {len(stats)}팀 (sha256 {digest[:12]})")
+    return stats
+
+
+def build_knowledge_base(use_understat=True):
+    """
+    [V11.1] 팀 스탯 우선순위: 백업 dict < 매치 캐시 기반 라이브 스탯 < Understat 스냅샷
+    Returns: {팀명: {'xG', 'xGA', 'PPDA'}} (새 dict — 호출자가 수정해도 무방)
+    """
+    core_stats = {team: dict(stat) for team, stat in BACKUP_TEAM_STATS.items()}
+    # 📊 [V11.1] ELO 시스템이 아는 모든 팀의 최근 득실/슈팅 점유 스탯
+    try:
+        match_stats = get_team_stats()
+        for team, stat in match_stats.items():
+            core_stats[team] = {'xG': stat['xG'], 'xGA': stat['xGA'], 'PPDA': stat['PPDA']}
+    except Exception as e:
+        logging.warning(f"⚠️ 매치 캐시 팀 스탯 산출 실패 → 백업 스탯 사용: {e}")
+    if use_understat:
+        try:
+            live_stats = load_understat_stats()
+            for team, stat in live_stats.items():
+                core_stats[UNDERSTAT_NAME_ALIASES.get(team, team)] = stat
+            if live_stats:
+                logging.info(f"📡 [V11.0] Understat 스냅샷 반영: {len(live_stats)}팀")
+        except Exception as e:
+            logging.warning(f"⚠️ Understat 스냅샷 로드 실패 → 백업 스탯 사용: {e}")
+    return core_stats
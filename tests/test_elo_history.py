@@ -0,0 +1,73 @@
+"""
+🕰️ [V11.3] as-of ELO 이력 — 디비전 간 승강 팀이 있는 두 리그 캐시를 재생해 손으로 계산한 값과 비교
+X 는 2023-24 시즌 하위 리그(B), 2024-25 시즌 상위 리그(A). 리그 × 시즌 순으로 캐시를 쓰면
+A 2024-25 경기가 B 2023-24 경기보다 먼저 재생되어 2024-01-01 시점 레이팅에 미래 결과가 섞임
+"""
+import pandas as pd
+import pytest
+
+import soccer_real_data_engine as engine
+
+K, HOME = 32, 65
+
+
+def _raw(matches):
+    return pd.DataFrame(matches, columns=['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR'])
+
+
+SEASONS = {
+    ('League_A', '2324'): _raw([('15/09/2023', 'Alpha', 'Beta', 1, 1, 'D')]),
+    ('League_A', '2425'): _raw([('10/08/2024', 'Beta', 'Xray', 0, 2, 'A')]),
+    ('League_B', '2324'): _raw([('12/08/2023', 'Xray', 'Whisky', 3, 0, 'H'),
+                                ('20/10/2023', 'Whisky', 'Yankee', 2, 1, 'H')]),
+    ('League_B', '2425'): _raw([('17/08/2024', 'Yankee', 'Whisky', 0, 0, 'D')]),
+}
+
+
+def _expected(h_elo, a_elo):
+    return 1.0 / (1.0 + 10 ** ((a_elo - (h_elo + HOME)) / 400.0))
+
+
+@pytest.fixture
+def replayed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)        # batch_update 가 elo_ratings.json 을 저장
+
+    def fake_seasons(leagues, seasons, base_url=None, with_odds=False):
+        for league in leagues:         # 실제 수집기처럼 리그 바깥 / 시즌 안쪽 순서
+            for season in seasons:
+                raw = SEASONS.get((league, season))
+                if raw is not None:
+                    yield league, season, engine.parse_fdata_rows(raw, league, season, with_odds)
+
+    monkeypatch.setattr(engine, "iter_fdata_seasons", fake_seasons)
+    leagues = {'League_A': 'A', 'League_B': 'B'}
+    assert engine.ingest_match_cache(leagues, ['2324', '2425'], cache_path="cache.csv") == 5
+    elo = engine.EloRatingSystem(load=False)
+    elo.batch_update_from_chunks(engine.read_match_cache("cache.csv", chunksize=2))
+    return elo
+
+
+def test_cache_rows_are_in_global_date_order(replayed):
+    dates = engine.read_match_cache("cache.csv")['date']
+    assert dates.is_monotonic_increasing
+
+
+def test_asof_matches_hand_computed_ratings(replayed):
+    x1 = 1500 + K * (1.0 - _expected(1500, 1500))          # 2023-08-12 B: Xray 3-0 Whisky (홈승)
+    beta = 1500 - K * (0.5 - _expected(1500, 1500))        # 2023-09-15 A: Alpha 1-1 Beta (무)
+    x2 = x1 - K * (0.0 - _expected(beta, x1))              # 2024-08-10 A: Beta 0-2 Xray (원정승)
+
+    assert replayed.get_elo_asof('Xray', '2023-08-12') == pytest.approx(1500)
+    assert replayed.get_elo_asof('Xray', '2023-08-12', inclusive=True) == pytest.approx(x1)
+    assert replayed.get_elo_asof('Xray', '2024-01-01') == pytest.approx(x1)
+    assert replayed.get_elo_asof('Xray', '2024-08-11') == pytest.approx(x2)
+    assert replayed.get_elo('Xray') == pytest.approx(x2)
+
+
+def test_replay_ignores_saved_ratings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    saved = engine.EloRatingSystem(load=False)
+    saved.ratings = {'Xray': 1800.0}
+    saved.save()
+    assert engine.EloRatingSystem().get_elo('Xray') == 1800.0
+    assert engine.EloRatingSystem(load=False).get_elo('Xray') == engine.EloRatingSystem.DEFAULT_ELO
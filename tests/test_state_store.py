@@ -0,0 +1,80 @@
+"""
+🔒 [V11.3] 상태 파일 동시 저장 — 두 프로세스가 같은 elo_ratings.json / v13_kalman_states.json 을 번갈아 갱신해도
+어느 쪽 갱신도 사라지지 않는지 확인 (ELO 는 같은 팀 A 를 양쪽에서 갱신 → 변경분 합산)
+"""
+import multiprocessing as mp
+import os
+
+import pytest
+
+ROUNDS = 40
+
+
+def _elo_worker(workdir, opponent, out):
+    os.chdir(workdir)
+    from soccer_real_data_engine import EloRatingSystem
+    elo = EloRatingSystem()
+    moved = {'A': 0.0, opponent: 0.0}
+    for i in range(ROUNDS):
+        before = elo.get_elo('A'), elo.get_elo(opponent)
+        elo.update('A', opponent, 2 if i % 3 else 0)
+        moved['A'] += elo.get_elo('A') - before[0]
+        moved[opponent] += elo.get_elo(opponent) - before[1]
+        elo.save()
+    out.put(moved)
+
+
+def _kalman_worker(workdir, teams, out):
+    os.chdir(workdir)
+    from kalman_guardian_v13 import KalmanGuardianEngine, KALMAN_STORE
+    from state_store import state_file
+    kalman = KalmanGuardianEngine()
+    for i in range(ROUNDS):
+        for team in teams:
+            kalman.get_stabilized_xg(team, 1.0 + (i % 5) * 0.2)
+    state_file(KALMAN_STORE).flush()
+    out.put({t: kalman.states[t] for t in teams})
+
+
+def _run_pair(target, args):
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=target, args=(*a, out)) for a in args]
+    for p in procs:
+        p.start()
+    results = [out.get(timeout=120) for _ in procs]
+    for p in procs:
+        p.join(timeout=120)
+        assert p.exitcode == 0
+    return results
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    for key in ("R2_ACCESS_KEY_ID", "R2_SECRET_ACCESS_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path)
+
+
+def test_concurrent_elo_saves_keep_both_processes_updates(workdir):
+    import soccer_real_data_engine as engine
+    results = _run_pair(_elo_worker, [(workdir, 'B'), (workdir, 'C')])
+    saved = engine.EloRatingSystem().ratings
+    start = engine.EloRatingSystem.DEFAULT_ELO
+    assert saved['A'] == pytest.approx(start + sum(r['A'] for r in results))
+    for r in results:
+        (team,) = set(r) - {'A'}
+        assert saved[team] == pytest.approx(start + r[team])
+
+
+def test_concurrent_kalman_saves_keep_every_team(workdir):
+    from kalman_guardian_v13 import KalmanGuardianEngine, KALMAN_STORE
+    from state_store import state_file
+    # 두 프로세스 모두 네 팀을 로드한 상태에서 시작 — 전체 dict 를 저장하면 상대 팀을 옛 값으로 되돌림
+    state_file(KALMAN_STORE, indent=4).save({t: [1.0, 1.0] for t in ('T1', 'T2', 'T3', 'T4')}, wait=True)
+    results = _run_pair(_kalman_worker, [(workdir, ['T1', 'T2']), (workdir, ['T3', 'T4'])])
+    saved = KalmanGuardianEngine().states
+    for r in results:
+        for team, state in r.items():
+            assert saved[team] == pytest.approx(state)
@@ -0,0 +1,212 @@
+"""
+📡 [V11.0] Understat Ingest — 브라우저 없는 동시 수집 + 리그별 스냅샷 캐시
+- Selenium/ChromeDriver 제거: requests 세션으로 리그 페이지 HTML만 가져옴
+- 리그 페이지는 스레드 풀로 동시에 요청 (고정 sleep 없음)
+- 전체 DOM 파싱 대신 'var teamsData' → JSON.parse('...') 구간만 문자열 탐색으로 추출
+- 리그별 스냅샷(understat_snapshots/{league}_{season}.json)에 수집 시각과 함께 원자적 기록
+- 수집 실패 리그는 직전 스냅샷을 그대로 사용 (실패 사유는 로그로 남김)
+
+사용법:
+    python understat_ingest.py --season 2025                        # 수집 + 스냅샷 기록
+    python understat_ingest.py --parse fixtures/understat/EPL_2025.html --repeat 200   # 오프라인 파싱 시간 측정
+"""
+import os
+import re
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from perf_spans import span  # ⏱️ [V11.3] 단계별 계측
+
+UNDERSTAT_BASE_URL = os.getenv("SG_UNDERSTAT_URL", "https://understat.com")
+UNDERSTAT_LEAGUES = ('EPL', 'La_Liga', 'Bundesliga', 'Serie_A', 'Ligue_1')
+UNDERSTAT_SEASON = '2025'
+SNAPSHOT_DIR = "understat_snapshots"
+SNAPSHOT_MAX_AGE_SEC = 6 * 3600   # 이보다 오래된 스냅샷만 재수집
+RECENT_MATCHES = 5                # 최근 N경기 평균 (V8 정의)
+REQUEST_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0"
+
+_TEAMS_MARKER = "var teamsData"
+_PARSE_OPEN = "JSON.parse('"
+_PARSE_CLOSE = "')"
+_HEX_ESCAPE = re.compile(r"\\x([0-9A-Fa-f]{2})")
+
+
+class UnderstatParseError(ValueError):
+    """페이지에서 teamsData 블록을 찾지 못했거나 JSON이 깨진 경우"""
+
+
+# ------------------------------------------------------------------------------
+# 🔍 파싱 — 문자열 탐색 (BeautifulSoup 전체 파싱 없음)
+# ------------------------------------------------------------------------------
+def _decode_js_string(text):
+    """JS 문자열 리터럴('\\x22' 등 hex 이스케이프)을 원문으로 복원 (멀티바이트 UTF-8 포함)"""
+    try:
+        return text.encode('ascii').decode('unicode_escape').encode('latin-1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        # 이스케이프되지 않은 비ASCII 문자가 섞인 페이지 — hex 이스케이프만 바이트 단위로 복원
+        raw = _HEX_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), text)
+        return raw.encode('latin-1', 'backslashreplace').decode('utf-8', 'replace')
+
+
+def extract_teams_data(html):
+    """리그 페이지 HTML → teamsData dict ({team_id: {'title', 'history', ...}})"""
+    marker = html.find(_TEAMS_MARKER)
+    if marker < 0:
+        raise UnderstatParseError("teamsData 블록 없음")
+    start = html.find(_PARSE_OPEN, marker)
+    if start < 0:
+        raise UnderstatParseError("teamsData JSON.parse 없음")
+    start += len(_PARSE_OPEN)
+    end = html.find(_PARSE_CLOSE, start)
+    if end < 0:
+        raise UnderstatParseError("teamsData 문자열이 닫히지 않음")
+    try:
+        return json.loads(_decode_js_string(html[start:end]))
+    except json.JSONDecodeError as e:
+        raise UnderstatParseError(f"teamsData JSON 오류: {e}") from e
+
+
+def summarize_teams(teams_data, recent=RECENT_MATCHES):
+    """teamsData → {팀명: {'xG', 'xGA', 'PPDA'}} (최근 N경기 평균, 기존 fetch_understat_core 와 동일 정의)"""
+    stats = {}
+    for data in teams_data.values():
+        history = data.get('history', [])[-recent:]
+        if not history:
+            continue
+        txg = sum(m['xG'] for m in history)
+        txga = sum(m['xGA'] for m in history)
+        tppda = sum(m['ppda']['att'] / max(1, m['ppda']['def']) for m in history if 'ppda' in m)
+        stats[data['title']] = {
+            'xG': round(txg / len(history), 2),
+            'xGA': round(txga / len(history), 2),
+            'PPDA': round(tppda / len(history), 2),
+        }
+    return stats
+
+
+def parse_league_page(html, recent=RECENT_MATCHES):
+    """리그 페이지 HTML → 팀별 요약 스탯"""
+    return summarize_teams(extract_teams_data(html), recent)
+
+
+# ------------------------------------------------------------------------------
+# 💾 스냅샷
+# ------------------------------------------------------------------------------
+def _snapshot_path(league, season, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{league}_{season}.json")
+
+
+def write_snapshot(league, season, teams, snapshot_dir=SNAPSHOT_DIR):
+    """리그 스냅샷 기록 (임시 파일 → os.replace)"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = _snapshot_path(league, season, snapshot_dir)
+    payload = {'league': league, 'season': str(season), 'fetched_at': time.time(),
+               'fetched_at_iso': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'teams': teams}
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+    os.replace(path + ".tmp", path)
+    return payload
+
+
+def read_snapshot(league, season, snapshot_dir=SNAPSHOT_DIR):
+    """리그 스냅샷 읽기 (없거나 손상되면 None)"""
+    try:
+        with open(_snapshot_path(league, season, snapshot_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ------------------------------------------------------------------------------
+# 🌐 동시 수집
+# ------------------------------------------------------------------------------
+def fetch_league_page(session, league, season, base_url=UNDERSTAT_BASE_URL, timeout=REQUEST_TIMEOUT):
+    with span("http_fetch", source="understat") as s:
+        resp = session.get(f"{base_url}/league/{league}/{season}", timeout=timeout)
+        resp.raise_for_status()
+        s.add(nbytes=len(resp.content))
+    return resp.text
+
+
+def ingest_leagues(leagues=UNDERSTAT_LEAGUES, season=UNDERSTAT_SEASON, snapshot_dir=SNAPSHOT_DIR,
+                   base_url=UNDERSTAT_BASE_URL, max_workers=None, timeout=REQUEST_TIMEOUT):
+    """
+    리그 페이지를 동시에 수집 → 파싱 → 스냅샷 기록.
+    Returns: {league: {'ok': bool, 'teams': int, 'seconds': float, 'error': str|None}}
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+
+    def _one(league):
+        t0 = time.perf_counter()
+        try:
+            teams = parse_league_page(fetch_league_page(session, league, season, base_url, timeout))
+            write_snapshot(league, season, teams, snapshot_dir)
+            return league, {'ok': True, 'teams': len(teams), 'seconds': round(time.perf_counter() - t0, 3), 'error': None}
+        except Exception as e:
+            logging.warning(f"⚠️ [V11.0] Understat {league} {season} 수집 실패 (직전 스냅샷 유지): {e}")
+            return league, {'ok': False, 'teams': 0, 'seconds': round(time.perf_counter() - t0, 3), 'error': str(e)}
+
+    leagues = list(leagues)
+    if not leagues:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(leagues)) as pool:
+        report = dict(pool.map(_one, leagues))
+    ok = sum(r['ok'] for r in report.values())
+    logging.info(f"📡 [V11.0] Understat 수집: {ok}/{len(leagues)} 리그 성공")
+    return report
+
+
+def load_understat_stats(leagues=UNDERSTAT_LEAGUES, season=UNDERSTAT_SEASON, snapshot_dir=SNAPSHOT_DIR,
+                         max_age_sec=SNAPSHOT_MAX_AGE_SEC, refresh=True):
+    """
+    리그 스냅샷을 병합한 {팀명: {'xG', 'xGA', 'PPDA'}} 반환.
+    refresh=True 면 없거나 max_age_sec 보다 오래된 리그만 동시 재수집합니다.
+    """
+    now = time.time()
+    stale = [lg for lg in leagues
+             if (snap := read_snapshot(lg, season, snapshot_dir)) is None or now - snap.get('fetched_at', 0) > max_age_sec]
+    if refresh and stale:
+        ingest_leagues(stale, season, snapshot_dir)
+
+    merged = {}
+    for league in leagues:
+        snap = read_snapshot(league, season, snapshot_dir)
+        if snap:
+            merged.update(snap.get('teams', {}))
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--season", default=UNDERSTAT_SEASON)
+    parser.add_argument("--leagues", nargs="+", default=list(UNDERSTAT_LEAGUES))
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--parse", metavar="HTML", help="저장된 리그 페이지를 오프라인 파싱 (네트워크 없음)")
+    parser.add_argument("--repeat", type=int, default=1, help="--parse 반복 횟수 (시간 측정용)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(message)s')
+
+    if args.parse:
+        with open(args.parse, 'r', encoding='utf-8') as f:
+            html = f.read()
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            teams = parse_league_page(html)
+        per_page = (time.perf_counter() - t0) / args.repeat
+        print(json.dumps({'page': args.parse, 'kb': round(len(html) / 1024, 1), 'teams': len(teams),
+                          'ms_per_page': round(per_page * 1000, 3)}, ensure_ascii=False))
+        return
+
+    print(json.dumps(ingest_leagues(args.leagues, args.season, args.snapshot_dir), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()